@@ -835,15 +835,9 @@ def run_analysis():
         )
         update_display(layout, spinner_text)
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
-            selections["ticker"], selections["analysis_date"]
-        )
-        args = graph.propagator.get_graph_args()
-
-        # Stream the analysis
+        # Stream the analysis, with the dataflows reading the graph's config
         trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
+        for chunk in graph.stream(selections["ticker"], selections["analysis_date"]):
             if len(chunk["messages"]) > 0:
                 # Get the last message from the chunk
                 last_message = chunk["messages"][-1]
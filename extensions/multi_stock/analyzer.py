@@ -25,12 +25,14 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 import time
 import traceback
+from contextlib import nullcontext
 
 from dotenv import load_dotenv
 load_dotenv()
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.agents.utils.rate_limit import AdaptiveConcurrency, ProviderRateLimiter
 
 
 @dataclass
@@ -40,10 +42,16 @@ class AnalysisTask:
     analysis_date: str
     config: Dict[str, Any]
     task_id: str = None
+    # checkpoint thread of the analysis, together with a hash of its config; a
+    # rerun with the same run_id resumes an analysis that failed instead of
+    # starting it over. Defaults to the task_id
+    run_id: Optional[str] = None
     
     def __post_init__(self):
         if self.task_id is None:
             self.task_id = f"{self.ticker}_{self.analysis_date}_{int(time.time())}"
+        if self.run_id is None:
+            self.run_id = self.task_id
 
 
 @dataclass
@@ -419,19 +427,64 @@ class SingleStockAnalyzer:
         try:
             print(f"开始分析 {task.ticker} ({task.analysis_date})")
             
-            # Create unique config for this task to avoid memory collection conflicts
-            unique_config = task.config.copy()
-            # Add unique identifier to prevent ChromaDB collection name conflicts
-            import uuid
-            import threading
-            unique_id = f"{threading.current_thread().ident}_{str(uuid.uuid4())[:8]}"
-            unique_config["memory_suffix"] = f"_{task.ticker}_{unique_id}"
+            # All tasks with the same config share one compiled graph, its LLM
+            # clients and the process-wide memory store
+            ta = TradingAgentsGraph.shared(config=task.config)
             
-            # Initialize the trading graph
-            ta = TradingAgentsGraph(debug=False, config=unique_config)
+            # Run the analysis, resuming from the last completed node on failure
+            for attempt in range(1, self._attempts() + 1):
+                try:
+                    final_state, decision = ta.run(
+                        task.ticker, task.analysis_date, run_id=task.run_id
+                    )
+                    break
+                except Exception as e:
+                    self._check_retry(task, attempt, e)
+            
+            # Extract and categorize agent outputs
+            result = self._extract_agent_outputs(result, final_state)
+            result.final_decision = str(decision) if decision else None
+            result.raw_state = final_state
+            result.status = "completed"
             
-            # Run the analysis
-            final_state, decision = ta.propagate(task.ticker, task.analysis_date)
+            print(f"完成分析 {task.ticker}")
+            
+        except Exception as e:
+            result.status = "error"
+            result.error_message = str(e)
+            print(f"分析失败 {task.ticker}: {str(e)}")
+            traceback.print_exc()
+        
+        finally:
+            result.end_time = datetime.now()
+            result.total_processing_time = (result.end_time - result.start_time).total_seconds()
+        
+        return result
+    
+    async def aanalyze_stock(self, task: AnalysisTask) -> StockAnalysisResult:
+        """Async version of analyze_stock, awaiting TradingAgentsGraph.arun"""
+        result = StockAnalysisResult(
+            ticker=task.ticker,
+            analysis_date=task.analysis_date,
+            task_id=task.task_id,
+            start_time=datetime.now()
+        )
+        
+        try:
+            print(f"开始分析 {task.ticker} ({task.analysis_date})")
+            
+            ta = TradingAgentsGraph.shared(config=task.config)
+            
+            # Run the analysis without holding a thread while waiting on I/O,
+            # resuming from the last completed node on failure
+            for attempt in range(1, self._attempts() + 1):
+                try:
+                    final_state, decision = await ta.arun(
+                        task.ticker, task.analysis_date, run_id=task.run_id
+                    )
+                    break
+                except Exception as e:
+                    self._check_retry(task, attempt, e)
             
             # Extract and categorize agent outputs
             result = self._extract_agent_outputs(result, final_state)
@@ -453,6 +506,18 @@ class SingleStockAnalyzer:
         
         return result
     
+    def _attempts(self) -> int:
+        """Runs of one analysis; later runs resume from the checkpoint"""
+        if self.config.get("checkpointer") is None:
+            return 1
+        return self.config.get("analysis_attempts", 2)
+    
+    def _check_retry(self, task: AnalysisTask, attempt: int, error: Exception):
+        """Re-raise error once the task is out of attempts"""
+        if attempt >= self._attempts():
+            raise error
+        print(f"重试 {task.ticker} ({attempt}/{self._attempts()}): {str(error)}")
+    
     def _extract_agent_outputs(self, result: StockAnalysisResult, final_state: Dict[str, Any]) -> StockAnalysisResult:
         """Extract and categorize agent outputs from final state"""
         timestamp = datetime.now()
@@ -717,9 +782,24 @@ class ProgressTracker:
 class MultiStockAnalyzer:
     """Multi-threaded stock analysis manager"""
     
-    def __init__(self, config: Dict[str, Any] = None, max_workers: int = 4):
+    def __init__(self, config: Dict[str, Any] = None, max_workers: int = 4, max_concurrency: int = 32,
+                 adaptive_concurrency: Optional[bool] = None):
         self.config = config or self._get_default_config()
         self.max_workers = max_workers
+        self.max_concurrency = max_concurrency  # analyses in flight in async mode
+        # with adaptive concurrency (by default only when llm_requests_per_minute
+        # or llm_tokens_per_minute is set), 429s cut the analyses in flight below
+        # max_workers / max_concurrency, which stay the starting point and ceiling
+        if adaptive_concurrency is None:
+            adaptive_concurrency = any(
+                self.config.get(key) is not None
+                for key in ("llm_requests_per_minute", "llm_tokens_per_minute")
+            )
+        self.adaptive_concurrency = adaptive_concurrency
+        if adaptive_concurrency and self.config.get("llm_max_retries") is None:
+            # let 429s reach the controller instead of the SDK's own retries
+            self.config = {**self.config, "llm_max_retries": 0}
+        self.concurrency: Optional[AdaptiveConcurrency] = None
         self.stock_manager = StockListManager()
         self.results_manager = ResultsManager()
         self.progress_tracker = ProgressTracker()
@@ -739,16 +819,13 @@ class MultiStockAnalyzer:
         config["project_dir"] = os.getcwd()  # Set project directory to current directory
         return config
     
-    def analyze_stocks(self, 
-                      stock_list: List[str] = None,
-                      stock_list_name: str = None,
-                      analysis_date: str = None,
-                      save_results: bool = True,
-                      skip_existing: bool = True) -> Dict[str, StockAnalysisResult]:
-        """Analyze multiple stocks concurrently"""
-        
-        # Clean up any existing memory collections first
-        self._cleanup_memory_collections()
+    def _create_tasks(self,
+                      stock_list: List[str],
+                      stock_list_name: str,
+                      analysis_date: str,
+                      skip_existing: bool,
+                      concurrency: int) -> List[AnalysisTask]:
+        """Create analysis tasks, skipping stocks already analyzed today"""
         
         # Determine which stocks to analyze
         if stock_list is None:
@@ -757,20 +834,16 @@ class MultiStockAnalyzer:
         if not stock_list:
             raise ValueError("No stocks specified for analysis")
         
-        # Determine analysis date
-        if analysis_date is None:
-            analysis_date = datetime.now().strftime("%Y-%m-%d")
-        
         # Log analysis start
         self.log_manager.logger.info(f"开始多股票分析 - 股票列表: {stock_list}")
         self.log_manager.logger.info(f"分析日期: {analysis_date}")
-        self.log_manager.logger.info(f"最大并发数: {self.max_workers}")
+        self.log_manager.logger.info(f"最大并发数: {concurrency}")
         self.log_manager.logger.info(f"配置: {self.config['llm_provider']} - {self.config['deep_think_llm']}")
         
         print(f"开始多股票分析")
         print(f"股票列表: {stock_list}")
         print(f"分析日期: {analysis_date}")
-        print(f"最大并发数: {self.max_workers}")
+        print(f"最大并发数: {concurrency}")
         print(f"配置: {self.config['llm_provider']} - {self.config['deep_think_llm']}")
         
         # Create analysis tasks, skip already analyzed ones
@@ -796,7 +869,7 @@ class MultiStockAnalyzer:
         if not stocks_to_analyze:
             print("所有股票今日已完成分析，跳过本次运行")
             self.log_manager.logger.info("所有股票今日已完成分析，跳过本次运行")
-            return {}
+            return []
             
         print(f"开始分析以下股票: {stocks_to_analyze}")
         self.log_manager.logger.info(f"实际分析股票: {stocks_to_analyze}")
@@ -806,84 +879,198 @@ class MultiStockAnalyzer:
             task = AnalysisTask(
                 ticker=ticker,
                 analysis_date=analysis_date,
-                config=self.config.copy()
+                config=self.config.copy(),
+                run_id=f"multi_stock_{self.log_manager.session_id}"
             )
             tasks.append(task)
             self.progress_tracker.add_task(task)
         
-        # Run analyses concurrently
+        return tasks
+    
+    def _start_concurrency(self, limit: int) -> Optional[AdaptiveConcurrency]:
+        """AIMD controller fed by the LLM rate limiters of this config, capped at limit"""
+        if not self.adaptive_concurrency:
+            return None
+        self.concurrency = AdaptiveConcurrency(initial=limit, maximum=limit)
+        self.concurrency.watch(ProviderRateLimiter.for_config(self.config))
+        return self.concurrency
+    
+    def _stop_concurrency(self):
+        if self.concurrency is not None:
+            self.concurrency.unwatch(ProviderRateLimiter.for_config(self.config))
+            self.log_manager.logger.info(f"最终并发数: {int(self.concurrency.limit)}")
+    
+    def _track_result(self, task: AnalysisTask, result: StockAnalysisResult):
+        """Record a finished analysis in the progress tracker and logs"""
+        if result.status == "completed":
+            self.progress_tracker.complete_task(task.task_id, result)
+            self.log_manager.log_analysis_complete(
+                task.ticker, result.total_processing_time, result.status
+            )
+        else:
+            self.progress_tracker.fail_task(task.task_id, result.error_message or "Unknown error")
+            self.log_manager.log_analysis_error(
+                task.ticker, result.error_message or "Unknown error"
+            )
+    
+    def _save_result(self, result: StockAnalysisResult):
+        try:
+            self.results_manager.save_analysis_result(result)
+        except Exception as e:
+            print(f"警告：保存{result.ticker}结果时出错: {str(e)}")
+            logging.warning(f"保存{result.ticker}结果失败: {e}")
+    
+    def _error_result(self, task: AnalysisTask, error: Exception) -> StockAnalysisResult:
+        print(f"任务 {task.ticker} 执行失败: {str(error)}")
+        # Log but don't raise the exception to prevent terminal kill
+        self.log_manager.logger.error(f"分析任务失败: {task.ticker} - {str(error)}")
+        return StockAnalysisResult(
+            ticker=task.ticker,
+            analysis_date=task.analysis_date,
+            task_id=task.task_id,
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            status="error",
+            error_message=str(error)
+        )
+    
+    def _finish_session(self, results: Dict[str, StockAnalysisResult]):
+        # Final status
+        self.progress_tracker.print_status()
+        print("\n所有分析任务完成!")
+        
+        # Log session summary
+        self.log_manager.log_session_summary(results)
+    
+    def analyze_stocks(self, 
+                      stock_list: List[str] = None,
+                      stock_list_name: str = None,
+                      analysis_date: str = None,
+                      save_results: bool = True,
+                      skip_existing: bool = True) -> Dict[str, StockAnalysisResult]:
+        """Analyze multiple stocks concurrently"""
+        
+        # Determine analysis date
+        if analysis_date is None:
+            analysis_date = datetime.now().strftime("%Y-%m-%d")
+        
+        tasks = self._create_tasks(
+            stock_list, stock_list_name, analysis_date, skip_existing, self.max_workers
+        )
+        if not tasks:
+            return {}
+        
+        # Run analyses concurrently; the controller, if any, decides how many
+        # of the pool's threads may analyze at once
         results = {}
         analyzer = SingleStockAnalyzer(self.config)
+        concurrency = self._start_concurrency(self.max_workers)
         
         def analyze_single_stock(task):
-            self.progress_tracker.start_task(task.task_id)
-            self.log_manager.log_analysis_start(task.ticker, task.analysis_date)
-            
-            try:
-                result = analyzer.analyze_stock(task)
-                
-                if result.status == "completed":
-                    self.progress_tracker.complete_task(task.task_id, result)
-                    self.log_manager.log_analysis_complete(
-                        task.ticker, result.total_processing_time, result.status
-                    )
-                else:
-                    self.progress_tracker.fail_task(task.task_id, result.error_message or "Unknown error")
-                    self.log_manager.log_analysis_error(
-                        task.ticker, result.error_message or "Unknown error"
-                    )
+            with concurrency or nullcontext():
+                self.progress_tracker.start_task(task.task_id)
+                self.log_manager.log_analysis_start(task.ticker, task.analysis_date)
                 
-                return result
-            except Exception as e:
-                error_msg = str(e)
-                self.progress_tracker.fail_task(task.task_id, error_msg)
-                self.log_manager.log_analysis_error(task.ticker, error_msg)
-                raise
+                try:
+                    result = analyzer.analyze_stock(task)
+                    self._track_result(task, result)
+                    return result
+                except Exception as e:
+                    error_msg = str(e)
+                    self.progress_tracker.fail_task(task.task_id, error_msg)
+                    self.log_manager.log_analysis_error(task.ticker, error_msg)
+                    raise
         
         # Start progress monitoring in separate thread
         progress_thread = threading.Thread(target=self._monitor_progress, daemon=True)
         progress_thread.start()
         
         # Execute tasks concurrently with proper exception handling
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_task = {executor.submit(analyze_single_stock, task): task for task in tasks}
-            
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result(timeout=600)  # 10 minute timeout
-                    results[task.ticker] = result
-                    
-                    # Save results if requested
-                    if save_results:
-                        try:
-                            self.results_manager.save_analysis_result(result)
-                        except Exception as e:
-                            print(f"警告：保存{result.ticker}结果时出错: {str(e)}")
-                            logging.warning(f"保存{result.ticker}结果失败: {e}")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_task = {executor.submit(analyze_single_stock, task): task for task in tasks}
+                
+                for future in as_completed(future_to_task):
+                    task = future_to_task[future]
+                    try:
+                        result = future.result(timeout=600)  # 10 minute timeout
+                        results[task.ticker] = result
                         
-                except Exception as e:
-                    print(f"任务 {task.ticker} 执行失败: {str(e)}")
-                    # Create error result but don't crash the system
-                    error_result = StockAnalysisResult(
-                        ticker=task.ticker,
-                        analysis_date=task.analysis_date,
-                        task_id=task.task_id,
-                        start_time=datetime.now(),
-                        end_time=datetime.now(),
-                        status="error",
-                        error_message=str(e)
+                        # Save results if requested
+                        if save_results:
+                            self._save_result(result)
+                            
+                    except Exception as e:
+                        # Create error result but don't crash the system
+                        results[task.ticker] = self._error_result(task, e)
+        finally:
+            self._stop_concurrency()
+        
+        self._finish_session(results)
+        
+        return results
+    
+    async def analyze_stocks_async(self,
+                                   stock_list: List[str] = None,
+                                   stock_list_name: str = None,
+                                   analysis_date: str = None,
+                                   save_results: bool = True,
+                                   skip_existing: bool = True) -> Dict[str, StockAnalysisResult]:
+        """
+        Analyze multiple stocks concurrently in one event loop.
+        
+        Every analysis is a coroutine awaiting TradingAgentsGraph.arun on one
+        shared graph, so dozens of stocks can wait on the LLM APIs without a
+        thread each. At most max_concurrency are in flight, fewer while the
+        adaptive controller is backing off from 429s.
+        """
+        
+        # Determine analysis date
+        if analysis_date is None:
+            analysis_date = datetime.now().strftime("%Y-%m-%d")
+        
+        tasks = self._create_tasks(
+            stock_list, stock_list_name, analysis_date, skip_existing, self.max_concurrency
+        )
+        if not tasks:
+            return {}
+        
+        results = {}
+        analyzer = SingleStockAnalyzer(self.config)
+        slots = self._start_concurrency(self.max_concurrency) or asyncio.Semaphore(self.max_concurrency)
+        
+        async def analyze_single_stock(task):
+            async with slots:
+                self.progress_tracker.start_task(task.task_id)
+                self.log_manager.log_analysis_start(task.ticker, task.analysis_date)
+                
+                try:
+                    result = await asyncio.wait_for(
+                        analyzer.aanalyze_stock(task), timeout=600  # 10 minute timeout
                     )
-                    results[task.ticker] = error_result
-                    # Log but don't raise the exception to prevent terminal kill
-                    self.log_manager.logger.error(f"分析任务失败: {task.ticker} - {str(e)}")
+                except Exception as e:
+                    self.progress_tracker.fail_task(task.task_id, str(e))
+                    self.log_manager.log_analysis_error(task.ticker, str(e))
+                    result = self._error_result(task, e)
+                else:
+                    self._track_result(task, result)
+            
+            results[task.ticker] = result
+            
+            # Save results if requested; file and database writes are blocking
+            if save_results:
+                await asyncio.to_thread(self._save_result, result)
         
-        # Final status
-        self.progress_tracker.print_status()
-        print("\n所有分析任务完成!")
+        # Start progress monitoring in separate thread
+        progress_thread = threading.Thread(target=self._monitor_progress, daemon=True)
+        progress_thread.start()
         
-        # Log session summary
-        self.log_manager.log_session_summary(results)
+        try:
+            await asyncio.gather(*(analyze_single_stock(task) for task in tasks))
+        finally:
+            self._stop_concurrency()
+        
+        self._finish_session(results)
         
         return results
     
@@ -926,26 +1113,6 @@ class MultiStockAnalyzer:
         config = self.config.copy()
         config.update(kwargs)
         return config
-    
-    def _cleanup_memory_collections(self):
-        """Clean up existing memory collections to prevent conflicts"""
-        try:
-            import chromadb
-            from chromadb.config import Settings
-            
-            client = chromadb.Client(Settings(allow_reset=True))
-            collections = client.list_collections()
-            
-            for collection in collections:
-                if any(name in collection.name for name in ['bull_memory', 'bear_memory']):
-                    try:
-                        client.delete_collection(collection.name)
-                        self.log_manager.logger.debug(f"已清理内存集合: {collection.name}")
-                    except:
-                        pass
-                        
-        except Exception as e:
-            self.log_manager.logger.warning(f"清理内存集合时出现警告: {str(e)}")
 
 
 def main():
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: native NumPy indicator engine vs stockstats
+
+Usage:
+    python scripts/benchmark_indicators.py --rows 2600 --repeat 20
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from stockstats import wrap
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tradingagents.dataflows.indicator_engine import IndicatorEngine
+
+
+def make_prices(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    return pd.DataFrame(
+        {
+            "Date": pd.bdate_range("2015-01-01", periods=rows).strftime("%Y-%m-%d"),
+            "Open": close,
+            "High": close * (1 + rng.uniform(0, 0.02, rows)),
+            "Low": close * (1 - rng.uniform(0, 0.02, rows)),
+            "Close": close,
+            "Volume": rng.integers(1_000, 10_000_000, rows).astype(float),
+        }
+    )
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicator engine microbenchmark")
+    parser.add_argument("--rows", type=int, default=2600, help="Price history length")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions per case")
+    args = parser.parse_args()
+
+    data = make_prices(args.rows)
+    indicators = list(IndicatorEngine.SUPPORTED)
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"{'indicator':<16}{'stockstats (ms)':>18}{'engine (ms)':>14}{'speedup':>10}")
+
+    for indicator in indicators:
+        reference = best_of(lambda: wrap(data.copy())[indicator], args.repeat)
+        native = best_of(lambda: IndicatorEngine(data).get(indicator), args.repeat)
+        print(
+            f"{indicator:<16}{reference * 1e3:>18.3f}{native * 1e3:>14.3f}"
+            f"{reference / native:>9.1f}x"
+        )
+
+    def stockstats_all():
+        df = wrap(data.copy())
+        for indicator in indicators:
+            df[indicator]
+
+    reference = best_of(stockstats_all, args.repeat)
+    native = best_of(lambda: IndicatorEngine(data).compute(indicators), args.repeat)
+    print(
+        f"{'all (one pass)':<16}{reference * 1e3:>18.3f}{native * 1e3:>14.3f}"
+        f"{reference / native:>9.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: NumPy flat memory index vs Chroma
+
+Embeddings are random unit vectors, so only the stores are measured.
+
+Usage:
+    python scripts/benchmark_memory.py --sizes 1000 10000 100000 --dim 384
+"""
+
+import sys
+import argparse
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tradingagents.agents.utils.memory import (
+    MEMORY_ROLES,
+    ChromaMemoryStore,
+    FlatMemoryStore,
+)
+
+# Chroma rejects larger batches
+ADD_BATCH = 5000
+
+
+def random_vectors(rng, n: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(store_cls, vectors, queries, memory_dir, n_matches):
+    n = len(vectors)
+    result = {}
+
+    result["open"] = timed(
+        lambda: result.setdefault(
+            "store", store_cls(f"bench_{uuid.uuid4().hex}", "bench", memory_dir)
+        )
+    )
+    store = result.pop("store")
+
+    def add_all():
+        for start in range(0, n, ADD_BATCH):
+            end = min(start + ADD_BATCH, n)
+            role = MEMORY_ROLES[(start // ADD_BATCH) % len(MEMORY_ROLES)]
+            store._add(
+                [role] * (end - start),
+                [f"situation {i}" for i in range(start, end)],
+                [f"advice {i}" for i in range(start, end)],
+                vectors[start:end].tolist(),
+            )
+
+    result["add"] = timed(add_all)
+
+    def query_all():
+        for query in queries:
+            store._search_roles(query.tolist(), MEMORY_ROLES, n_matches)
+
+    result["query"] = timed(query_all) / len(queries)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory backend benchmark")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Entries"
+    )
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=50, help="Queries per size")
+    parser.add_argument("--n-matches", type=int, default=2, help="Top-k per role")
+    parser.add_argument(
+        "--persistent", action="store_true", help="Store on disk instead of in memory"
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(
+        f"dim {args.dim}, top-{args.n_matches} for {len(MEMORY_ROLES)} roles, "
+        f"{'on disk' if args.persistent else 'in memory'}"
+    )
+    print(
+        f"{'entries':>8}{'backend':>9}{'open (ms)':>12}{'add (s)':>10}"
+        f"{'query (ms)':>13}{'speedup':>10}"
+    )
+
+    for n in args.sizes:
+        vectors = random_vectors(rng, n, args.dim)
+        queries = random_vectors(rng, args.queries, args.dim)
+        timings = {}
+        for name, store_cls in (("chroma", ChromaMemoryStore), ("numpy", FlatMemoryStore)):
+            with tempfile.TemporaryDirectory() as tmp:
+                timings[name] = run(
+                    store_cls,
+                    vectors,
+                    queries,
+                    tmp if args.persistent else None,
+                    args.n_matches,
+                )
+            t = timings[name]
+            speedup = timings["chroma"]["query"] / t["query"]
+            print(
+                f"{n:>8}{name:>9}{t['open'] * 1e3:>12.1f}{t['add']:>10.2f}"
+                f"{t['query'] * 1e3:>13.2f}{speedup:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Tests for running the agent graph with ainvoke (TradingAgentsGraph.apropagate)
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.prebuilt import ToolNode
+
+from tradingagents.agents import Toolkit
+from tradingagents.agents.utils.agent_utils import create_llm_node
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.graph.signal_processing import SignalProcessor
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+ANSWER = "Looks good. FINAL TRANSACTION PROPOSAL: **BUY**"
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers without tool calls, slowly when awaited."""
+
+    delay: float = 0.05
+    sync_calls: int = 0
+    async_calls: int = 0
+    async_threads: List[int] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        self.sync_calls += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(ANSWER))])
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        self.async_calls += 1
+        self.async_threads.append(threading.get_ident())
+        await asyncio.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(ANSWER))])
+
+
+def _graph(llm):
+    tool_nodes = {analyst: ToolNode([Toolkit.get_YFin_data]) for analyst in ANALYSTS}
+    setup = GraphSetup(
+        llm, llm, Toolkit(), tool_nodes, None, None, None, None, None, ConditionalLogic()
+    )
+    return setup.setup_graph(ANALYSTS)
+
+
+@pytest.fixture
+def trading_graph(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.chdir(tmp_path)
+    config = DEFAULT_CONFIG.copy()
+    config["disable_memory"] = True
+    config["project_dir"] = str(tmp_path)
+
+    def build():
+        llm = FakeChatModel()
+        ta = TradingAgentsGraph(ANALYSTS, config=config)
+        ta.graph = _graph(llm)
+        ta.signal_processor = SignalProcessor(llm)
+        return ta, llm
+
+    return build
+
+
+@pytest.mark.unit
+def test_llm_node_uses_invoke_or_ainvoke():
+    llm = FakeChatModel()
+
+    def step(state):
+        response = yield llm, state["question"]
+        return {"answer": response.content}
+
+    node = create_llm_node(step)
+
+    assert node.invoke({"question": "hi"}) == {"answer": ANSWER}
+    assert asyncio.run(node.ainvoke({"question": "hi"})) == {"answer": ANSWER}
+    assert (llm.sync_calls, llm.async_calls) == (1, 1)
+
+
+@pytest.mark.unit
+def test_apropagate_matches_propagate(trading_graph):
+    ta, llm = trading_graph()
+    sync_state, sync_decision = ta.propagate("NVDA", "2024-05-10")
+    assert llm.async_calls == 0
+
+    ta, llm = trading_graph()
+    async_state, async_decision = asyncio.run(ta.apropagate("NVDA", "2024-05-10"))
+    assert llm.sync_calls == 0
+
+    assert async_decision == sync_decision
+    for key in (
+        "market_report",
+        "sentiment_report",
+        "news_report",
+        "fundamentals_report",
+        "investment_plan",
+        "trader_investment_plan",
+        "final_trade_decision",
+    ):
+        assert async_state[key] == sync_state[key] == ANSWER
+
+
+@pytest.mark.unit
+def test_apropagate_runs_many_analyses_in_one_event_loop(trading_graph):
+    runs = [trading_graph() for _ in range(8)]
+
+    async def run_all():
+        return await asyncio.gather(
+            *(ta.apropagate(f"T{i}", "2024-05-10") for i, (ta, _) in enumerate(runs))
+        )
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert [decision for _, decision in results] == ["BUY"] * len(runs)
+    # every LLM call is awaited on the event loop thread, none in a worker
+    threads = {thread for _, llm in runs for thread in llm.async_threads}
+    assert len(threads) == 1
+    # the analyses overlap instead of running one after another
+    calls_per_run = runs[0][1].async_calls
+    assert elapsed < len(runs) * calls_per_run * FakeChatModel.model_fields["delay"].default
@@ -0,0 +1,175 @@
+"""
+Tests for resuming a failed analysis from its checkpoint
+"""
+
+import asyncio
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.prebuilt import ToolNode
+
+from tradingagents.agents import Toolkit
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph import checkpointing
+from tradingagents.graph.checkpointing import (
+    config_digest,
+    create_checkpointer,
+    make_thread_id,
+    prune_checkpoints,
+)
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.graph.signal_processing import SignalProcessor
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+ANSWER = "Looks good. FINAL TRANSACTION PROPOSAL: **BUY**"
+
+
+class FlakyJudgeModel(BaseChatModel):
+    """Answers every agent, but the Risk Judge fails while failing is set."""
+
+    failing: bool = True
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-flaky"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _answer(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        if self.failing and "Risk Management Judge" in prompt:
+            raise TimeoutError("Risk Judge timed out")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(ANSWER))])
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        return self._answer(messages)
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        return self._answer(messages)
+
+
+@pytest.fixture
+def trading_graph(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.chdir(tmp_path)
+    config = DEFAULT_CONFIG.copy()
+    config["disable_memory"] = True
+    config["project_dir"] = str(tmp_path)
+    config["checkpointer"] = "sqlite"
+
+    llm = FlakyJudgeModel()
+    ta = TradingAgentsGraph(ANALYSTS, config=config)
+    tool_nodes = {analyst: ToolNode([Toolkit.get_YFin_data]) for analyst in ANALYSTS}
+    setup = GraphSetup(
+        llm, llm, Toolkit(), tool_nodes, None, None, None, None, None,
+        ta.conditional_logic,
+    )
+    ta.graph = setup.setup_graph(ANALYSTS, checkpointer=ta.checkpointer)
+    ta.signal_processor = SignalProcessor(llm)
+    return ta, llm
+
+
+def _thread_ids(ta):
+    return {t.config["configurable"]["thread_id"] for t in ta.checkpointer.list(None)}
+
+
+@pytest.mark.unit
+def test_failed_run_resumes_from_last_completed_node(trading_graph):
+    ta, llm = trading_graph
+
+    with pytest.raises(TimeoutError):
+        ta.propagate("NVDA", "2024-05-10")
+    full_run = len(llm.prompts)
+    assert _thread_ids(ta) == {f"NVDA:2024-05-10:{ta.run_id}:{config_digest(ta.config)}"}
+
+    llm.failing = False
+    final_state, decision = ta.propagate("NVDA", "2024-05-10", run_id=ta.run_id)
+
+    # only the Risk Judge is asked again
+    assert len(llm.prompts) == full_run + 1
+    assert decision == "BUY"
+    assert final_state["market_report"] == final_state["final_trade_decision"] == ANSWER
+    assert _thread_ids(ta) == set()
+
+
+@pytest.mark.unit
+def test_sync_failure_resumes_with_apropagate(trading_graph):
+    ta, llm = trading_graph
+
+    with pytest.raises(TimeoutError):
+        ta.propagate("NVDA", "2024-05-10", run_id="retry")
+    full_run = len(llm.prompts)
+
+    llm.failing = False
+    final_state, decision = asyncio.run(
+        ta.apropagate("NVDA", "2024-05-10", run_id="retry")
+    )
+    assert len(llm.prompts) == full_run + 1
+    assert decision == "BUY"
+
+    # a new run id starts over
+    ta.propagate("NVDA", "2024-05-10")
+    assert len(llm.prompts) == 2 * full_run + 1
+
+
+@pytest.mark.unit
+def test_runs_with_another_config_do_not_share_a_thread():
+    config = {"deep_think_llm": "o4-mini", "max_debate_rounds": 1}
+    changed = {**config, "max_debate_rounds": 3}
+
+    assert make_thread_id("NVDA", "2024-05-10", "batch", config) != make_thread_id(
+        "NVDA", "2024-05-10", "batch", changed
+    )
+    assert make_thread_id("NVDA", "2024-05-10", "batch", config) == make_thread_id(
+        "NVDA", "2024-05-10", "batch", dict(reversed(list(config.items())))
+    )
+
+
+@pytest.mark.unit
+def test_checkpointing_is_opt_in(tmp_path):
+    config = {**DEFAULT_CONFIG, "project_dir": str(tmp_path)}
+    assert create_checkpointer(config) is None
+
+
+@pytest.mark.unit
+def test_stale_threads_are_pruned(trading_graph):
+    ta, llm = trading_graph
+
+    with pytest.raises(TimeoutError):
+        ta.propagate("NVDA", "2024-05-10")
+    assert len(_thread_ids(ta)) == 1
+
+    assert prune_checkpoints(ta.checkpointer, 1) == 0
+    assert len(_thread_ids(ta)) == 1
+    assert prune_checkpoints(ta.checkpointer, -1) == 1
+    assert _thread_ids(ta) == set()
+
+
+@pytest.mark.unit
+def test_checkpoint_file_is_pruned_once_per_process(tmp_path, monkeypatch):
+    pruned = []
+    monkeypatch.setattr(
+        checkpointing, "prune_checkpoints", lambda saver, days: pruned.append(days)
+    )
+    config = {
+        **DEFAULT_CONFIG,
+        "checkpointer": "sqlite",
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+    }
+
+    create_checkpointer(config)
+    create_checkpointer(config)
+    create_checkpointer({**config, "checkpoint_path": str(tmp_path / "other.sqlite")})
+
+    assert pruned == [7, 7]
@@ -0,0 +1,115 @@
+"""
+Tests for the shared, cache-friendly prompt prefix of the debate and manager agents
+"""
+
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.agents import (
+    create_bear_researcher,
+    create_bull_researcher,
+    create_neutral_debator,
+    create_research_manager,
+    create_risk_manager,
+    create_risky_debator,
+    create_safe_debator,
+    create_trader,
+)
+from tradingagents.agents.utils.agent_utils import build_debate_messages
+
+
+class RecordingModel(BaseChatModel):
+    """Records the prompts it receives."""
+
+    llm_type: str = "fake-recording"
+    prompts: List[List[BaseMessage]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return self.llm_type
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        self.prompts.append(messages)
+        message = AIMessage(f"turn {len(self.prompts)}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _state():
+    return {
+        "company_of_interest": "NVDA",
+        "market_report": "market " * 50,
+        "sentiment_report": "sentiment " * 50,
+        "news_report": "news " * 50,
+        "fundamentals_report": "fundamentals " * 50,
+        "investment_plan": "plan",
+        "trader_investment_plan": "BUY",
+        "investment_debate_state": {"history": "", "current_response": "", "count": 0},
+        "risk_debate_state": {
+            "history": "",
+            "risky_history": "",
+            "safe_history": "",
+            "neutral_history": "",
+            "current_risky_response": "",
+            "current_safe_response": "",
+            "current_neutral_response": "",
+            "count": 0,
+        },
+    }
+
+
+@pytest.mark.unit
+def test_every_agent_and_turn_shares_the_same_prefix():
+    llm = RecordingModel()
+    nodes = [
+        create_bull_researcher(llm, None),
+        create_bear_researcher(llm, None),
+        create_bull_researcher(llm, None),
+        create_research_manager(llm, None),
+        create_trader(llm, None),
+        create_risky_debator(llm),
+        create_safe_debator(llm),
+        create_neutral_debator(llm),
+        create_risky_debator(llm),
+        create_risk_manager(llm, None),
+    ]
+
+    state = _state()
+    for node in nodes:
+        state.update(node.invoke(state))
+
+    assert len(llm.prompts) == len(nodes)
+    prefixes = {prompt[0].content for prompt in llm.prompts}
+    assert len(prefixes) == 1
+    prefix = prefixes.pop()
+    for report in ("market", "sentiment", "news", "fundamentals"):
+        assert state[f"{report}_report"] in prefix
+
+    # the volatile part only comes after the prefix
+    assert [type(message) for message in llm.prompts[-1]] == [SystemMessage, HumanMessage]
+    assert "turn 1" not in prefix
+    assert "turn 1" in llm.prompts[2][1].content
+
+
+@pytest.mark.unit
+def test_anthropic_prefix_gets_a_cache_breakpoint():
+    state = _state()
+
+    openai_system, _ = build_debate_messages(RecordingModel(), state, "task")
+    anthropic_system, human = build_debate_messages(
+        RecordingModel(llm_type="anthropic-chat"), state, "task"
+    )
+
+    assert anthropic_system.content == [
+        {
+            "type": "text",
+            "text": openai_system.content,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert human.content == "task"
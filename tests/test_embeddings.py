@@ -0,0 +1,120 @@
+"""
+Tests for the shared embedding backend used by FinancialSituationMemory
+"""
+
+import sys
+import types
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tradingagents.agents.utils import embeddings
+from tradingagents.agents.utils.embeddings import EmbeddingBackend, EmbeddingCache
+from tradingagents.agents.utils.memory import FinancialSituationMemory, MemoryStore
+
+CONFIG = {"backend_url": "https://api.openai.com/v1"}
+
+
+class FakeSentenceTransformer:
+    loads = 0
+
+    def __init__(self, name):
+        FakeSentenceTransformer.loads += 1
+        self.calls = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        return np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+
+
+class FakeOpenAI:
+    requests = []
+
+    def __init__(self):
+        self.embeddings = self
+
+    def create(self, model, input):
+        FakeOpenAI.requests.append((model, list(input)))
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=[float(len(t)), 0.0]) for t in input]
+        )
+
+
+@pytest.fixture(autouse=True)
+def fresh_backends(monkeypatch):
+    monkeypatch.setattr(EmbeddingBackend, "_instances", {})
+    monkeypatch.setattr(EmbeddingBackend, "cache", EmbeddingCache())
+    monkeypatch.setattr(MemoryStore, "_stores", {})
+    monkeypatch.setitem(CONFIG, "memory_collection", f"test_{uuid.uuid4().hex}")
+    FakeSentenceTransformer.loads = 0
+    FakeOpenAI.requests = []
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    monkeypatch.setattr(embeddings, "OpenAI", FakeOpenAI)
+
+
+@pytest.mark.unit
+def test_local_model_loaded_once_and_batched(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    memory = FinancialSituationMemory("test_local_batched", CONFIG)
+
+    memory.add_situations([("a rally", "buy"), ("a crash", "sell"), ("flat", "hold")])
+    memory.get_memories("a boom", n_matches=1)
+    memory.get_memories("a slump", n_matches=1)
+
+    backend = EmbeddingBackend.get(memory.embedding)
+    assert FakeSentenceTransformer.loads == 1
+    assert backend._client.calls[0] == ["a rally", "a crash", "flat"]
+    assert len(backend._client.calls) == 3
+
+
+@pytest.mark.unit
+def test_openai_embeddings_batched_in_one_request(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    memory = FinancialSituationMemory("test_openai_batched", CONFIG)
+
+    memory.add_situations([("up", "buy"), ("down", "sell")])
+    best = memory.get_memories("u", n_matches=1)
+
+    assert FakeOpenAI.requests[0] == ("text-embedding-3-small", ["up", "down"])
+    assert len(FakeOpenAI.requests) == 2
+    assert best[0]["recommendation"] == "buy"
+    assert EmbeddingBackend.get("text-embedding-3-small") is EmbeddingBackend.get(
+        "text-embedding-3-small"
+    )
+
+
+@pytest.mark.unit
+def test_situation_embedded_once_across_memories(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    roles = ["bull", "bear", "trader", "invest_judge", "risk_manager"]
+    memories = [FinancialSituationMemory(f"{role}_memory", CONFIG) for role in roles]
+    curr_situation = "market report\n\nsentiment report\n\nnews report\n\nfundamentals report"
+
+    for memory in memories:
+        memory.add_situations([("past situation", "advice")])
+    for memory in memories:
+        memory.get_memories(curr_situation, n_matches=1)
+
+    inputs = [text for _, batch in FakeOpenAI.requests for text in batch]
+    assert inputs.count(curr_situation) == 1
+    assert inputs.count("past situation") == 1
+
+
+@pytest.mark.unit
+def test_disk_tier_and_lru(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    EmbeddingBackend.configure_cache(maxsize=2, cache_dir=str(tmp_path))
+    backend = EmbeddingBackend.get("text-embedding-3-small")
+
+    first = backend.embed(["a", "bb", "ccc"])
+    assert len(EmbeddingBackend.cache._vectors) == 2
+
+    # a new process starts with an empty memory tier but reads the disk tier
+    EmbeddingBackend.cache = EmbeddingCache(maxsize=2, cache_dir=str(tmp_path))
+    assert backend.embed(["ccc", "a"]) == [first[2], first[0]]
+    assert len(FakeOpenAI.requests) == 1
+    assert EmbeddingBackend.cache.hits == 2
@@ -0,0 +1,105 @@
+"""
+Tests for the cached finnhub data layer and the insider formatters
+"""
+
+import json
+import os
+
+import pytest
+
+import tradingagents.dataflows.config as config
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.finnhub_utils import (
+    FinnhubStore,
+    canonical_key,
+    get_data_in_range,
+    unique_entries,
+)
+
+
+def _write(data_dir, data_type, ticker, data):
+    folder = os.path.join(data_dir, "finnhub_data", data_type)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f"{ticker}_data_formatted.json"), "w") as f:
+        json.dump(data, f)
+
+
+@pytest.fixture
+def finnhub_dir(tmp_path, monkeypatch):
+    trade = {
+        "name": "DOE JOHN",
+        "share": 1000,
+        "change": -50,
+        "filingDate": "2024-03-04",
+        "transactionPrice": 10.5,
+        "transactionCode": "S",
+    }
+    # newest first, as the formatted files are written, with repeated filings
+    _write(
+        tmp_path,
+        "insider_trans",
+        "TEST",
+        {
+            "2024-03-06": [trade, {**trade, "change": -10}],
+            "2024-03-05": [],
+            "2024-03-04": [dict(reversed(list(trade.items())))],
+            "2024-02-01": [{**trade, "name": "ROE JANE"}],
+        },
+    )
+    monkeypatch.setitem(config._config, "data_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_range_matches_scan_and_keeps_file_order(finnhub_dir):
+    result = get_data_in_range(
+        "TEST", "2024-03-01", "2024-03-06", "insider_trans", str(finnhub_dir)
+    )
+    assert list(result) == ["2024-03-06", "2024-03-04"]
+    assert get_data_in_range(
+        "TEST", "2024-04-01", "2024-05-01", "insider_trans", str(finnhub_dir)
+    ) == {}
+
+
+@pytest.mark.unit
+def test_file_is_parsed_once_and_reloaded_on_change(finnhub_dir, monkeypatch):
+    path = FinnhubStore.data_path("TEST", "insider_trans", str(finnhub_dir))
+    FinnhubStore.load(path)
+
+    loads = []
+    monkeypatch.setattr(json, "load", lambda f: loads.append(f) or {})
+    FinnhubStore.load(path)
+    assert loads == []
+
+    with open(path, "a") as f:
+        f.write(" ")
+    assert FinnhubStore.load(path)[0] == {}
+    assert len(loads) == 1
+
+
+@pytest.mark.unit
+def test_unique_entries_matches_list_membership():
+    entries = [
+        {"a": 1, "b": [1, 2]},
+        {"b": [1, 2], "a": 1},
+        {"a": 1.0, "b": [1, 2]},
+        {"a": 1, "b": [2, 1]},
+        {"a": {"x": None}},
+        {"a": {"x": None}},
+    ]
+    expected = []
+    for entry in entries:
+        if entry not in expected:
+            expected.append(entry)
+
+    assert list(unique_entries(entries)) == expected
+    assert canonical_key({"a": []}) != canonical_key({"a": {}})
+
+
+@pytest.mark.unit
+def test_insider_transactions_deduplicated(finnhub_dir):
+    report = interface.get_finnhub_company_insider_transactions(
+        "TEST", "2024-03-06", 10
+    )
+    assert report.count("DOE JOHN") == 2
+    assert "ROE JANE" not in report
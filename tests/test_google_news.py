@@ -0,0 +1,131 @@
+"""
+Tests for the concurrent, cached Google News scraper
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import tradingagents.dataflows.config as config
+from tradingagents.dataflows import googlenews_utils
+from tradingagents.dataflows.googlenews_utils import TokenBucket, getNewsData
+
+PAGES = 4
+EMPTY_PAGE = b'<html><body><div id="search"></div></body></html>'
+CONSENT_PAGE = b"<html><body><form>Before you continue to Google</form></body></html>"
+
+
+def _page_html(page):
+    results = "".join(
+        f'<div class="SoaBEf"><a href="https://news/{page}/{i}">'
+        f'<div class="MBeuO">Title {page}-{i}</div></a>'
+        f'<div class="GI74Re">Snippet</div><div class="NUnG9d"><span>Wire</span></div></div>'
+        for i in range(3)
+    )
+    next_link = '<a id="pnnext" href="#">Next</a>' if page < PAGES - 1 else ""
+    return f'<html><body><div id="search">{results}</div>{next_link}</body></html>'.encode()
+
+
+@pytest.fixture
+def google(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        config, "_config", {**config.get_config(), "data_cache_dir": str(tmp_path)}
+    )
+    requested = []
+    lock = threading.Lock()
+
+    def fake_request(url, headers):
+        page = int(url.rsplit("start=", 1)[1]) // 10
+        with lock:
+            requested.append(page)
+        content = _page_html(page) if page < PAGES else EMPTY_PAGE
+        return SimpleNamespace(status_code=200, content=content)
+
+    monkeypatch.setattr(googlenews_utils, "make_request", fake_request)
+    return requested
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_pages_returned_in_order_and_cached(google, concurrency):
+    results = getNewsData("TSLA", "2024-05-01", "2024-05-07", concurrency=concurrency)
+
+    assert [r["title"] for r in results] == [
+        f"Title {page}-{i}" for page in range(PAGES) for i in range(3)
+    ]
+    assert results[0]["source"] == "Wire"
+    assert set(range(PAGES)) <= set(google)
+
+    # a rerun of the same query and window is served from the cache
+    fetched = len(google)
+    assert getNewsData("TSLA", "2024-05-01", "2024-05-07", concurrency=concurrency) == results
+    assert len(google) == fetched
+
+
+@pytest.mark.unit
+def test_cache_expires_and_is_keyed_by_window(google, monkeypatch):
+    getNewsData("TSLA", "2024-05-01", "2024-05-07", concurrency=1)
+    fetched = len(google)
+
+    getNewsData("TSLA", "2024-05-02", "2024-05-08", concurrency=1)
+    assert len(google) == 2 * fetched
+
+    monkeypatch.setattr(
+        config,
+        "_config",
+        {**config.get_config(), "google_news_cache_ttl_hours": 0},
+    )
+    getNewsData("TSLA", "2024-05-01", "2024-05-07", concurrency=1)
+    assert len(google) == 3 * fetched
+
+
+@pytest.mark.unit
+def test_token_bucket_limits_rate_across_threads():
+    bucket = TokenBucket(rate=50, capacity=2)
+    started = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 2 tokens up front, the other 10 at 50 per second
+    assert time.monotonic() - started >= 10 / 50 * 0.9
+
+
+@pytest.mark.unit
+def test_only_real_empty_pages_are_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        config, "_config", {**config.get_config(), "data_cache_dir": str(tmp_path)}
+    )
+    responses = [CONSENT_PAGE, _page_html(PAGES - 1), EMPTY_PAGE]
+
+    def fake_request(url, headers):
+        return SimpleNamespace(status_code=200, content=responses.pop(0))
+
+    monkeypatch.setattr(googlenews_utils, "make_request", fake_request)
+
+    # a consent page is not stored as "no news": the rerun asks Google again
+    assert getNewsData("TSLA", "2024-05-01", "2024-05-07", concurrency=1) == []
+    assert len(getNewsData("TSLA", "2024-05-01", "2024-05-07", concurrency=1)) == 3
+
+    # an empty result page from Google itself is
+    assert getNewsData("NONE", "2024-05-01", "2024-05-07", concurrency=1) == []
+    assert getNewsData("NONE", "2024-05-01", "2024-05-07", concurrency=1) == []
+    assert responses == []
+
+
+@pytest.mark.unit
+def test_limiter_and_session_follow_the_config(monkeypatch):
+    monkeypatch.setattr(
+        config, "_config", {**config.get_config(), "google_news_requests_per_second": 2}
+    )
+    bucket = googlenews_utils.get_rate_limiter()
+    session = googlenews_utils.get_session()
+    assert bucket.rate == 2
+    assert googlenews_utils.get_rate_limiter() is bucket
+
+    with config.use_config({"google_news_requests_per_second": 5, "google_news_concurrency": 7}):
+        assert googlenews_utils.get_rate_limiter().rate == 5
+        assert googlenews_utils.get_session() is not session
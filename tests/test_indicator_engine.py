@@ -0,0 +1,99 @@
+"""
+Parity tests for the NumPy indicator engine against stockstats
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from stockstats import wrap
+
+from tradingagents.dataflows.indicator_engine import IndicatorEngine, decayed_cumsum
+
+
+def _price_frame(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    volume = rng.integers(0, 10_000_000, n).astype(float)
+    # flat stretches and zero-volume days exercise the division guards
+    volume[40:60] = 0
+    close[80:90] = close[min(80, n - 1)]
+    return pd.DataFrame(
+        {
+            "Date": pd.bdate_range("2015-01-01", periods=n).strftime("%Y-%m-%d"),
+            "Open": close * (1 + rng.uniform(-0.01, 0.01, n)),
+            "High": close * (1 + rng.uniform(0, 0.02, n)),
+            "Low": close * (1 - rng.uniform(0, 0.02, n)),
+            "Close": close,
+            "Volume": volume,
+        }
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("n", [1, 15, 250, 2600])
+@pytest.mark.parametrize(
+    "indicator",
+    list(IndicatorEngine.SUPPORTED) + ["rsi_6", "atr_5", "close_5_ema", "high_20_sma"],
+)
+def test_matches_stockstats(n, indicator):
+    data = _price_frame(n, seed=n)
+    expected = wrap(data.copy())[indicator].values
+
+    got = IndicatorEngine(data).get(indicator)
+
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("column", ["Close", "High", "Volume"])
+@pytest.mark.parametrize(
+    "indicator",
+    list(IndicatorEngine.SUPPORTED) + ["rsi_6", "atr_5", "close_5_ema", "high_20_sma"],
+)
+def test_missing_prices_match_stockstats(column, indicator):
+    # a missing value must not poison every later row
+    data = _price_frame(300, seed=3)
+    data.loc[[0, 50, 51, 120], column] = np.nan
+    expected = wrap(data.copy())[indicator].values
+
+    got = IndicatorEngine(data).get(indicator)
+
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+    if column == "Close" and indicator != "mfi":
+        assert np.isfinite(got[-1])
+
+
+@pytest.mark.unit
+def test_compute_many_and_last_n():
+    data = _price_frame(500, seed=11)
+    engine = IndicatorEngine(data)
+
+    full = engine.compute(IndicatorEngine.SUPPORTED)
+    tail = engine.last(["macd", "boll_ub", "mfi"], 30)
+
+    assert set(full) == set(IndicatorEngine.SUPPORTED)
+    for indicator, values in tail.items():
+        assert len(values) == 30
+        np.testing.assert_array_equal(values, full[indicator][-30:])
+
+
+@pytest.mark.unit
+def test_decayed_cumsum_spans_multiple_blocks():
+    values = np.random.default_rng(5).normal(size=5000)
+    decay = 0.5  # forces blocks of ~332 rows
+
+    expected = np.empty_like(values)
+    acc = 0.0
+    for i, value in enumerate(values):
+        acc = value + decay * acc
+        expected[i] = acc
+
+    np.testing.assert_allclose(decayed_cumsum(values, decay), expected, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.unit
+def test_unsupported_indicator():
+    engine = IndicatorEngine(_price_frame(20, seed=1))
+    assert not IndicatorEngine.supports("kdjk")
+    with pytest.raises(ValueError):
+        engine.get("kdjk")
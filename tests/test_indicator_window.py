@@ -0,0 +1,132 @@
+"""
+Tests for the one-pass indicator window in get_stock_stats_indicators_window
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stockstats import wrap
+
+import tradingagents.dataflows.config as config
+import tradingagents.dataflows.interface as interface
+
+CSV_NAME = "TEST-YFin-data-2015-01-01-2025-03-25.csv"
+
+
+@pytest.fixture
+def price_data_dir(tmp_path, monkeypatch):
+    """Write a synthetic offline YFin CSV and point the interface at it"""
+    price_dir = tmp_path / "market_data" / "price_data"
+    price_dir.mkdir(parents=True)
+
+    n = 320
+    dates = pd.bdate_range("2024-01-01", periods=n)
+    rng = np.random.default_rng(7)
+    close = 100 + rng.standard_normal(n).cumsum()
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close + 0.2,
+            "High": close + 1.0,
+            "Low": close - 1.0,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, n),
+        }
+    ).to_csv(price_dir / CSV_NAME, index=False)
+
+    monkeypatch.setitem(config._config, "data_dir", str(tmp_path))
+    monkeypatch.setattr(
+        config,
+        "_config",
+        {**config.get_config(), "price_store_dir": str(tmp_path / "price_store")},
+    )
+    return price_dir
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("indicator", ["close_50_sma", "macd", "rsi", "boll_ub", "atr"])
+def test_window_matches_stockstats(price_data_dir, indicator):
+    curr_date = "2025-02-14"
+    report = interface.get_stock_stats_indicators_window(
+        "TEST", indicator, curr_date, 30, False
+    )
+    lines = [line for line in report.split("\n") if line.startswith("2025-")]
+
+    # one line per trading day between 2025-01-15 and 2025-02-14, newest first
+    assert len(lines) == 23
+    assert lines[0].startswith("2025-02-14: ")
+
+    # reference: stockstats over the whole CSV, as the per-day lookups used it
+    data = pd.read_csv(price_data_dir / CSV_NAME)
+    expected = dict(zip(data["Date"], wrap(data.copy())[indicator]))
+    for line in lines:
+        date, value = line.split(": ", 1)
+        assert float(value) == pytest.approx(expected[date], rel=1e-9, nan_ok=True)
+
+
+@pytest.mark.unit
+def test_offline_failures_keep_the_old_report(price_data_dir, monkeypatch):
+    def broken(*args, online=False):
+        raise ValueError("no such indicator")
+
+    monkeypatch.setattr(interface.StockstatsUtils, "get_stock_stats_window", broken)
+
+    # the trading days are still listed, without values
+    report = interface.get_stock_stats_indicators_window(
+        "TEST", "rsi", "2025-02-14", 30, False
+    )
+    lines = [line for line in report.split("\n") if line.startswith("2025-")]
+    assert len(lines) == 23
+    assert all(line.endswith(": ") for line in lines)
+
+    # and a missing price file raises
+    with pytest.raises(FileNotFoundError):
+        interface.get_stock_stats_indicators_window(
+            "NOPE", "rsi", "2025-02-14", 30, False
+        )
+
+
+@pytest.mark.unit
+def test_unreadable_csv_falls_back_to_online(monkeypatch):
+    calls = []
+
+    def get_stock_stats(symbol, indicator, curr_date, data_dir, online=False):
+        calls.append(("day", online))
+        if not online:
+            raise ValueError("Cannot parse CSV data")
+        return 42.0
+
+    def get_stock_stats_window(symbol, indicator, start, end, data_dir, online=False):
+        calls.append(("window", online))
+        if not online:
+            raise ValueError("Cannot parse CSV data")
+        return {start: 42.0}
+
+    monkeypatch.setattr(interface.StockstatsUtils, "get_stock_stats", get_stock_stats)
+    monkeypatch.setattr(
+        interface.StockstatsUtils, "get_stock_stats_window", get_stock_stats_window
+    )
+
+    assert interface.get_stockstats_indicator("TEST", "rsi", "2024-05-01", False) == "42.0"
+    assert interface.get_stockstats_indicator_window(
+        "TEST", "rsi", "2024-05-01", "2024-05-03", False
+    ) == {"2024-05-01": "42.0"}
+    assert calls == [("day", False), ("day", True), ("window", False), ("window", True)]
+
+    # other failures are not retried
+    def broken(*args, online=False):
+        calls.append(("broken", online))
+        raise ValueError("no such indicator")
+
+    monkeypatch.setattr(interface.StockstatsUtils, "get_stock_stats", broken)
+    monkeypatch.setattr(interface.StockstatsUtils, "get_stock_stats_window", broken)
+    calls.clear()
+    assert interface.get_stockstats_indicator("TEST", "rsi", "2024-05-01", False) == ""
+    assert interface.get_stockstats_indicator_window(
+        "TEST", "rsi", "2024-05-01", "2024-05-03", False
+    ) is None
+    assert calls == [("broken", False), ("broken", False)]
@@ -0,0 +1,105 @@
+"""
+Tests for the on-disk LLM response cache
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.agents.utils.llm_cache import LLMResponseCache
+
+
+class CountingModel(BaseChatModel):
+    """Answers with a numbered response, so replays are recognizable."""
+
+    model: str = "fake-model"
+    temperature: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-counting"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "temperature": self.temperature}
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        self.calls += 1
+        message = AIMessage(f"answer {self.calls} " + "x" * 500)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.mark.unit
+def test_replayed_calls_hit_the_cache_across_instances(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    llm = CountingModel(cache=LLMResponseCache(path))
+    first = llm.invoke("What now?")
+    assert llm.invoke("What now?").content == first.content
+
+    # a new process reopens the same file; volatile message ids are ignored
+    cache = LLMResponseCache(path)
+    replay = CountingModel(cache=cache)
+    prompt = [HumanMessage("What now?", id="another-run")]
+    assert replay.invoke(prompt).content == first.content
+    assert asyncio.run(replay.ainvoke(prompt)).content == first.content
+    assert replay.calls == 0
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.unit
+def test_model_settings_and_tools_are_part_of_the_key(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"))
+    CountingModel(cache=cache).invoke("What now?")
+
+    for llm in (
+        CountingModel(cache=cache, temperature=0.7),
+        CountingModel(cache=cache, model="other-model"),
+        CountingModel(cache=cache).bind(tools=[{"name": "get_news"}]),
+    ):
+        llm.invoke("What now?")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 4, 4)
+
+    namespaced = LLMResponseCache(str(tmp_path / "llm.sqlite"), namespace="anthropic")
+    CountingModel(cache=namespaced).invoke("What now?")
+    assert namespaced.stats()["misses"] == 1
+
+
+@pytest.mark.unit
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"), max_bytes=4000)
+    llm = CountingModel(cache=cache)
+    for i in range(20):
+        llm.invoke(f"question {i}")
+        llm.invoke("question 0")  # keeps the first answer recently used
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 4000
+    assert 0 < stats["entries"] < 20
+    calls = llm.calls
+    llm.invoke("question 0")
+    llm.invoke("question 1")
+    assert llm.calls == calls + 1
+
+
+@pytest.mark.unit
+def test_size_cap_holds_across_connections(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    first = CountingModel(cache=LLMResponseCache(path, max_bytes=4000))
+    second = CountingModel(cache=LLMResponseCache(path, max_bytes=4000))
+    for i in range(10):
+        first.invoke(f"first {i}")
+        second.invoke(f"second {i}")
+
+    # each connection counts what the other one wrote
+    stats = LLMResponseCache(path).stats()
+    assert stats["bytes"] <= 4000
+    assert 0 < stats["entries"] < 20
@@ -0,0 +1,202 @@
+"""
+Tests for the shared, role-partitioned memory store
+"""
+
+import os
+import uuid
+
+import numpy as np
+import pytest
+
+from tradingagents.agents.utils.embeddings import EmbeddingBackend
+from tradingagents.agents.utils.memory import (
+    MEMORY_ROLES,
+    FinancialSituationMemory,
+    MemoryStore,
+)
+
+
+def _vector(text):
+    rng = np.random.default_rng(abs(hash(text)) % 2**32)
+    return rng.standard_normal(8).tolist()
+
+
+@pytest.fixture(params=["chroma", "numpy"])
+def config(request, monkeypatch):
+    monkeypatch.setattr(MemoryStore, "_stores", {})
+    monkeypatch.setattr(
+        EmbeddingBackend, "embed", lambda self, texts: [_vector(t) for t in texts]
+    )
+    return {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_backend": request.param,
+        "memory_collection": f"test_{uuid.uuid4().hex}",
+    }
+
+
+def _fill(config, per_role=6):
+    for role in MEMORY_ROLES:
+        FinancialSituationMemory(role, config).add_situations(
+            [(f"{role} situation {i}", f"{role} advice {i}") for i in range(per_role)]
+        )
+
+
+@pytest.mark.unit
+def test_memories_are_shared_and_partitioned_by_role(config):
+    _fill(config)
+    # a second graph / worker sees the same memories
+    bull = FinancialSituationMemory("bull_memory", config)
+    bear = FinancialSituationMemory("bear_memory", config)
+
+    assert bull.store is bear.store
+    assert bull.store.count() == 6 * len(MEMORY_ROLES)
+    assert bull.store.count("bull_memory") == 6
+
+    matches = bull.get_memories("bull_memory situation 3", n_matches=2)
+    assert len(matches) == 2
+    assert all(m["recommendation"].startswith("bull_memory") for m in matches)
+    assert matches[0]["matched_situation"] == "bull_memory situation 3"
+
+
+@pytest.mark.unit
+def test_embedding_models_get_separate_stores(config):
+    _fill(config)
+    local = {**config, "backend_url": "http://localhost:11434/v1"}
+
+    store = FinancialSituationMemory("bull_memory", local).store
+    assert store is not FinancialSituationMemory("bull_memory", config).store
+    assert store.embedding == "nomic-embed-text"
+    # a separate index, not the same collection under another key
+    assert store.count() == 0
+
+
+@pytest.mark.unit
+def test_one_vector_search_serves_every_role(config, monkeypatch):
+    if config["memory_backend"] != "chroma":
+        pytest.skip("counts Chroma queries")
+    _fill(config)
+    store = MemoryStore.get(config)
+    searches = []
+    search = store.collection.query
+    monkeypatch.setattr(
+        store.collection, "query", lambda **kw: searches.append(kw) or search(**kw)
+    )
+
+    situation = "market report\n\nsentiment\n\nnews\n\nfundamentals"
+    results = {
+        role: FinancialSituationMemory(role, config).get_memories(situation, n_matches=2)
+        for role in MEMORY_ROLES
+    }
+    assert len(searches) == 1
+
+    # same answer as searching each role on its own
+    for role in MEMORY_ROLES:
+        alone = store.collection.query(
+            query_embeddings=[_vector(situation)],
+            n_results=2,
+            where={"role": role},
+            include=["documents"],
+        )
+        assert [m["matched_situation"] for m in results[role]] == alone["documents"][0]
+
+    # a write invalidates the shared result
+    FinancialSituationMemory("trader_memory", config).add_situations([(situation, "new")])
+    searches.clear()
+    trader = FinancialSituationMemory("trader_memory", config).get_memories(situation, 1)
+    assert trader[0]["recommendation"] == "new"
+    assert len(searches) == 1
+
+
+@pytest.mark.unit
+def test_unbalanced_roles_still_get_top_k(config):
+    FinancialSituationMemory("bull_memory", config).add_situations(
+        [(f"bull situation {i}", f"bull {i}") for i in range(100)]
+    )
+    FinancialSituationMemory("bear_memory", config).add_situations(
+        [("bear situation", "bear")]
+    )
+    bear = FinancialSituationMemory("bear_memory", config).get_memories("anything", 2)
+    assert [m["recommendation"] for m in bear] == ["bear"]
+
+
+@pytest.mark.unit
+def test_persistent_store_survives_restart(config, tmp_path, monkeypatch):
+    config = {**config, "memory_dir": str(tmp_path / "memory")}
+    FinancialSituationMemory("risk_manager_memory", config).add_situations(
+        [("crash", "hedge")]
+    )
+
+    # a new process opens the same directory
+    monkeypatch.setattr(MemoryStore, "_stores", {})
+    memory = FinancialSituationMemory("risk_manager_memory", config)
+    assert memory.get_memories("crash", 1)[0]["recommendation"] == "hedge"
+
+
+def _normalized(text):
+    vector = np.asarray(_vector(text))
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+@pytest.mark.unit
+def test_flat_index_matches_chroma(monkeypatch):
+    monkeypatch.setattr(MemoryStore, "_stores", {})
+    monkeypatch.setattr(
+        EmbeddingBackend, "embed", lambda self, texts: [_normalized(t) for t in texts]
+    )
+    stores = {}
+    for backend in ("chroma", "numpy"):
+        config = {
+            "backend_url": "https://api.openai.com/v1",
+            "memory_backend": backend,
+            "memory_collection": f"test_{uuid.uuid4().hex}",
+        }
+        _fill(config, per_role=40)
+        stores[backend] = MemoryStore.get(config)
+
+    for situation in ("bull_memory situation 7", "unrelated", "news"):
+        chroma = stores["chroma"].query_roles(situation, MEMORY_ROLES, 3)
+        flat = stores["numpy"].query_roles(situation, MEMORY_ROLES, 3)
+        for role in MEMORY_ROLES:
+            assert [m["matched_situation"] for m in flat[role]] == [
+                m["matched_situation"] for m in chroma[role]
+            ]
+            np.testing.assert_allclose(
+                [m["similarity_score"] for m in flat[role]],
+                [m["similarity_score"] for m in chroma[role]],
+                atol=1e-4,
+            )
+
+    batched = stores["numpy"].query_many(["unrelated", "news"], MEMORY_ROLES, 3)
+    single = stores["numpy"].query_roles("news", MEMORY_ROLES, 3)
+    for role in MEMORY_ROLES:
+        assert [m["recommendation"] for m in batched[1][role]] == [
+            m["recommendation"] for m in single[role]
+        ]
+
+
+@pytest.mark.unit
+def test_flat_store_ignores_interrupted_append(tmp_path, monkeypatch):
+    monkeypatch.setattr(MemoryStore, "_stores", {})
+    monkeypatch.setattr(
+        EmbeddingBackend, "embed", lambda self, texts: [_vector(t) for t in texts]
+    )
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_backend": "numpy",
+        "memory_dir": str(tmp_path),
+    }
+    store = MemoryStore.get(config)
+    store.add("trader_memory", [("a", "1"), ("b", "2")])
+
+    # a crash after the vector rows were written but before the records were
+    with open(os.path.join(store.path, "vectors.f32"), "ab") as f:
+        f.write(np.zeros(8, dtype=np.float32).tobytes())
+
+    monkeypatch.setattr(MemoryStore, "_stores", {})
+    reopened = MemoryStore.get(config)
+    assert reopened.count() == 2
+    reopened.add("trader_memory", [("c", "3")])
+    assert reopened.count("trader_memory") == 3
+    assert reopened.query_roles("c", ["trader_memory"], 1)["trader_memory"][0][
+        "recommendation"
+    ] == "3"
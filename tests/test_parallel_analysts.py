@@ -0,0 +1,130 @@
+"""
+Tests for running the analyst team as parallel branches
+"""
+
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+import tradingagents.graph.setup as graph_setup
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import ANALYST_REPORTS, GraphSetup
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+ANALYST_FACTORIES = {
+    "market": "create_market_analyst",
+    "social": "create_social_media_analyst",
+    "news": "create_news_analyst",
+    "fundamentals": "create_fundamentals_analyst",
+}
+
+
+def _fake_analyst(analyst_type, seen, barrier):
+    def node(state):
+        messages = state["messages"]
+        seen.setdefault(analyst_type, []).append([m.content for m in messages])
+        if not isinstance(messages[-1], ToolMessage):
+            if barrier is not None:
+                # every branch must be running at once to get past this
+                barrier.wait(timeout=5)
+            call = {"name": f"{analyst_type}_tool", "args": {}, "id": analyst_type}
+            return {"messages": [AIMessage(content="", tool_calls=[call])]}
+        return {
+            "messages": [AIMessage(content=f"{analyst_type} report")],
+            ANALYST_REPORTS[analyst_type]: f"{analyst_type} report",
+        }
+
+    return node
+
+
+def _fake_tools(analyst_type):
+    def node(state):
+        return {
+            "messages": [
+                ToolMessage(content=f"{analyst_type} data", tool_call_id=analyst_type)
+            ]
+        }
+
+    return node
+
+
+def _build(monkeypatch, parallel, barrier=None):
+    seen, reports_at_bull = {}, []
+    for analyst_type, factory in ANALYST_FACTORIES.items():
+        monkeypatch.setattr(
+            graph_setup,
+            factory,
+            lambda llm, toolkit, t=analyst_type: _fake_analyst(t, seen, barrier),
+        )
+
+    def bull(state):
+        reports_at_bull.append({key: state[key] for key in ANALYST_REPORTS.values()})
+        debate = dict(state["investment_debate_state"], count=100)
+        return {"investment_debate_state": debate}
+
+    def risky(state):
+        return {"risk_debate_state": dict(state["risk_debate_state"], count=100)}
+
+    def noop(state):
+        return {}
+
+    monkeypatch.setattr(graph_setup, "create_bull_researcher", lambda *a: bull)
+    monkeypatch.setattr(graph_setup, "create_risky_debator", lambda *a: risky)
+    for factory in (
+        "create_bear_researcher",
+        "create_research_manager",
+        "create_trader",
+        "create_neutral_debator",
+        "create_safe_debator",
+        "create_risk_manager",
+    ):
+        monkeypatch.setattr(graph_setup, factory, lambda *a: noop)
+
+    setup = GraphSetup(
+        None,
+        None,
+        None,
+        {analyst_type: _fake_tools(analyst_type) for analyst_type in ANALYSTS},
+        None,
+        None,
+        None,
+        None,
+        None,
+        ConditionalLogic(),
+    )
+    graph = setup.setup_graph(ANALYSTS, parallel_analysts=parallel)
+    return graph, seen, reports_at_bull
+
+
+@pytest.mark.unit
+def test_parallel_analysts_join_before_bull_researcher(monkeypatch):
+    barrier = threading.Barrier(len(ANALYSTS))
+    graph, seen, reports_at_bull = _build(monkeypatch, True, barrier)
+
+    state = graph.invoke(Propagator().create_initial_state("NVDA", "2024-05-10"))
+
+    expected = {key: f"{t} report" for t, key in ANALYST_REPORTS.items()}
+    assert reports_at_bull == [expected]
+    for key, report in expected.items():
+        assert state[key] == report
+
+    # each branch only ever saw its own conversation
+    for analyst_type in ANALYSTS:
+        assert seen[analyst_type] == [
+            ["NVDA"],
+            ["NVDA", "", f"{analyst_type} data"],
+        ]
+
+
+@pytest.mark.unit
+def test_sequential_mode_produces_the_same_reports(monkeypatch):
+    graph, _, reports_at_bull = _build(monkeypatch, False)
+
+    state = graph.invoke(Propagator().create_initial_state("NVDA", "2024-05-10"))
+
+    expected = {key: f"{t} report" for t, key in ANALYST_REPORTS.items()}
+    assert reports_at_bull == [expected]
+    for key, report in expected.items():
+        assert state[key] == report
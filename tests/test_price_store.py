@@ -0,0 +1,139 @@
+"""
+Tests for the columnar price store behind the offline YFin lookups
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tradingagents.dataflows.config as config
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.price_store import PriceStore
+
+CSV_NAME = "TEST-YFin-data-2015-01-01-2025-03-25.csv"
+
+
+@pytest.fixture
+def price_csv(tmp_path, monkeypatch):
+    price_dir = tmp_path / "market_data" / "price_data"
+    price_dir.mkdir(parents=True)
+
+    n = 120
+    dates = pd.bdate_range("2024-11-01", periods=n)
+    rng = np.random.default_rng(3)
+    close = 50 + rng.standard_normal(n).cumsum()
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close + 0.5,
+            "High": close + 1.5,
+            "Low": close - 1.5,
+            "Close": close,
+            "Adj Close": close * 0.99,
+            "Volume": rng.integers(1_000, 9_000, n),
+        }
+    ).to_csv(price_dir / CSV_NAME, index=False)
+
+    monkeypatch.setitem(config._config, "data_dir", str(tmp_path))
+    monkeypatch.setattr(
+        config,
+        "_config",
+        {**config.get_config(), "price_store_dir": str(tmp_path / "price_store")},
+    )
+    return price_dir / CSV_NAME
+
+
+def _csv_window(csv_path, start_date, end_date):
+    """Reference implementation: the CSV scan the store replaces"""
+    data = pd.read_csv(csv_path)
+    data["DateOnly"] = data["Date"].str[:10]
+    filtered = data[(data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)]
+    return filtered.drop("DateOnly", axis=1)
+
+
+@pytest.mark.unit
+def test_store_slices_match_csv_filter(price_csv):
+    prices = PriceStore().load(str(price_csv))
+    lo, hi = prices.date_range("2025-01-04", "2025-02-10")
+
+    expected = _csv_window(price_csv, "2025-01-04", "2025-02-10")
+    pd.testing.assert_frame_equal(prices.to_frame(lo, hi), expected)
+
+
+@pytest.mark.unit
+def test_yfin_lookups_keep_their_output(price_csv):
+    expected = _csv_window(price_csv, "2025-01-01", "2025-02-01")
+
+    frame = interface.get_YFin_data("TEST", "2025-01-01", "2025-02-01")
+    pd.testing.assert_frame_equal(frame, expected.reset_index(drop=True))
+
+    report = interface.get_YFin_data_window("TEST", "2025-02-01", 31)
+    with pd.option_context(
+        "display.max_rows", None, "display.max_columns", None, "display.width", None
+    ):
+        assert report.endswith(expected.to_string())
+
+
+@pytest.mark.unit
+def test_store_reingests_changed_csv(price_csv):
+    store = PriceStore()
+    assert len(store.load(str(price_csv))) == 120
+
+    data = pd.read_csv(price_csv).iloc[:100]
+    data.to_csv(price_csv, index=False)
+    os.utime(price_csv, ns=(0, 0))
+
+    assert len(store.load(str(price_csv))) == 100
+
+
+@pytest.mark.unit
+def test_same_file_name_in_two_data_dirs(price_csv, tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    other_csv = other_dir / CSV_NAME
+    pd.read_csv(price_csv).iloc[:30].to_csv(other_csv, index=False)
+
+    store = PriceStore()
+    assert store.entry_dir(str(price_csv)) != store.entry_dir(str(other_csv))
+    assert len(store.load(str(price_csv))) == 120
+    assert len(store.load(str(other_csv))) == 30
+
+    # neither load replaced the other's entry, so nothing is ingested again
+    pointers = {
+        path: os.stat(os.path.join(store.entry_dir(path), "CURRENT")).st_mtime_ns
+        for path in (str(price_csv), str(other_csv))
+    }
+    PriceStore._cache.clear()
+    assert len(store.load(str(price_csv))) == 120
+    assert len(store.load(str(other_csv))) == 30
+    for path, mtime_ns in pointers.items():
+        assert os.stat(os.path.join(store.entry_dir(path), "CURRENT")).st_mtime_ns == mtime_ns
+
+
+@pytest.mark.unit
+def test_reingest_swaps_versions_in_place(price_csv):
+    store = PriceStore()
+    old = store.load(str(price_csv))
+    entry = store.entry_dir(str(price_csv))
+
+    data = pd.read_csv(price_csv).iloc[:50]
+    data.to_csv(price_csv, index=False)
+    os.utime(price_csv, ns=(0, 0))
+    assert len(store.load(str(price_csv))) == 50
+
+    # one published version behind the pointer; the old mmap stays readable
+    versions = [name for name in os.listdir(entry) if name != "CURRENT"]
+    assert len(versions) == 1
+    assert len(old.to_frame()) == 120
+
+
+@pytest.mark.unit
+def test_entry_that_never_opens_raises(price_csv, monkeypatch):
+    store = PriceStore()
+    # another writer replaces every version before it can be opened
+    monkeypatch.setattr(PriceStore, "_open", lambda self, entry: None)
+
+    with pytest.raises(Exception, match="kept changing"):
+        store.load(str(price_csv))
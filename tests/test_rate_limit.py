@@ -0,0 +1,223 @@
+"""
+Tests for the provider rate limiters and the adaptive concurrency controller
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents.utils import rate_limit
+from tradingagents.agents.utils.llm_cache import LLMResponseCache
+from tradingagents.agents.utils.rate_limit import (
+    AdaptiveConcurrency,
+    ProviderRateLimiter,
+    invoke_with_retry,
+    is_rate_limit_error,
+)
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.mark.unit
+def test_request_bucket_holds_back_once_exhausted():
+    # 60 requests per minute with a 2 second burst: two calls, then one per second
+    limiter = ProviderRateLimiter(requests_per_minute=60, burst_seconds=2)
+
+    assert limiter.acquire(blocking=False)
+    assert limiter.acquire(blocking=False)
+    assert not limiter.acquire(blocking=False)
+    assert 0 < limiter._try_acquire() <= 1
+
+
+@pytest.mark.unit
+def test_token_usage_is_settled_against_the_estimate():
+    limiter = ProviderRateLimiter(tokens_per_minute=6000, tokens_per_request=100, burst_seconds=10)
+
+    assert limiter.acquire(blocking=False)
+    # the call used far more than estimated: the bucket goes into debt
+    limiter.record(latency=1.0, tokens=1100)
+
+    assert limiter.tokens < 0
+    assert limiter.tokens_per_request == pytest.approx(300)
+    assert not limiter.acquire(blocking=False)
+
+
+@pytest.mark.unit
+def test_unlimited_limiter_never_waits():
+    limiter = ProviderRateLimiter()
+
+    assert not limiter.limited
+    assert all(limiter.acquire(blocking=False) for _ in range(100))
+
+
+@pytest.mark.unit
+def test_limiters_are_shared_per_provider_and_model():
+    config = {
+        "llm_provider": f"provider-{uuid.uuid4()}",
+        "quick_think_llm": "small",
+        "deep_think_llm": "small",
+        "llm_requests_per_minute": 30,
+    }
+
+    limiters = ProviderRateLimiter.for_config(config)
+
+    assert len(limiters) == 1
+    assert limiters[0] is ProviderRateLimiter.get(config["llm_provider"], "small")
+    assert limiters[0].requests_per_minute == 30
+
+
+@pytest.mark.unit
+def test_callback_records_provider_calls_but_not_cache_hits(tmp_path):
+    limiter = ProviderRateLimiter()
+    latencies = []
+
+    class Observer:
+        def observe(self, latency=None, throttled=False, source=None):
+            latencies.append((latency, throttled))
+
+    limiter.observers.append(Observer())
+    generation = ChatGeneration(message=AIMessage("ok"))
+    cache = LLMResponseCache(str(tmp_path / "responses.sqlite"))
+    cache.update("prompt", "model", [generation])
+
+    cached = uuid.uuid4()
+    limiter.callback.on_chat_model_start({}, [], run_id=cached)
+    limiter.callback.on_llm_end(
+        LLMResult(generations=[cache.lookup("prompt", "model")]), run_id=cached
+    )
+
+    called = uuid.uuid4()
+    limiter.callback.on_chat_model_start({}, [], run_id=called)
+    limiter.callback.on_llm_end(
+        LLMResult(generations=[[generation]], llm_output={"token_usage": {"total_tokens": 500}}),
+        run_id=called,
+    )
+
+    # providers that report no llm_output still reached the API
+    bare = uuid.uuid4()
+    limiter.callback.on_chat_model_start({}, [], run_id=bare)
+    limiter.callback.on_llm_end(LLMResult(generations=[[generation]]), run_id=bare)
+
+    throttled = uuid.uuid4()
+    limiter.callback.on_chat_model_start({}, [], run_id=throttled)
+    limiter.callback.on_llm_error(RateLimitError("Too Many Requests"), run_id=throttled)
+
+    assert len(latencies) == 3
+    assert all(latency is not None and not hit for latency, hit in latencies[:2])
+    assert latencies[2] == (None, True)
+    assert limiter.throttled == 1
+
+
+@pytest.mark.unit
+def test_calls_are_retried_on_rate_limit_errors(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_backoff", lambda attempt: 0)
+    calls = []
+
+    def flaky(llm_input):
+        calls.append(llm_input)
+        if len(calls) < 3:
+            raise RateLimitError("Too Many Requests")
+        return "ok"
+
+    assert invoke_with_retry(RunnableLambda(flaky), "prompt") == "ok"
+    assert len(calls) == 3
+
+    def broken(llm_input):
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        invoke_with_retry(RunnableLambda(broken), "prompt")
+
+
+@pytest.mark.unit
+def test_limited_models_leave_retries_to_the_limiter(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    config = DEFAULT_CONFIG.copy()
+    config.update(disable_memory=True, project_dir=str(tmp_path))
+
+    assert TradingAgentsGraph(["market"], config=config).quick_thinking_llm.max_retries != 0
+
+    # a model of its own, so no other test shares its limiter
+    config["quick_think_llm"] = f"model-{uuid.uuid4()}"
+    config["llm_requests_per_minute"] = 60
+    ta = TradingAgentsGraph(["market"], config=config)
+
+    assert ta.quick_thinking_llm.max_retries == 0
+
+
+@pytest.mark.unit
+def test_rate_limit_errors_are_recognised():
+    assert is_rate_limit_error(RateLimitError("slow down"))
+    assert is_rate_limit_error(Exception("Error code: 429 - rate limit exceeded"))
+    assert not is_rate_limit_error(ValueError("bad request"))
+
+
+@pytest.mark.unit
+def test_limit_grows_additively_and_halves_on_throttling():
+    controller = AdaptiveConcurrency(initial=4, maximum=8, cooldown=60)
+
+    for _ in range(4):
+        controller.observe(latency=1.0)
+    assert controller.limit == pytest.approx(5, abs=0.1)
+
+    controller.observe(throttled=True)
+    halved = controller.limit
+    assert halved == pytest.approx(2.5, abs=0.1)
+
+    # within the cooldown a second 429 does not cut again
+    controller.observe(throttled=True)
+    assert controller.limit == halved
+
+
+@pytest.mark.unit
+def test_slow_calls_do_not_cut_the_limit():
+    controller = AdaptiveConcurrency(initial=8, maximum=8)
+
+    # short tool-routing calls followed by a long report
+    for _ in range(5):
+        controller.observe(latency=0.5)
+    controller.observe(latency=60.0)
+
+    assert controller.limit == 8
+
+
+@pytest.mark.unit
+def test_limit_stays_within_bounds():
+    controller = AdaptiveConcurrency(initial=2, minimum=2, maximum=3, cooldown=0)
+
+    for _ in range(50):
+        controller.observe(latency=1.0)
+    assert controller.limit == 3
+
+    for _ in range(5):
+        controller.observe(throttled=True)
+    assert controller.limit == 2
+
+
+@pytest.mark.unit
+def test_acquire_blocks_beyond_the_limit():
+    controller = AdaptiveConcurrency(initial=1)
+    entered = threading.Event()
+
+    def second():
+        with controller:
+            entered.set()
+
+    with controller:
+        thread = threading.Thread(target=second)
+        thread.start()
+        time.sleep(0.1)
+        assert not entered.is_set()
+
+    thread.join(timeout=2)
+    assert entered.is_set()
+    assert controller.in_flight == 0
@@ -0,0 +1,187 @@
+"""
+Tests for the day index over the reddit corpus
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import tradingagents.dataflows.config as config
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows import reddit_utils
+from tradingagents.dataflows.reddit_utils import (
+    RedditIndex,
+    fetch_top_from_category,
+    ticker_to_company,
+)
+
+DATES = ["2024-05-0%d" % day for day in range(1, 8)]
+
+
+@pytest.fixture
+def reddit_dir(tmp_path, monkeypatch):
+    rng = np.random.default_rng(11)
+    start = datetime(2024, 4, 30).timestamp()
+    for category, subreddits in (
+        ("global_news", ("worldnews", "economics")),
+        ("company_news", ("stocks", "investing", "wallstreetbets")),
+    ):
+        folder = tmp_path / "reddit_data" / category
+        folder.mkdir(parents=True)
+        for subreddit in subreddits:
+            with open(folder / f"{subreddit}.jsonl", "w") as f:
+                for i in range(200):
+                    company = rng.choice(["Apple", "Tesla", "nothing", "TSLA"])
+                    f.write(
+                        json.dumps(
+                            {
+                                "created_utc": start + rng.uniform(0, 9 * 86400),
+                                "title": f"{subreddit} post {i} about {company}",
+                                "selftext": "" if i % 3 else f"body {i}",
+                                "url": f"https://reddit.com/{subreddit}/{i}",
+                                "ups": int(rng.integers(0, 500)),
+                            }
+                        )
+                        + "\n"
+                    )
+                    if i % 50 == 0:
+                        f.write("\n")
+
+    monkeypatch.setitem(config._config, "data_dir", str(tmp_path))
+    monkeypatch.setattr(
+        config, "_config", {**config.get_config(), "data_cache_dir": str(tmp_path / "cache")}
+    )
+    RedditIndex._indexes.clear()
+    interface.get_reddit_global_news.cache.clear()
+    return tmp_path / "reddit_data"
+
+
+def _scan_day(category, date, max_limit, query, data_path):
+    """Reference implementation: the full per-day scan the index replaces"""
+    files = os.listdir(os.path.join(data_path, category))
+    limit_per_subreddit = max_limit // len(files)
+    all_content = []
+    for data_file in files:
+        posts = []
+        with open(os.path.join(data_path, category, data_file), "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                parsed = json.loads(line)
+                post_date = datetime.utcfromtimestamp(parsed["created_utc"]).strftime("%Y-%m-%d")
+                if post_date != date:
+                    continue
+                if "company" in category and query:
+                    terms = ticker_to_company[query].split(" OR ") + [query]
+                    if not any(
+                        re.search(t, parsed["title"], re.IGNORECASE)
+                        or re.search(t, parsed["selftext"], re.IGNORECASE)
+                        for t in terms
+                    ):
+                        continue
+                posts.append(
+                    {
+                        "title": parsed["title"],
+                        "content": parsed["selftext"],
+                        "url": parsed["url"],
+                        "upvotes": parsed["ups"],
+                        "posted_date": post_date,
+                    }
+                )
+        posts.sort(key=lambda x: x["upvotes"], reverse=True)
+        all_content.extend(posts[:limit_per_subreddit])
+    return all_content
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "category, query", [("global_news", None), ("company_news", "TSLA")]
+)
+def test_range_matches_per_day_scan(reddit_dir, category, query):
+    result = reddit_utils.fetch_top_from_category_range(
+        category, DATES, 6, query, data_path=str(reddit_dir)
+    )
+    for date in DATES:
+        expected = _scan_day(category, date, 6, query, str(reddit_dir))
+        assert result[date] == expected
+        assert fetch_top_from_category(category, date, 6, query, str(reddit_dir)) == expected
+
+
+@pytest.mark.unit
+def test_corpus_scanned_once_per_file(reddit_dir, monkeypatch):
+    scans = []
+    scan = RedditIndex.scan
+    monkeypatch.setattr(
+        RedditIndex, "scan", staticmethod(lambda path: scans.append(path) or scan(path))
+    )
+
+    report = interface.get_reddit_global_news("2024-05-07", 6, 4)
+    assert report.startswith("## Global News Reddit, from 2024-05-01 to")
+    assert len(scans) == 2
+
+    # a new process reuses the saved index
+    RedditIndex._indexes.clear()
+    interface.get_reddit_global_news.cache.clear()
+    interface.get_reddit_global_news("2024-05-07", 6, 4)
+    assert len(scans) == 2
+
+    # an edited file is indexed again
+    with open(reddit_dir / "global_news" / "economics.jsonl", "a") as f:
+        f.write("\n")
+    interface.get_reddit_global_news.cache.clear()
+    interface.get_reddit_global_news("2024-05-07", 6, 4)
+    assert len(scans) == 3
+
+
+@pytest.mark.unit
+def test_same_file_name_in_two_data_dirs_keeps_two_indexes(reddit_dir, tmp_path):
+    other = tmp_path / "other" / "reddit_data" / "global_news"
+    other.mkdir(parents=True)
+    source = reddit_dir / "global_news" / "economics.jsonl"
+    with open(source) as f:
+        lines = f.readlines()
+    with open(other / "economics.jsonl", "w") as f:
+        f.writelines(lines[:20])
+
+    index = RedditIndex()
+    first = index.get(str(source))
+    second = index.get(str(other / "economics.jsonl"))
+
+    # a new process must not read one file's saved index for the other
+    RedditIndex._indexes.clear()
+    assert index.get(str(source)) == first
+    assert index.get(str(other / "economics.jsonl")) == second
+    assert first != second
+
+
+@pytest.mark.unit
+def test_company_tagger_matches_per_ticker_search():
+    tickers = list(ticker_to_company)
+    tagger = reddit_utils.CompanyTagger(tickers)
+    texts = [
+        "Squarespace and Block both reported",
+        "TSMC beats, Taiwan Semiconductor Manufacturing Company guides up",
+        "nothing here",
+        "",
+        "JP Morgan on meta platforms, SNAP INC. and ASML earnings",
+        "fox news",
+    ]
+    for text in texts:
+        expected = {
+            ticker
+            for ticker in tickers
+            if any(re.search(t, text, re.IGNORECASE) for t in reddit_utils.company_search_terms(ticker))
+        }
+        assert tagger.tag(text) == expected
+
+
+@pytest.mark.unit
+def test_bulk_matches_single_ticker_reports(reddit_dir):
+    reports = interface.get_reddit_companies_news(["TSLA", "AAPL"], "2024-05-07", 6, 6)
+    for ticker in ("TSLA", "AAPL"):
+        assert reports[ticker] == interface.get_reddit_company_news(ticker, "2024-05-07", 6, 6)
+    assert "Tesla" in reports["TSLA"] and "Apple" not in reports["TSLA"]
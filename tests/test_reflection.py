@@ -0,0 +1,133 @@
+"""
+Tests for reflecting on every agent at once after a trade
+"""
+
+import asyncio
+import threading
+import uuid
+from typing import Any, List, Optional
+
+import numpy as np
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.agents.utils.embeddings import EmbeddingBackend
+from tradingagents.agents.utils.memory import (
+    MEMORY_ROLES,
+    FinancialSituationMemory,
+    MemoryStore,
+)
+from tradingagents.graph.reflection import Reflector
+
+
+class LessonModel(BaseChatModel):
+    """Returns a lesson naming the decision it reflected on."""
+
+    barrier: Optional[Any] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-reflection"
+
+    def _answer(self, messages: List[BaseMessage]) -> ChatResult:
+        decision = messages[-1].content.split("Analysis/Decision: ")[1].split("\n")[0]
+        message = AIMessage(f"lesson from {decision}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        if self.barrier is not None:
+            # only passes once all five reflections are running at once
+            self.barrier.wait(timeout=5)
+        return self._answer(messages)
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        return self._answer(messages)
+
+
+STATE = {
+    "market_report": "market",
+    "sentiment_report": "sentiment",
+    "news_report": "news",
+    "fundamentals_report": "fundamentals",
+    "investment_debate_state": {
+        "bull_history": "bull case",
+        "bear_history": "bear case",
+        "judge_decision": "invest plan",
+    },
+    "trader_investment_plan": "trader plan",
+    "risk_debate_state": {"judge_decision": "final decision"},
+}
+LESSONS = {
+    "bull_memory": "lesson from bull case",
+    "bear_memory": "lesson from bear case",
+    "trader_memory": "lesson from trader plan",
+    "invest_judge_memory": "lesson from invest plan",
+    "risk_manager_memory": "lesson from final decision",
+}
+
+
+@pytest.fixture
+def memories(monkeypatch):
+    embedded = []
+
+    def embed(self, texts):
+        embedded.append(list(texts))
+        return [np.ones(8).tolist() for _ in texts]
+
+    monkeypatch.setattr(MemoryStore, "_stores", {})
+    monkeypatch.setattr(EmbeddingBackend, "embed", embed)
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_backend": "numpy",
+        "memory_collection": f"test_{uuid.uuid4().hex}",
+    }
+    return [FinancialSituationMemory(role, config) for role in MEMORY_ROLES], embedded
+
+
+def _stored(memories):
+    store = memories[0].store
+    return {
+        role: [m["recommendation"] for m in matches]
+        for role, matches in store.query_roles("market", MEMORY_ROLES, 5).items()
+    }
+
+
+@pytest.mark.unit
+def test_reflections_run_concurrently_and_are_stored_in_one_write(memories, monkeypatch):
+    memories, embedded = memories
+    store = memories[0].store
+    writes = []
+    add = store._add
+    monkeypatch.setattr(
+        store, "_add", lambda *args: writes.append(args[0]) or add(*args)
+    )
+
+    reflector = Reflector(LessonModel(barrier=threading.Barrier(5)))
+    results = reflector.reflect_all(STATE, 0.05, memories)
+
+    assert results == list(LESSONS.values())
+    assert writes == [list(MEMORY_ROLES)]
+    # one embedding call for all five lessons (the backend dedupes the text)
+    assert len(embedded) == 1
+    assert set(embedded[0]) == {"market\n\nsentiment\n\nnews\n\nfundamentals"}
+    assert _stored(memories) == {role: [lesson] for role, lesson in LESSONS.items()}
+
+
+@pytest.mark.unit
+def test_async_reflection_skips_missing_memories(memories):
+    memories, _ = memories
+    memories[2] = None  # no trader memory
+
+    reflector = Reflector(LessonModel())
+    results = asyncio.run(reflector.areflect_all(STATE, 0.05, memories))
+
+    assert results == list(LESSONS.values())
+    expected = {role: [lesson] for role, lesson in LESSONS.items()}
+    expected["trader_memory"] = []
+    assert _stored(memories) == expected
@@ -0,0 +1,130 @@
+"""
+Tests for simultaneous risk debate rounds
+"""
+
+import asyncio
+import re
+import threading
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.agents import (
+    create_neutral_debator,
+    create_risky_debator,
+    create_safe_debator,
+)
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.setup import GraphSetup
+
+
+class DebateModel(BaseChatModel):
+    """Answers as the speaker named in the prompt, numbering its points."""
+
+    barrier: Optional[Any] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-debate"
+
+    def _answer(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = messages[-1].content
+        speaker = re.match(r"As the (\w+)", prompt).group(1)
+        point = prompt.count(f"{speaker} point") + 1
+        message = AIMessage(f"{speaker} point {point}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        if self.barrier is not None:
+            # only passes once all three debators are answering at the same time
+            self.barrier.wait(timeout=5)
+        return self._answer(messages)
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        await asyncio.sleep(0)
+        return self._answer(messages)
+
+
+def _risk_round(llm):
+    setup = GraphSetup(
+        llm, llm, None, {}, None, None, None, None, None, ConditionalLogic()
+    )
+    return setup._create_risk_round(
+        [create_risky_debator(llm), create_safe_debator(llm), create_neutral_debator(llm)]
+    )
+
+
+def _state():
+    return {
+        "market_report": "market",
+        "sentiment_report": "sentiment",
+        "news_report": "news",
+        "fundamentals_report": "fundamentals",
+        "trader_investment_plan": "BUY",
+        "risk_debate_state": {
+            "history": "",
+            "current_risky_response": "",
+            "current_safe_response": "",
+            "current_neutral_response": "",
+            "count": 0,
+        },
+    }
+
+
+@pytest.mark.unit
+def test_risk_round_runs_debators_at_once_and_merges_their_arguments():
+    risk_round = _risk_round(DebateModel(barrier=threading.Barrier(3)))
+
+    state = _state()
+    state.update(risk_round.invoke(state))
+    debate = state["risk_debate_state"]
+
+    assert debate["history"] == (
+        "\nRisky Analyst: Risky point 1"
+        "\nSafe Analyst: Safe point 1"
+        "\nNeutral Analyst: Neutral point 1"
+    )
+    assert debate["count"] == 3
+    assert debate["current_safe_response"] == "Safe Analyst: Safe point 1"
+    assert debate["neutral_history"] == "\nNeutral Analyst: Neutral point 1"
+
+    # the next round answers the whole previous round
+    state.update(risk_round.invoke(state))
+    debate = state["risk_debate_state"]
+    assert debate["count"] == 6
+    assert debate["risky_history"] == (
+        "\nRisky Analyst: Risky point 1\nRisky Analyst: Risky point 2"
+    )
+    assert debate["history"].endswith(
+        "\nRisky Analyst: Risky point 2"
+        "\nSafe Analyst: Safe point 2"
+        "\nNeutral Analyst: Neutral point 2"
+    )
+
+
+@pytest.mark.unit
+def test_async_risk_round_matches_sync():
+    risk_round = _risk_round(DebateModel())
+
+    assert asyncio.run(risk_round.ainvoke(_state())) == risk_round.invoke(_state())
+
+
+@pytest.mark.unit
+def test_risk_rounds_hand_over_to_judge_after_max_rounds():
+    logic = ConditionalLogic(max_risk_discuss_rounds=2)
+
+    def route(count):
+        return logic.should_continue_risk_round({"risk_debate_state": {"count": count}})
+
+    assert [route(count) for count in (0, 3, 6)] == [
+        "Risk Round",
+        "Risk Round",
+        "Risk Judge",
+    ]
@@ -0,0 +1,114 @@
+"""
+Tests for the context-local configuration of concurrent runs
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.prebuilt import ToolNode
+
+import tradingagents.dataflows.config as config
+from tradingagents.agents import Toolkit
+from tradingagents.dataflows.config import get_config, get_data_dir, use_config
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.graph.signal_processing import SignalProcessor
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+
+@pytest.mark.unit
+def test_threads_keep_their_own_config():
+    barrier = threading.Barrier(4)
+
+    def run(i):
+        with use_config({"data_dir": f"/data/{i}", "online_tools": i % 2 == 0}):
+            # every thread has entered its config before any of them reads it
+            barrier.wait(timeout=5)
+            return get_data_dir(), get_config()["online_tools"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(run, range(4)))
+
+    assert results == [(f"/data/{i}", i % 2 == 0) for i in range(4)]
+    assert get_data_dir() == config._config["data_dir"]
+
+
+@pytest.mark.unit
+def test_tasks_and_their_worker_threads_keep_their_own_config():
+    async def run(i):
+        with use_config({"data_dir": f"/data/{i}"}):
+            await asyncio.sleep(0)
+            return await asyncio.to_thread(get_data_dir)
+
+    async def run_all():
+        return await asyncio.gather(*(run(i) for i in range(4)))
+
+    assert asyncio.run(run_all()) == [f"/data/{i}" for i in range(4)]
+
+
+@pytest.mark.unit
+def test_run_config_is_layered_on_the_process_config(monkeypatch):
+    monkeypatch.setitem(config._config, "google_news_burst", 7)
+
+    with use_config({"data_dir": "/data/run"}) as run_config:
+        assert run_config["google_news_burst"] == 7
+        assert get_config()["data_dir"] == "/data/run"
+    assert get_config()["data_dir"] == config._config["data_dir"]
+
+
+@pytest.mark.unit
+def test_toolkits_do_not_share_their_config():
+    online = Toolkit(config={"online_tools": True})
+    offline = Toolkit(config={"online_tools": False})
+
+    assert online.config["online_tools"] is True
+    assert offline.config["online_tools"] is False
+
+
+class DataDirModel(BaseChatModel):
+    """Chat model that records the data_dir the dataflows would read."""
+
+    data_dirs: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-data-dir"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> ChatResult:
+        self.data_dirs.append(get_data_dir())
+        answer = "FINAL TRANSACTION PROPOSAL: **BUY**"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(answer))])
+
+
+@pytest.mark.unit
+def test_streaming_like_the_cli_applies_the_graph_config(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    graph_config = DEFAULT_CONFIG.copy()
+    graph_config.update(
+        disable_memory=True, project_dir=str(tmp_path), data_dir=str(tmp_path / "data")
+    )
+    ta = TradingAgentsGraph(["market"], config=graph_config)
+    llm = DataDirModel()
+    setup = GraphSetup(
+        llm, llm, Toolkit(), {"market": ToolNode([Toolkit.get_YFin_data])},
+        None, None, None, None, None, ta.conditional_logic,
+    )
+    ta.graph = setup.setup_graph(["market"])
+    ta.signal_processor = SignalProcessor(llm)
+
+    chunks = list(ta.stream("NVDA", "2024-05-10"))
+
+    assert chunks[-1]["final_trade_decision"]
+    assert llm.data_dirs and set(llm.data_dirs) == {graph_config["data_dir"]}
+    assert get_data_dir() == config._config["data_dir"]
@@ -0,0 +1,117 @@
+"""
+Tests for serving many analyses from one shared TradingAgentsGraph
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.prebuilt import ToolNode
+
+from tradingagents.agents import Toolkit
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.graph.signal_processing import SignalProcessor
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+TICKERS = ["NVDA", "AAPL", "MSFT", "AMZN", "TSLA", "META"]
+
+
+class TickerModel(BaseChatModel):
+    """Analysts report on the ticker of their conversation; others just decide."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-ticker"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tickers = [m.content for m in messages if m.content in TICKERS]
+        answer = f"{tickers[0]} report" if tickers else "FINAL TRANSACTION PROPOSAL: **BUY**"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(answer))])
+
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(TradingAgentsGraph, "_shared", {})
+    config = DEFAULT_CONFIG.copy()
+    config["disable_memory"] = True
+    config["project_dir"] = str(tmp_path)
+    return config
+
+
+def _shared_graph(config):
+    ta = TradingAgentsGraph.shared(ANALYSTS, config)
+    llm = TickerModel()
+    tool_nodes = {analyst: ToolNode([Toolkit.get_YFin_data]) for analyst in ANALYSTS}
+    setup = GraphSetup(
+        llm, llm, Toolkit(), tool_nodes, None, None, None, None, None,
+        ta.conditional_logic,
+    )
+    # in parallel branches every analyst still sees the ticker message
+    ta.graph = setup.setup_graph(
+        ANALYSTS, parallel_analysts=True, checkpointer=ta.checkpointer
+    )
+    ta.signal_processor = SignalProcessor(llm)
+    return ta
+
+
+@pytest.mark.unit
+def test_equal_configs_share_one_graph(config):
+    ta = TradingAgentsGraph.shared(ANALYSTS, config)
+
+    assert TradingAgentsGraph.shared(ANALYSTS, dict(config)) is ta
+    assert TradingAgentsGraph.shared(["market"], config) is not ta
+    assert TradingAgentsGraph.shared(ANALYSTS, dict(config, max_debate_rounds=2)) is not ta
+
+
+@pytest.mark.unit
+def test_concurrent_runs_keep_their_own_state(config):
+    ta = _shared_graph(config)
+
+    with ThreadPoolExecutor(max_workers=len(TICKERS)) as executor:
+        results = list(
+            executor.map(lambda ticker: ta.run(ticker, "2024-05-10"), TICKERS)
+        )
+
+    for ticker, (final_state, decision) in zip(TICKERS, results):
+        assert final_state["company_of_interest"] == ticker
+        assert final_state["market_report"] == f"{ticker} report"
+        assert decision == "BUY"
+        with open(
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_2024-05-10.json"
+        ) as f:
+            logged = json.load(f)
+        assert logged["2024-05-10"]["company_of_interest"] == ticker
+
+    # run leaves nothing on the shared instance
+    assert ta.curr_state is None and ta.log_states_dict == {}
+
+
+@pytest.mark.unit
+def test_async_runs_share_the_graph(config):
+    ta = _shared_graph(config)
+
+    async def run_all():
+        return await asyncio.gather(*(ta.arun(t, "2024-05-10") for t in TICKERS))
+
+    results = asyncio.run(run_all())
+    assert [state["sentiment_report"] for state, _ in results] == [
+        f"{ticker} report" for ticker in TICKERS
+    ]
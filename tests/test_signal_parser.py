@@ -0,0 +1,68 @@
+"""
+Tests for the deterministic BUY/SELL/HOLD parser of SignalProcessor
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from tradingagents.graph.signal_processing import SignalProcessor, parse_signal
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "signal_corpus.json")
+
+
+def _corpus():
+    with open(CORPUS_PATH) as f:
+        return json.load(f)
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return type("Response", (), {"content": "HOLD"})()
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+@pytest.mark.unit
+def test_parser_accuracy_on_corpus():
+    corpus = _corpus()
+    clear = [case for case in corpus if case["expected"] is not None]
+    parsed = [(case, parse_signal(case["text"])) for case in clear]
+
+    # never a wrong decision: the parser either answers correctly or defers
+    wrong = [
+        (case["text"][:60], decision)
+        for case, decision in parsed
+        if decision is not None and decision != case["expected"]
+    ]
+    assert wrong == []
+
+    correct = sum(decision == case["expected"] for case, decision in parsed)
+    assert correct / len(clear) >= 0.95
+
+
+@pytest.mark.unit
+def test_parser_defers_ambiguous_texts():
+    ambiguous = [case["text"] for case in _corpus() if case["expected"] is None]
+    assert ambiguous
+    assert [parse_signal(text) for text in ambiguous] == [None] * len(ambiguous)
+
+
+@pytest.mark.unit
+def test_llm_is_only_used_for_ambiguous_signals():
+    llm = RecordingLLM()
+    processor = SignalProcessor(llm)
+
+    assert processor.process_signal("FINAL TRANSACTION PROPOSAL: **SELL**") == "SELL"
+    assert asyncio.run(processor.aprocess_signal("Decision: **Buy**")) == "BUY"
+    assert llm.calls == []
+
+    assert processor.process_signal("Each side has merit.") == "HOLD"
+    assert len(llm.calls) == 1
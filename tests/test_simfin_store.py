@@ -0,0 +1,119 @@
+"""
+Tests for the point-in-time SimFin statement index
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tradingagents.dataflows.config as config
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.simfin_store import SimFinStore, statement_path
+
+
+@pytest.fixture
+def simfin_dir(tmp_path, monkeypatch):
+    rng = np.random.default_rng(5)
+    rows = []
+    for ticker in ("AAA", "BBB", "CCC"):
+        for quarter in range(12):
+            report = pd.Timestamp("2021-03-31") + pd.offsets.QuarterEnd(quarter)
+            publish = report + pd.Timedelta(days=int(rng.integers(20, 60)))
+            rows.append(
+                {
+                    "Ticker": ticker,
+                    "SimFinId": 100 + quarter,
+                    "Currency": "USD",
+                    "Fiscal Year": report.year,
+                    "Fiscal Period": f"Q{report.quarter}",
+                    "Report Date": report.strftime("%Y-%m-%d"),
+                    "Publish Date": publish.strftime("%Y-%m-%d"),
+                    "Revenue": float(rng.integers(1_000, 9_000)),
+                }
+            )
+    # a restatement published on the same day as the original filing
+    rows.append({**rows[5], "Revenue": -1.0})
+    frame = pd.DataFrame(rows).sample(frac=1, random_state=1)
+
+    for statement in ("balance_sheet", "cashflow", "income_statements"):
+        csv_path = statement_path(str(tmp_path), statement, "quarterly")
+        os.makedirs(os.path.dirname(csv_path))
+        frame.to_csv(csv_path, sep=";", index=False)
+
+    monkeypatch.setitem(config._config, "data_dir", str(tmp_path))
+    monkeypatch.setattr(
+        config,
+        "_config",
+        {**config.get_config(), "simfin_store_dir": str(tmp_path / "simfin_store")},
+    )
+    return tmp_path
+
+
+def _csv_as_of(csv_path, ticker, curr_date):
+    """Reference implementation: the full CSV scan the index replaces"""
+    df = pd.read_csv(csv_path, sep=";")
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    if filtered_df.empty:
+        return None
+    return filtered_df.loc[filtered_df["Publish Date"].idxmax()]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("ticker", ["AAA", "BBB", "ZZZ"])
+def test_as_of_matches_csv_scan(simfin_dir, ticker):
+    csv_path = statement_path(str(simfin_dir), "income_statements", "quarterly")
+    store = SimFinStore()
+    for curr_date in pd.date_range("2021-01-01", "2024-06-30", freq="9D"):
+        curr_date = curr_date.strftime("%Y-%m-%d")
+        expected = _csv_as_of(csv_path, ticker, curr_date)
+        actual = store.as_of(csv_path, ticker, curr_date)
+        if expected is None:
+            assert actual is None
+        else:
+            pd.testing.assert_series_equal(actual, expected)
+
+
+@pytest.mark.unit
+def test_interface_output_unchanged(simfin_dir):
+    csv_path = statement_path(str(simfin_dir), "balance_sheet", "quarterly")
+    latest = _csv_as_of(csv_path, "CCC", "2023-08-15").drop("SimFinId")
+
+    output = interface.get_simfin_balance_sheet("CCC", "quarterly", "2023-08-15")
+
+    assert output.startswith(
+        f"## quarterly balance sheet for CCC released on {str(latest['Publish Date'])[0:10]}: \n"
+        + str(latest)
+    )
+    assert interface.get_simfin_cashflow("CCC", "quarterly", "2000-01-01") == ""
+
+
+@pytest.mark.unit
+def test_index_rebuilt_when_csv_changes(simfin_dir):
+    csv_path = statement_path(str(simfin_dir), "cashflow", "quarterly")
+    store = SimFinStore()
+    assert store.as_of(csv_path, "DDD", "2030-01-01") is None
+
+    data = pd.read_csv(csv_path, sep=";")
+    extra = data.iloc[[0]].assign(Ticker="DDD", **{"Publish Date": "2022-02-02"})
+    pd.concat([data, extra]).to_csv(csv_path, sep=";", index=False)
+
+    latest = store.as_of(csv_path, "DDD", "2030-01-01")
+    assert str(latest["Publish Date"])[:10] == "2022-02-02"
+
+
+@pytest.mark.unit
+def test_partition_follows_a_version_published_elsewhere(simfin_dir):
+    csv_path = statement_path(str(simfin_dir), "cashflow", "quarterly")
+    store = SimFinStore()
+    assert store.partition(csv_path, "AAA") is not None
+
+    # another process rebuilds the entry and removes the indexed version
+    store.build(csv_path)
+
+    days, frame = store.partition(csv_path, "BBB")
+    assert set(frame["Ticker"]) == {"BBB"}
@@ -0,0 +1,100 @@
+"""
+Tests for the single-flight cache behind the date-only news tools
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tradingagents.dataflows.utils import SingleFlight, single_flight
+
+
+@pytest.mark.unit
+def test_concurrent_callers_share_one_fetch():
+    calls = []
+
+    @single_flight()
+    def fetch(curr_date):
+        calls.append(curr_date)
+        time.sleep(0.2)
+        return f"news for {curr_date}"
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(fetch, ["2024-05-07"] * 16 + ["2024-05-08"] * 4))
+
+    assert results == ["news for 2024-05-07"] * 16 + ["news for 2024-05-08"] * 4
+    assert sorted(calls) == ["2024-05-07", "2024-05-08"]
+
+    fetch("2024-05-07")
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_failures_reach_waiters_and_are_not_cached():
+    flight = SingleFlight()
+    started = threading.Event()
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("search failed")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("2024-05-07", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    leader.join()
+    waiter.join()
+
+    assert len(errors) == 2 and len(attempts) == 1
+    assert flight.do("2024-05-07", lambda: "ok") == "ok"
+
+
+@pytest.mark.unit
+def test_cache_is_bounded():
+    flight = SingleFlight(maxsize=2)
+    for day in ("a", "b", "c"):
+        flight.do(day, lambda: day)
+    assert flight.do("a", lambda: "recomputed") == "recomputed"
+    assert flight.do("c", lambda: "recomputed") == "c"
+
+
+@pytest.mark.unit
+def test_results_expire_and_rejected_results_are_not_cached(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    flight = SingleFlight(ttl=60, cache_if=lambda result: bool(result))
+
+    assert flight.do("2024-05-07", lambda: "") == ""
+    assert flight.do("2024-05-07", lambda: "news") == "news"
+    assert flight.do("2024-05-07", lambda: "newer") == "news"
+
+    now[0] += 61
+    assert flight.do("2024-05-07", lambda: "newer") == "newer"
+
+
+@pytest.mark.unit
+def test_global_news_errors_are_retried(monkeypatch):
+    from tradingagents.dataflows import interface
+
+    answers = ["Error: web search unavailable", "## Global news"]
+    monkeypatch.setattr(interface, "_web_search", lambda text: answers.pop(0))
+    interface.get_global_news_openai.cache.clear()
+
+    assert interface.get_global_news_openai("2024-05-07").startswith("Error")
+    assert interface.get_global_news_openai("2024-05-07") == "## Global news"
+    assert interface.get_global_news_openai("2024-05-07") == "## Global news"
+    interface.get_global_news_openai.cache.clear()
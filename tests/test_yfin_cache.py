@@ -0,0 +1,120 @@
+"""
+Tests for the incremental per-ticker Yahoo Finance cache
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tradingagents.dataflows.config as config
+from tradingagents.dataflows.price_store import PriceStore
+from tradingagents.dataflows.yfin_cache import YFinHistoryCache
+
+
+class FakeYahoo:
+    """Serves bars from a fixed history and records every request"""
+
+    def __init__(self):
+        dates = pd.bdate_range("2024-01-01", "2024-12-31")
+        close = np.linspace(100, 200, len(dates))
+        self.history = pd.DataFrame(
+            {
+                "Date": dates.strftime("%Y-%m-%d"),
+                "Open": close,
+                "High": close + 1,
+                "Low": close - 1,
+                "Close": close,
+                "Volume": np.arange(len(dates)) + 1000,
+            }
+        )
+        self.requests = []
+
+    def download(self, symbol, start_date, end_date):
+        self.requests.append((start_date, end_date))
+        rows = self.history[
+            (self.history["Date"] >= start_date) & (self.history["Date"] < end_date)
+        ]
+        return rows.reset_index(drop=True).copy()
+
+
+@pytest.fixture
+def yahoo(tmp_path, monkeypatch):
+    fake = FakeYahoo()
+    monkeypatch.setattr(
+        config,
+        "_config",
+        {
+            **config.get_config(),
+            "data_cache_dir": str(tmp_path / "cache"),
+            "price_store_dir": str(tmp_path / "cache" / "price_store"),
+        },
+    )
+    monkeypatch.setattr(YFinHistoryCache, "_download", staticmethod(fake.download))
+    return fake
+
+
+def _set_today(monkeypatch, today):
+    monkeypatch.setattr(YFinHistoryCache, "_today", staticmethod(lambda: today))
+
+
+@pytest.mark.unit
+def test_only_missing_tail_is_downloaded(yahoo, monkeypatch):
+    cache = YFinHistoryCache()
+
+    _set_today(monkeypatch, "2024-06-03")
+    data_file, data = cache.update("TEST")
+    assert data["Date"].iloc[-1] == "2024-05-31"
+    assert len(yahoo.requests) == 1
+
+    # same day: served from the cache without asking Yahoo
+    assert cache.update("TEST") == (data_file, None)
+    assert len(yahoo.requests) == 1
+
+    _set_today(monkeypatch, "2024-06-08")
+    _, data = cache.update("TEST")
+    assert yahoo.requests[-1] == ("2024-05-31", "2024-06-08")
+    assert data["Date"].iloc[-1] == "2024-06-07"
+
+    expected = yahoo.history[yahoo.history["Date"] < "2024-06-08"]
+    cached = pd.read_csv(data_file)
+    assert cached["Date"].tolist() == expected["Date"].tolist()
+    assert not any(name.startswith("TEST-YFin-data.csv.tmp") for name in os.listdir(cache.cache_dir))
+
+
+@pytest.mark.unit
+def test_readjusted_history_is_rebuilt(yahoo, monkeypatch):
+    cache = YFinHistoryCache()
+    _set_today(monkeypatch, "2024-06-03")
+    cache.update("TEST")
+
+    # a split/dividend re-adjusts every past close
+    yahoo.history["Close"] = yahoo.history["Close"] / 2
+    _set_today(monkeypatch, "2024-06-05")
+    _, data = cache.update("TEST")
+
+    assert yahoo.requests[-1][1] == "2024-06-05"
+    assert yahoo.requests[-1][0] < "2024-01-01"
+    assert data["Close"].iloc[0] == pytest.approx(50.0)
+
+
+@pytest.mark.unit
+def test_least_recently_used_tickers_are_evicted(yahoo, monkeypatch):
+    _set_today(monkeypatch, "2024-06-03")
+    cache = YFinHistoryCache()
+    store = PriceStore()
+    old_file, _ = cache.update("OLD")
+    store.load(old_file)
+    old_entry = store.entry_dir(old_file)
+    os.utime(old_file, (0, 0))
+    os.utime(cache.paths("OLD")[1], (0, 0))
+
+    # the CSVs alone fit, their price store entries do not
+    cache.max_bytes = 2 * os.path.getsize(old_file) + 500
+    new_file, _ = cache.update("NEW")
+
+    assert os.path.exists(new_file)
+    assert not os.path.exists(old_file)
+    assert not os.path.exists(cache.paths("OLD")[1])
+    assert not os.path.exists(old_entry)
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_llm_node
 
 
 def create_market_analyst(llm, toolkit):
@@ -74,7 +75,7 @@ Volume-Based Indicators:
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -86,4 +87,4 @@ Volume-Based Indicators:
             "market_report": report,
         }
 
-    return market_analyst_node
+    return create_llm_node(market_analyst_node)
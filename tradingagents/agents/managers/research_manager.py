@@ -1,5 +1,9 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import (
+    build_debate_messages,
+    create_llm_node,
+)
 
 
 def create_research_manager(llm, memory):
@@ -36,7 +40,7 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
-        response = llm.invoke(prompt)
+        response = yield llm, build_debate_messages(llm, state, prompt)
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -52,4 +56,4 @@ Debate History:
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    return create_llm_node(research_manager_node)
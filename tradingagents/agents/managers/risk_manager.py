@@ -1,5 +1,9 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import (
+    build_debate_messages,
+    create_llm_node,
+)
 
 
 def create_risk_manager(llm, memory):
@@ -11,7 +15,7 @@ def create_risk_manager(llm, memory):
         risk_debate_state = state["risk_debate_state"]
         market_research_report = state["market_report"]
         news_report = state["news_report"]
-        fundamentals_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
         sentiment_report = state["sentiment_report"]
         trader_plan = state["investment_plan"]
 
@@ -33,6 +37,7 @@ Guidelines for Decision-Making:
 Deliverables:
 - A clear and actionable recommendation: Buy, Sell, or Hold.
 - Detailed reasoning anchored in the debate and past reflections.
+- End with the line FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**, naming your one decision.
 
 ---
 
@@ -43,7 +48,7 @@ Deliverables:
 
 Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes."""
 
-        response = llm.invoke(prompt)
+        response = yield llm, build_debate_messages(llm, state, prompt)
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -63,4 +68,4 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    return create_llm_node(risk_manager_node)
@@ -1,8 +1,11 @@
-from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage, AIMessage
+import asyncio
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage, AIMessage, SystemMessage
 from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.rate_limit import ainvoke_with_retry, invoke_with_retry
 from langchain_core.tools import tool
 from datetime import date, timedelta, datetime
 import functools
@@ -31,12 +34,92 @@ def create_msg_delete():
     return delete_messages
 
 
+def create_llm_node(step, name=None):
+    """
+    Turn an agent step into a graph node that supports both invoke and ainvoke.
+
+    step(state) is a generator: it builds its prompt, yields (runnable, input)
+    once, receives the model response back from the yield, and returns the
+    state update. The sync node calls runnable.invoke; the async node awaits
+    runnable.ainvoke, so many analyses can wait on the LLM in one event loop;
+    both retry on 429s (see invoke_with_retry).
+    The prompt is built in a worker thread there, since building it may look
+    up memories through the embedding API.
+    """
+
+    def node(state):
+        steps = step(state)
+        runnable, llm_input = next(steps)
+        try:
+            steps.send(invoke_with_retry(runnable, llm_input))
+        except StopIteration as done:
+            return done.value
+        raise RuntimeError("An agent step must make exactly one LLM call")
+
+    async def anode(state):
+        steps = step(state)
+        runnable, llm_input = await asyncio.to_thread(next, steps)
+        try:
+            steps.send(await ainvoke_with_retry(runnable, llm_input))
+        except StopIteration as done:
+            return done.value
+        raise RuntimeError("An agent step must make exactly one LLM call")
+
+    return RunnableLambda(node, afunc=anode, name=name or step.__name__)
+
+
+TEAM_PROMPT = """You are a member of a trading firm's team of researchers, traders and risk analysts deciding whether to buy, sell or hold a stock. Every member of the team works from the same four analyst reports below. Your role, the discussion so far and your task follow after them."""
+
+ANALYST_REPORT_SECTIONS = (
+    ("Market Research Report", "market_report"),
+    ("Social Media Sentiment Report", "sentiment_report"),
+    ("Latest World Affairs Report", "news_report"),
+    ("Company Fundamentals Report", "fundamentals_report"),
+)
+
+
+def build_debate_messages(llm, state, instructions):
+    """
+    Build the prompt of a researcher, manager, trader or risk analyst.
+
+    The system message holds the team prompt and the four analyst reports,
+    which are the same for every one of these agents and every debate turn,
+    so providers that cache prompt prefixes (OpenAI, DeepSeek) reuse it
+    across calls. For Anthropic models the prefix is marked with a
+    cache_control breakpoint. instructions carries everything that changes
+    between agents and turns (role, debate history, memories) and comes last.
+    """
+    reports = "\n\n".join(
+        f"{title}:\n{state[key]}" for title, key in ANALYST_REPORT_SECTIONS
+    )
+    prefix = f"{TEAM_PROMPT}\n\n{reports}"
+    if getattr(llm, "_llm_type", None) == "anthropic-chat":
+        prefix = [
+            {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}
+        ]
+    return [SystemMessage(content=prefix), HumanMessage(content=instructions)]
+
+
+def with_coroutine(coroutine):
+    """
+    Give a @tool an async implementation. ToolNode awaits it when the graph
+    runs with ainvoke instead of running the sync function in a thread.
+    coroutine takes the same arguments as the tool.
+    """
+
+    def decorate(tool_obj):
+        tool_obj.coroutine = coroutine
+        return tool_obj
+
+    return decorate
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
     @classmethod
     def update_config(cls, config):
-        """Update the class-level configuration."""
+        """Update the class-level configuration used by toolkits without their own."""
         cls._config.update(config)
 
     @property
@@ -46,7 +129,9 @@ class Toolkit:
 
     def __init__(self, config=None):
         if config:
-            self.update_config(config)
+            # each toolkit keeps its own copy, so graphs with different configs
+            # can run in one process; the tools read it through use_config
+            self._config = {**Toolkit._config, **config}
 
     @staticmethod
     @tool
@@ -362,6 +447,7 @@ class Toolkit:
         return google_news_results
 
     @staticmethod
+    @with_coroutine(interface.aget_stock_news_openai)
     @tool
     def get_stock_news_openai(
         ticker: Annotated[str, "the company's ticker"],
@@ -381,6 +467,7 @@ class Toolkit:
         return openai_news_results
 
     @staticmethod
+    @with_coroutine(interface.aget_global_news_openai)
     @tool
     def get_global_news_openai(
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -398,6 +485,7 @@ class Toolkit:
         return openai_news_results
 
     @staticmethod
+    @with_coroutine(interface.aget_fundamentals_openai)
     @tool
     def get_fundamentals_openai(
         ticker: Annotated[str, "the company's ticker"],
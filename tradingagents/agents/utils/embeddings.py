@@ -0,0 +1,195 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from openai import OpenAI
+
+LOCAL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# OpenAI accepts up to 2048 inputs per embeddings request
+OPENAI_BATCH_SIZE = 2048
+
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by (provider, model, sha256(text)): an in-memory LRU of
+    maxsize vectors, optionally backed by one .npy file per vector under
+    cache_dir so embeddings also survive across runs.
+    """
+
+    def __init__(self, maxsize: int = 4096, cache_dir: Optional[str] = None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._vectors: "OrderedDict[Tuple[str, str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(provider: str, model: str, text: str) -> Tuple[str, str, str]:
+        return provider, model, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key: Tuple[str, str, str]) -> str:
+        provider, model, digest = key
+        folder = re.sub(r"[^A-Za-z0-9._-]", "_", f"{provider}-{model}")
+        return os.path.join(self.cache_dir, folder, f"{digest}.npy")
+
+    def _remember(self, key, vector) -> None:
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+        while len(self._vectors) > self.maxsize:
+            self._vectors.popitem(last=False)
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        if self.cache_dir:
+            try:
+                vector = np.load(self._path(key)).tolist()
+            except (OSError, ValueError):
+                vector = None
+
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._remember(key, vector)
+        return vector
+
+    def put(self, key: Tuple[str, str, str], vector: List[float]) -> None:
+        with self._lock:
+            self._remember(key, vector)
+
+        if self.cache_dir:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.asarray(vector))
+            os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+            self.hits = self.misses = 0
+
+
+class EmbeddingBackend:
+    """
+    Shared embedding backend. One instance exists per (provider, model) in
+    the process; the OpenAI client or the SentenceTransformer model is
+    created lazily on first use and reused afterwards, and texts are always
+    embedded in batches. All backends share one EmbeddingCache, so a text
+    is embedded once no matter how many memories look it up.
+    """
+
+    _instances: Dict[Tuple[str, str], "EmbeddingBackend"] = {}
+    _instances_lock = threading.Lock()
+    cache = EmbeddingCache()
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self._client = None
+        self._init_lock = threading.Lock()
+        # torch models are not guaranteed to be safe for concurrent encode calls
+        self._encode_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, openai_model: str) -> "EmbeddingBackend":
+        """
+        Backend for the current environment: OpenAI embeddings with
+        openai_model when OPENAI_API_KEY is set, the local
+        SentenceTransformer otherwise.
+        """
+        if os.environ.get("OPENAI_API_KEY"):
+            key = ("openai", openai_model)
+        else:
+            key = ("sentence-transformers", LOCAL_EMBEDDING_MODEL)
+
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(*key)
+            return cls._instances[key]
+
+    @classmethod
+    def configure_cache(
+        cls, maxsize: int = 4096, cache_dir: Optional[str] = None
+    ) -> EmbeddingCache:
+        """Resize the shared cache or attach an on-disk tier to it."""
+        with cls._instances_lock:
+            if cls.cache.maxsize != maxsize or cls.cache.cache_dir != cache_dir:
+                cache = EmbeddingCache(maxsize, cache_dir)
+                # keep the vectors already computed in this process
+                for key, vector in list(cls.cache._vectors.items())[-maxsize:]:
+                    cache._remember(key, vector)
+                cls.cache = cache
+            return cls.cache
+
+    def _get_client(self):
+        if self._client is None:
+            with self._init_lock:
+                if self._client is None:
+                    if self.provider == "openai":
+                        self._client = OpenAI()
+                    else:
+                        from sentence_transformers import SentenceTransformer
+
+                        self._client = SentenceTransformer(self.model)
+        return self._client
+
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        client = self._get_client()
+        if self.provider == "openai":
+            embeddings = []
+            for start in range(0, len(texts), OPENAI_BATCH_SIZE):
+                response = client.embeddings.create(
+                    model=self.model, input=texts[start : start + OPENAI_BATCH_SIZE]
+                )
+                embeddings.extend(item.embedding for item in response.data)
+            return embeddings
+
+        with self._encode_lock:
+            vectors = client.encode(texts, convert_to_numpy=True)
+        return [vector.tolist() for vector in vectors]
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed several texts. Cached texts are served from the shared cache;
+        the rest are embedded together in as few requests as possible.
+        """
+        texts = list(texts)
+        cache = self.cache
+        keys = [cache.key(self.provider, self.model, text) for text in texts]
+        embeddings = [cache.get(key) for key in keys]
+
+        # each distinct uncached text is embedded once
+        missing = {}
+        for text, key, embedding in zip(texts, keys, embeddings):
+            if embedding is None:
+                missing.setdefault(key, text)
+
+        if missing:
+            computed = dict(
+                zip(missing, self._embed_uncached(list(missing.values())))
+            )
+            for key, vector in computed.items():
+                cache.put(key, vector)
+            embeddings = [
+                computed[key] if embedding is None else embedding
+                for key, embedding in zip(keys, embeddings)
+            ]
+
+        return embeddings
+
+    def embed_one(self, text: str) -> List[float]:
+        return self.embed([text])[0]
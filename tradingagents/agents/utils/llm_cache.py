@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk
+
+# message fields that differ between runs without changing what the model sees
+VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+# the only classes revived from the cache file
+CACHED_CLASSES = [ChatGeneration, ChatGenerationChunk, AIMessage, AIMessageChunk]
+# generation_info flag set on responses served from the cache
+CACHE_HIT = "cache_hit"
+
+
+def is_cache_hit(response) -> bool:
+    """Whether an LLMResult was served from an LLMResponseCache."""
+    return any(
+        (generation.generation_info or {}).get(CACHE_HIT)
+        for generations in response.generations
+        for generation in generations
+    )
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Exact-match cache of chat model responses in a SQLite file, meant for
+    rerunning the same ticker and date. Pass it as cache= to a chat model.
+
+    LangChain looks responses up by the serialized messages and an llm_string
+    describing the model, its temperature and the bound tools; the namespace
+    (the provider and backend URL) is folded into the key as well. Message
+    ids and response metadata are dropped before hashing, so a replayed run
+    hits on every call. The least recently used responses are evicted once the stored
+    responses exceed max_bytes; the size is read from the file on every write,
+    so graphs and processes sharing one cache file enforce the same cap.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, namespace: str = ""):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used ON responses (used)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["LLMResponseCache"]:
+        """The cache configured by llm_cache_path, or None when it is disabled."""
+        path = config.get("llm_cache_path")
+        if not path:
+            return None
+        return cls(
+            path,
+            max_bytes=int(config.get("llm_cache_max_mb", 256) * 1024 * 1024),
+            namespace=f"{config['llm_provider'].lower()}|{config.get('backend_url', '')}",
+        )
+
+    @staticmethod
+    def _canonical_prompt(prompt: str) -> str:
+        try:
+            messages = json.loads(prompt)
+        except ValueError:
+            return prompt
+        if isinstance(messages, list):
+            for message in messages:
+                fields = message.get("kwargs") if isinstance(message, dict) else None
+                if isinstance(fields, dict):
+                    for name in VOLATILE_MESSAGE_FIELDS:
+                        fields.pop(name, None)
+        return json.dumps(messages, sort_keys=True)
+
+    def key(self, prompt: str, llm_string: str) -> str:
+        payload = "\0".join((self.namespace, llm_string, self._canonical_prompt(prompt)))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        key = self.key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        generations = loads(row[0], allowed_objects=CACHED_CLASSES)
+        for generation in generations:
+            generation.generation_info = {
+                **(generation.generation_info or {}),
+                CACHE_HIT: True,
+            }
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        key = self.key(prompt, llm_string)
+        value = dumps(list(return_val))
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            # the insert opens the write transaction, so the total read next
+            # includes every other writer's committed responses
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _evict(self) -> None:
+        total = self._total_bytes()
+        while total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            total -= row[1]
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": self._total_bytes(),
+            }
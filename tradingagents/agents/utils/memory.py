@@ -1,96 +1,487 @@
+import hashlib
+import json
 import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from openai import OpenAI
-from sentence_transformers import SentenceTransformer
 
-class FinancialSituationMemory:
-    def __init__(self, name, config):
-        if config["backend_url"] == "http://localhost:11434/v1":
-            self.embedding = "nomic-embed-text"
-        else:
-            self.embedding = "text-embedding-3-small"
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        
-        # Add unique suffix to collection name if provided in config
-        unique_name = name
-        if "memory_suffix" in config:
-            unique_name = f"{name}{config['memory_suffix']}"
-        
-        # Try to get existing collection first, create if doesn't exist
-        try:
-            self.situation_collection = self.chroma_client.get_collection(name=unique_name)
-        except:
-            try:
-                self.situation_collection = self.chroma_client.create_collection(name=unique_name)
-            except:
-                # If creation fails, try to get again (race condition handling)
-                self.situation_collection = self.chroma_client.get_collection(name=unique_name)
+from .embeddings import EmbeddingBackend
 
-    def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
-        if os.environ.get("OPENAI_API_KEY"):
-            client = OpenAI()
-            response = client.embeddings.create(
-                model=self.embedding, input=text
+# roles of the memories created by TradingAgentsGraph
+MEMORY_ROLES = (
+    "bull_memory",
+    "bear_memory",
+    "trader_memory",
+    "invest_judge_memory",
+    "risk_manager_memory",
+)
+
+
+def embedding_model(config) -> str:
+    if config["backend_url"] == "http://localhost:11434/v1":
+        return "nomic-embed-text"
+    return "text-embedding-3-small"
+
+
+class MemoryStore(ABC):
+    """
+    One store holding the memories of every role, each entry tagged with
+    its role. There is a single store per (backend, memory_dir, collection,
+    embedding model, backend_url) in the process, so all graphs and workers
+    with the same settings read and write the same learned memories. The
+    collection is named after the embedding model and backend_url too, so
+    vectors of different models never share an index, in memory or on disk. With memory_dir set the store is persisted on disk;
+    otherwise it lives for the process.
+
+    query_roles retrieves the top matches of several roles with one vector
+    search. Its results are kept until the next write, so the agents of one
+    propagate that look up the same situation share a single search.
+
+    The memory_backend config key selects the implementation: "chroma"
+    (ChromaMemoryStore) or "numpy" (FlatMemoryStore).
+    """
+
+    _stores: Dict[Tuple[str, Optional[str], str, str, Optional[str]], "MemoryStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, collection_name: str, embedding: str, memory_dir: Optional[str] = None):
+        self.collection_name = collection_name
+        self.embedding = embedding
+        self.memory_dir = memory_dir
+
+        self._lock = threading.Lock()
+        self._version = 0
+        self._queries: "OrderedDict[Tuple, Dict[str, List[Dict]]]" = OrderedDict()
+
+    @classmethod
+    def get(cls, config) -> "MemoryStore":
+        """Shared store for the memory settings of config."""
+        backend = config.get("memory_backend", "chroma")
+        memory_dir = config.get("memory_dir")
+        collection_name = config.get("memory_collection", "financial_situations")
+        EmbeddingBackend.configure_cache(
+            config.get("embedding_cache_size", 4096),
+            config.get("embedding_cache_dir"),
+        )
+
+        if backend not in MEMORY_BACKENDS:
+            raise ValueError(
+                f"Unsupported memory backend: {backend}. "
+                f"Please choose from: {list(MEMORY_BACKENDS)}"
             )
-            return response.data[0].embedding
-        else:
-            model = SentenceTransformer("all-MiniLM-L6-v2")
-            embeddings = model.encode(text, convert_to_numpy=True)
-            return embeddings
 
+        embedding = embedding_model(config)
+        backend_url = config.get("backend_url")
+        key = (backend, memory_dir, collection_name, embedding, backend_url)
+        with cls._stores_lock:
+            if key not in cls._stores:
+                digest = hashlib.sha256(
+                    f"{embedding}\n{backend_url}".encode("utf-8")
+                ).hexdigest()
+                cls._stores[key] = MEMORY_BACKENDS[backend](
+                    f"{collection_name}-{digest[:10]}", embedding, memory_dir
+                )
+            return cls._stores[key]
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    def get_embeddings(self, texts):
+        """Embed several texts in one batched call"""
+        return EmbeddingBackend.get(self.embedding).embed(texts)
+
+    def add(self, role: str, situations_and_advice: Sequence[Tuple[str, str]]):
+        """Add (situation, recommendation) pairs to the memories of role"""
+        self.add_entries([(role, situation, rec) for situation, rec in situations_and_advice])
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+    def add_entries(self, entries: Sequence[Tuple[str, str, str]]):
+        """
+        Add (role, situation, recommendation) entries of any roles in one
+        batched write, embedding their situations in one call.
+        """
+        if not entries:
+            return
 
-        offset = self.situation_collection.count()
+        roles, situations, recommendations = (list(column) for column in zip(*entries))
+        embeddings = self.get_embeddings(situations)
+        with self._lock:
+            self._add(roles, situations, recommendations, embeddings)
+            self._version += 1
+            self._queries.clear()
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+    def query_roles(
+        self,
+        current_situation: str,
+        roles: Sequence[str] = MEMORY_ROLES,
+        n_matches: int = 1,
+    ) -> Dict[str, List[Dict]]:
+        """Top n_matches memories of each role for a situation"""
+        roles = tuple(roles)
+        digest = hashlib.sha256(current_situation.encode("utf-8")).hexdigest()
+        with self._lock:
+            cache_key = (digest, roles, n_matches, self._version)
+            if cache_key in self._queries:
+                return self._queries[cache_key]
 
-        self.situation_collection.add(
+        if self.count() == 0 or n_matches <= 0:
+            return {role: [] for role in roles}
+
+        query_embedding = self.get_embeddings([current_situation])[0]
+        matches = self._search_roles(query_embedding, roles, n_matches)
+
+        with self._lock:
+            if cache_key[-1] == self._version:
+                self._queries[cache_key] = matches
+                while len(self._queries) > 64:
+                    self._queries.popitem(last=False)
+        return matches
+
+    def clear(self):
+        """Delete every memory in the store"""
+        with self._lock:
+            self._clear()
+            self._version += 1
+            self._queries.clear()
+
+    @abstractmethod
+    def count(self, role: Optional[str] = None) -> int:
+        """Number of memories, of one role or of all"""
+
+    @abstractmethod
+    def _add(self, roles, situations, recommendations, embeddings):
+        """Store the memories; called with the store lock held"""
+
+    @abstractmethod
+    def _search_roles(self, query_embedding, roles, n_matches) -> Dict[str, List[Dict]]:
+        """Top n_matches memories of each role for a query embedding"""
+
+    @abstractmethod
+    def _clear(self):
+        """Delete every memory; called with the store lock held"""
+
+
+class ChromaMemoryStore(MemoryStore):
+    """MemoryStore in one Chroma collection, with the role as metadata."""
+
+    def __init__(self, collection_name: str, embedding: str, memory_dir: Optional[str] = None):
+        super().__init__(collection_name, embedding, memory_dir)
+        if memory_dir:
+            self.chroma_client = chromadb.PersistentClient(
+                path=memory_dir, settings=Settings(allow_reset=True)
+            )
+        else:
+            self.chroma_client = chromadb.Client(Settings(allow_reset=True))
+        self.collection = self.chroma_client.get_or_create_collection(name=collection_name)
+
+    def count(self, role: Optional[str] = None) -> int:
+        if role is None:
+            return self.collection.count()
+        return len(self.collection.get(where={"role": role}, include=[])["ids"])
+
+    def _add(self, roles, situations, recommendations, embeddings):
+        self.collection.add(
             documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
+            metadatas=[
+                {"role": role, "recommendation": rec}
+                for role, rec in zip(roles, recommendations)
+            ],
             embeddings=embeddings,
-            ids=ids,
+            # unique across workers writing concurrently
+            ids=[uuid.uuid4().hex for _ in situations],
         )
 
-    def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
-        query_embedding = self.get_embedding(current_situation)
-
-        results = self.situation_collection.query(
+    def _search(self, query_embedding, roles: Sequence[str], n_results: int):
+        where = {"role": roles[0]} if len(roles) == 1 else {"role": {"$in": list(roles)}}
+        results = self.collection.query(
             query_embeddings=[query_embedding],
-            n_results=n_matches,
+            n_results=n_results,
+            where=where,
             include=["metadatas", "documents", "distances"],
         )
-
-        matched_results = []
-        for i in range(len(results["documents"][0])):
-            matched_results.append(
+        return [
+            (
+                metadata["role"],
                 {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
-                }
+                    "matched_situation": document,
+                    "recommendation": metadata["recommendation"],
+                    "similarity_score": 1 - distance,
+                },
             )
+            for document, metadata, distance in zip(
+                results["documents"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
+
+    def _search_roles(self, query_embedding, roles, n_matches):
+        matches = {role: [] for role in roles}
+        total = self.collection.count()
+
+        # one search over all roles, wide enough for each role to get its top-k
+        # unless the roles are very unbalanced
+        n_results = min(total, n_matches * len(roles) * 4)
+        for role, match in self._search(query_embedding, roles, n_results):
+            if len(matches[role]) < n_matches:
+                matches[role].append(match)
+
+        if n_results < total:
+            # a role crowded out of the shared search gets its own search
+            for role, role_matches in matches.items():
+                if len(role_matches) < n_matches:
+                    matches[role] = [
+                        match
+                        for _, match in self._search(
+                            query_embedding, (role,), min(n_matches, total)
+                        )
+                    ]
+        return matches
+
+    def _clear(self):
+        ids = self.collection.get(include=[])["ids"]
+        if ids:
+            self.collection.delete(ids=ids)
 
-        return matched_results
+
+class FlatMemoryStore(MemoryStore):
+    """
+    MemoryStore as a contiguous float32 matrix of L2-normalized vectors,
+    searched exactly with one matrix product and argpartition. Persistence
+    is append-only: vectors.f32 holds the raw rows (memory-mapped when
+    read back) and records.jsonl one line of role/situation/advice per row.
+    Scores are 1 - squared L2 distance, as reported by the Chroma store.
+    """
+
+    def __init__(self, collection_name: str, embedding: str, memory_dir: Optional[str] = None):
+        super().__init__(collection_name, embedding, memory_dir)
+        self.dim: Optional[int] = None
+        self._size = 0
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._role_ids = np.empty(0, dtype=np.int32)
+        self._role_index: Dict[str, int] = {}
+        self._documents: List[str] = []
+        self._recommendations: List[str] = []
+
+        self.path = None
+        if memory_dir:
+            self.path = os.path.join(memory_dir, f"{collection_name}.flat")
+            os.makedirs(self.path, exist_ok=True)
+            self._load()
+
+    def _files(self) -> Tuple[str, str, str]:
+        return (
+            os.path.join(self.path, "meta.json"),
+            os.path.join(self.path, "vectors.f32"),
+            os.path.join(self.path, "records.jsonl"),
+        )
+
+    def _load(self):
+        meta_path, vectors_path, records_path = self._files()
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path) as f:
+            self.dim = json.load(f)["dim"]
+
+        roles = []
+        if os.path.exists(records_path):
+            with open(records_path) as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # a write interrupted mid-line
+                    record = json.loads(line)
+                    roles.append(record["role"])
+                    self._documents.append(record["situation"])
+                    self._recommendations.append(record["recommendation"])
+
+        # vectors are written before their records: rows without a record are
+        # cut off so the next append lines up again
+        rows = 0
+        if os.path.exists(vectors_path):
+            rows = os.path.getsize(vectors_path) // (4 * self.dim)
+        self._size = min(rows, len(roles))
+        del roles[self._size :], self._documents[self._size :], self._recommendations[self._size :]
+        if os.path.exists(vectors_path):
+            os.truncate(vectors_path, 4 * self.dim * self._size)
+        if self._size > 0:
+            self._vectors = np.memmap(
+                vectors_path, dtype=np.float32, mode="r", shape=(self._size, self.dim)
+            )
+        self._role_ids = np.array(
+            [self._role_id(role) for role in roles], dtype=np.int32
+        )
+
+    def _role_id(self, role: str) -> int:
+        return self._role_index.setdefault(role, len(self._role_index))
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def count(self, role: Optional[str] = None) -> int:
+        if role is None:
+            return self._size
+        role_id = self._role_index.get(role)
+        if role_id is None:
+            return 0
+        return int(np.count_nonzero(self._role_ids[: self._size] == role_id))
+
+    def _add(self, roles, situations, recommendations, embeddings):
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match the memory store ({self.dim})"
+            )
+
+        role_ids = np.array([self._role_id(role) for role in roles], dtype=np.int32)
+        new_size = self._size + len(vectors)
+
+        if self.path:
+            meta_path, vectors_path, records_path = self._files()
+            if not os.path.exists(meta_path):
+                with open(meta_path, "w") as f:
+                    json.dump({"dim": self.dim, "embedding": self.embedding}, f)
+            with open(vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors).tobytes())
+            with open(records_path, "a") as f:
+                for role, situation, rec in zip(roles, situations, recommendations):
+                    f.write(
+                        json.dumps(
+                            {"role": role, "situation": situation, "recommendation": rec}
+                        )
+                        + "\n"
+                    )
+            self._vectors = np.memmap(
+                vectors_path, dtype=np.float32, mode="r", shape=(new_size, self.dim)
+            )
+            self._role_ids = np.concatenate([self._role_ids[: self._size], role_ids])
+        else:
+            if new_size > len(self._vectors) or self._vectors.shape[1] != self.dim:
+                # grow geometrically so appends stay amortized O(1)
+                capacity = max(new_size, 2 * len(self._vectors), 64)
+                grown = np.empty((capacity, self.dim), dtype=np.float32)
+                grown_ids = np.empty(capacity, dtype=np.int32)
+                if self._size:
+                    grown[: self._size] = self._vectors[: self._size]
+                    grown_ids[: self._size] = self._role_ids[: self._size]
+                self._vectors = grown
+                self._role_ids = grown_ids
+            self._vectors[self._size : new_size] = vectors
+            self._role_ids[self._size : new_size] = role_ids
+
+        self._documents.extend(situations)
+        self._recommendations.extend(recommendations)
+        self._size = new_size
+
+    def search(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        roles: Sequence[str],
+        n_matches: int,
+    ) -> List[Dict[str, List[Dict]]]:
+        """Top n_matches of each role for a batch of query embeddings."""
+        with self._lock:
+            size = self._size
+            vectors = self._vectors[:size]
+            role_ids = self._role_ids[:size]
+            documents = self._documents[:size]
+            recommendations = self._recommendations[:size]
+
+        queries = self._normalize(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        # cosine similarity of every stored vector with every query
+        scores = vectors @ queries.T
+
+        results = [{role: [] for role in roles} for _ in range(len(queries))]
+        for role in roles:
+            role_id = self._role_index.get(role)
+            if role_id is None:
+                continue
+            rows = np.flatnonzero(role_ids == role_id)
+            if len(rows) == 0:
+                continue
+            k = min(n_matches, len(rows))
+            role_scores = scores[rows]
+            top = np.argpartition(-role_scores, k - 1, axis=0)[:k]
+            for q in range(len(queries)):
+                best = top[np.argsort(-role_scores[top[:, q], q], kind="stable"), q]
+                results[q][role] = [
+                    {
+                        "matched_situation": documents[rows[i]],
+                        "recommendation": recommendations[rows[i]],
+                        # 1 - squared L2 distance between unit vectors
+                        "similarity_score": float(2 * role_scores[i, q] - 1),
+                    }
+                    for i in best
+                ]
+        return results
+
+    def _search_roles(self, query_embedding, roles, n_matches):
+        return self.search([query_embedding], roles, n_matches)[0]
+
+    def query_many(
+        self,
+        situations: Sequence[str],
+        roles: Sequence[str] = MEMORY_ROLES,
+        n_matches: int = 1,
+    ) -> List[Dict[str, List[Dict]]]:
+        """query_roles for several situations with one batched search"""
+        if not situations:
+            return []
+        return self.search(self.get_embeddings(list(situations)), tuple(roles), n_matches)
+
+    def _clear(self):
+        self.dim = None
+        self._size = 0
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._role_ids = np.empty(0, dtype=np.int32)
+        self._role_index = {}
+        self._documents = []
+        self._recommendations = []
+        if self.path:
+            for path in self._files():
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+MEMORY_BACKENDS = {
+    "chroma": ChromaMemoryStore,
+    "numpy": FlatMemoryStore,
+}
+
+
+class FinancialSituationMemory:
+    """The memories of one role (e.g. bull_memory) in the shared MemoryStore"""
+
+    def __init__(self, name, config):
+        self.role = name
+        self.store = MemoryStore.get(config)
+        self.embedding = self.store.embedding
+
+    def get_embedding(self, text):
+        """Get the embedding of a text from the shared embedding backend"""
+        return EmbeddingBackend.get(self.embedding).embed_one(text)
+
+    def get_embeddings(self, texts):
+        """Embed several texts in one batched call"""
+        return self.store.get_embeddings(texts)
+
+    def add_situations(self, situations_and_advice):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        self.store.add(self.role, list(situations_and_advice))
+
+    def get_memories(self, current_situation, n_matches=1):
+        """Find matching recommendations of this role"""
+        # query every role at once: the other agents look up the same situation
+        roles = MEMORY_ROLES if self.role in MEMORY_ROLES else (self.role,)
+        return self.store.query_roles(current_situation, roles, n_matches)[self.role]
 
 
 if __name__ == "__main__":
     # Example usage
-    matcher = FinancialSituationMemory()
+    matcher = FinancialSituationMemory("example_memory", {"backend_url": ""})
 
     # Example data
     example_data = [
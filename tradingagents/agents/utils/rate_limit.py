@@ -0,0 +1,342 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from .llm_cache import is_cache_hit
+
+# attempts of an LLM call that keeps getting 429s
+RATE_LIMIT_ATTEMPTS = 6
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether error is a provider's 429 / rate limit response."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return "ratelimit" in text or "rate limit" in text or "429" in text
+
+
+def _backoff(attempt: int) -> float:
+    return min(0.5 * 2**attempt, 8.0)
+
+
+def invoke_with_retry(runnable, llm_input: Any, attempts: int = RATE_LIMIT_ATTEMPTS) -> Any:
+    """
+    runnable.invoke(llm_input), retried on 429s.
+
+    When a rate limit is set the chat models are built with max_retries=0, so
+    429s surface here instead of being retried inside the provider SDK, where
+    neither the limiter nor the adaptive concurrency would see them. The
+    model's rate limiter then holds the retry back until its buckets refill.
+    """
+    for attempt in range(attempts):
+        try:
+            return runnable.invoke(llm_input)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_rate_limit_error(e):
+                raise
+            time.sleep(_backoff(attempt))
+
+
+async def ainvoke_with_retry(
+    runnable, llm_input: Any, attempts: int = RATE_LIMIT_ATTEMPTS
+) -> Any:
+    """Async version of invoke_with_retry."""
+    for attempt in range(attempts):
+        try:
+            return await runnable.ainvoke(llm_input)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_rate_limit_error(e):
+                raise
+            await asyncio.sleep(_backoff(attempt))
+
+
+class ProviderRateLimiter(BaseRateLimiter):
+    """
+    Rate limiter shared by every chat model of one (provider, model) in the
+    process. Pass it as rate_limiter= to the chat models, together with its
+    callback in callbacks=.
+
+    Two token buckets are refilled continuously: one for requests_per_minute
+    and one for tokens_per_minute, each holding up to burst_seconds of quota.
+    A request takes one request token and the running average of tokens per
+    call; once the response reports its actual usage the difference is
+    settled, so the token bucket may go negative and hold back later calls.
+    A 429 empties both buckets. Either limit may be None to leave it open.
+
+    Observers (see AdaptiveConcurrency) are told the latency of every call
+    and every 429.
+    """
+
+    _instances: Dict[Tuple[str, str], "ProviderRateLimiter"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        tokens_per_request: float = 2000,
+        burst_seconds: float = 10,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.tokens_per_request = tokens_per_request
+        self.burst_seconds = burst_seconds
+        self.requests = self._capacity(requests_per_minute)
+        self.tokens = self._capacity(tokens_per_minute)
+        self.updated = time.monotonic()
+        self.throttled = 0
+        self.observers: List[Any] = []
+        self.lock = threading.Lock()
+        self.callback = RateLimitCallback(self)
+
+    @classmethod
+    def get(
+        cls,
+        provider: str,
+        model: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> "ProviderRateLimiter":
+        """The process-wide limiter of (provider, model); limits given here replace earlier ones."""
+        key = (provider.lower(), model)
+        with cls._instances_lock:
+            limiter = cls._instances.get(key)
+            if limiter is None:
+                limiter = cls._instances[key] = cls()
+        if requests_per_minute is not None or tokens_per_minute is not None:
+            limiter.set_limits(requests_per_minute, tokens_per_minute)
+        return limiter
+
+    @classmethod
+    def for_config(cls, config: Dict[str, Any]) -> List["ProviderRateLimiter"]:
+        """Limiters of the quick and deep thinking models of config."""
+        limiters = []
+        for model in (config["quick_think_llm"], config["deep_think_llm"]):
+            limiter = cls.get(
+                config["llm_provider"],
+                model,
+                config.get("llm_requests_per_minute"),
+                config.get("llm_tokens_per_minute"),
+            )
+            if limiter not in limiters:
+                limiters.append(limiter)
+        return limiters
+
+    @property
+    def limited(self) -> bool:
+        return self.requests_per_minute is not None or self.tokens_per_minute is not None
+
+    def _capacity(self, per_minute: Optional[float]) -> float:
+        if per_minute is None:
+            return float("inf")
+        return max(1.0, per_minute / 60 * self.burst_seconds)
+
+    def set_limits(
+        self, requests_per_minute: Optional[float], tokens_per_minute: Optional[float]
+    ) -> None:
+        with self.lock:
+            self.requests_per_minute = requests_per_minute
+            self.tokens_per_minute = tokens_per_minute
+            self.requests = min(self.requests, self._capacity(requests_per_minute))
+            self.tokens = min(self.tokens, self._capacity(tokens_per_minute))
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.updated = now
+        if self.requests_per_minute is not None:
+            self.requests = min(
+                self._capacity(self.requests_per_minute),
+                self.requests + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute is not None:
+            self.tokens = min(
+                self._capacity(self.tokens_per_minute),
+                self.tokens + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _try_acquire(self) -> float:
+        """Take a request's share of both buckets; else the seconds to wait."""
+        with self.lock:
+            self._refill(time.monotonic())
+            # a request larger than the whole bucket still goes through once it is full
+            needed = min(self.tokens_per_request, self._capacity(self.tokens_per_minute))
+            if self.requests >= 1 and self.tokens >= needed:
+                self.requests -= 1
+                self.tokens -= self.tokens_per_request
+                return 0.0
+            wait = 0.0
+            if self.requests < 1:
+                wait = (1 - self.requests) * 60 / self.requests_per_minute
+            if self.tokens < needed:
+                wait = max(wait, (needed - self.tokens) * 60 / self.tokens_per_minute)
+            return wait
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        while True:
+            wait = self._try_acquire()
+            if wait == 0:
+                return True
+            if not blocking:
+                return False
+            time.sleep(wait)
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        while True:
+            wait = self._try_acquire()
+            if wait == 0:
+                return True
+            if not blocking:
+                return False
+            await asyncio.sleep(wait)
+
+    def record(self, latency: float, tokens: Optional[int] = None) -> None:
+        """Settle the tokens of a finished call and report its latency."""
+        if tokens:
+            with self.lock:
+                self.tokens -= tokens - self.tokens_per_request
+                self.tokens_per_request = 0.8 * self.tokens_per_request + 0.2 * tokens
+        for observer in list(self.observers):
+            observer.observe(latency=latency, source=self)
+
+    def record_throttled(self) -> None:
+        """A call got a 429: stop sending until the buckets refill."""
+        with self.lock:
+            self.throttled += 1
+            self.updated = time.monotonic()
+            if self.requests_per_minute is not None:
+                self.requests = min(self.requests, 0.0)
+            if self.tokens_per_minute is not None:
+                self.tokens = min(self.tokens, 0.0)
+        for observer in list(self.observers):
+            observer.observe(throttled=True, source=self)
+
+
+class RateLimitCallback(BaseCallbackHandler):
+    """Reports the latency, token usage and 429s of chat model calls to a limiter."""
+
+    run_inline = True
+
+    def __init__(self, limiter: ProviderRateLimiter):
+        self.limiter = limiter
+        self._started: Dict[Any, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs: Any) -> None:
+        self._started[run_id] = time.monotonic()
+
+    def on_llm_end(self, response, *, run_id, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        # cache hits never reached the provider
+        if started is None or is_cache_hit(response):
+            return
+        self.limiter.record(time.monotonic() - started, self._total_tokens(response))
+
+    def on_llm_error(self, error: BaseException, *, run_id, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        if is_rate_limit_error(error):
+            self.limiter.record_throttled()
+
+    @staticmethod
+    def _total_tokens(response) -> Optional[int]:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage.get("total_tokens"):
+            return usage["total_tokens"]
+        total = 0
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if metadata:
+                    total += metadata.get("total_tokens", 0)
+        return total or None
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on the number of analyses in flight.
+
+    The limit grows by one for every `limit` LLM calls that succeed (additive
+    increase) and is halved on a 429 (multiplicative decrease), at most once
+    per cooldown seconds. Latency alone never cuts it: calls of the same model
+    range from short tool routing to long reports, so a slow call is no sign
+    of throttling. It always stays within [minimum, maximum]. Subscribe it to the rate limiters with watch(), and
+    hold a slot per analysis with `with controller:` or `async with controller:`.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 32,
+        cooldown: float = 5.0,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def watch(self, limiters: List[ProviderRateLimiter]) -> None:
+        for limiter in limiters:
+            if self not in limiter.observers:
+                limiter.observers.append(self)
+
+    def unwatch(self, limiters: List[ProviderRateLimiter]) -> None:
+        for limiter in limiters:
+            if self in limiter.observers:
+                limiter.observers.remove(self)
+
+    def observe(
+        self, latency: Optional[float] = None, throttled: bool = False, source: Any = None
+    ) -> None:
+        with self._condition:
+            now = time.monotonic()
+            if throttled:
+                if now - self.last_decrease >= self.cooldown:
+                    self.last_decrease = now
+                    self.limit = max(float(self.minimum), self.limit / 2)
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+                self._condition.notify_all()
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._condition:
+            while not self._try_acquire():
+                self._condition.wait(timeout=1)
+
+    async def aacquire(self, poll_interval: float = 0.05) -> None:
+        while True:
+            with self._condition:
+                if self._try_acquire():
+                    return
+            await asyncio.sleep(poll_interval)
+
+    def release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    async def __aenter__(self):
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
@@ -1,8 +1,18 @@
-from .finnhub_utils import get_data_in_range
+from .finnhub_utils import FinnhubStore, get_data_in_range
 from .googlenews_utils import getNewsData
 from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import (
+    CompanyTagger,
+    RedditIndex,
+    fetch_top_from_category,
+    fetch_top_from_category_bulk,
+    fetch_top_from_category_range,
+)
 from .stockstats_utils import StockstatsUtils
+from .price_store import PriceStore, PriceSeries
+from .indicator_engine import IndicatorEngine, compute_indicators
+from .yfin_cache import YFinHistoryCache
+from .simfin_store import SimFinStore
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -13,6 +23,7 @@ from .interface import (
     get_google_news,
     get_reddit_global_news,
     get_reddit_company_news,
+    get_reddit_companies_news,
     # Financial statements functions
     get_simfin_balance_sheet,
     get_simfin_cashflow,
@@ -20,6 +31,7 @@ from .interface import (
     # Technical analysis functions
     get_stock_stats_indicators_window,
     get_stockstats_indicator,
+    get_stockstats_indicator_window,
     # Market data functions
     get_YFin_data_window,
     get_YFin_data,
@@ -33,6 +45,7 @@ __all__ = [
     "get_google_news",
     "get_reddit_global_news",
     "get_reddit_company_news",
+    "get_reddit_companies_news",
     # Financial statements functions
     "get_simfin_balance_sheet",
     "get_simfin_cashflow",
@@ -40,6 +53,7 @@ __all__ = [
     # Technical analysis functions
     "get_stock_stats_indicators_window",
     "get_stockstats_indicator",
+    "get_stockstats_indicator_window",
     # Market data functions
     "get_YFin_data_window",
     "get_YFin_data",
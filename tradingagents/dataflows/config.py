@@ -1,10 +1,19 @@
+import contextlib
+import contextvars
 import tradingagents.default_config as default_config
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
 # Use default config but allow it to be overridden
 _config: Optional[Dict] = None
 DATA_DIR: Optional[str] = None
 
+# Config of the analysis running in the current context (thread or task), set
+# by use_config. It takes precedence over the process-wide config, so runs with
+# different configs can share one process.
+_run_config: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar(
+    "tradingagents_run_config", default=None
+)
+
 
 def initialize_config():
     """Initialize the configuration with default values."""
@@ -15,7 +24,7 @@ def initialize_config():
 
 
 def set_config(config: Dict):
-    """Update the configuration with custom values."""
+    """Update the process-wide configuration with custom values."""
     global _config, DATA_DIR
     if _config is None:
         _config = default_config.DEFAULT_CONFIG.copy()
@@ -24,11 +33,37 @@ def set_config(config: Dict):
 
 
 def get_config() -> Dict:
-    """Get the current configuration."""
+    """Get the configuration of the current run, or the process-wide one."""
+    run_config = _run_config.get()
+    if run_config is not None:
+        return run_config.copy()
     if _config is None:
         initialize_config()
     return _config.copy()
 
 
+def get_data_dir() -> str:
+    """Directory of the offline datasets in the current configuration."""
+    return get_config()["data_dir"]
+
+
+@contextlib.contextmanager
+def use_config(config: Dict) -> Iterator[Dict]:
+    """Use config, on top of the process-wide one, for the current context.
+
+    Threads and tasks started inside the block with a copy of the context
+    (asyncio tasks, asyncio.to_thread, LangGraph nodes) see it as well; other
+    threads keep their own configuration.
+    """
+    if _config is None:
+        initialize_config()
+    run_config = {**_config, **config}
+    token = _run_config.set(run_config)
+    try:
+        yield run_config
+    finally:
+        _run_config.reset(token)
+
+
 # Initialize with default config
 initialize_config()
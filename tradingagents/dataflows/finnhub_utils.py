@@ -1,5 +1,57 @@
 import json
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+class FinnhubStore:
+    """
+    Process-wide cache of the formatted finnhub JSON files. Each file is
+    parsed once (and again only when it changes on disk); its date keys are
+    kept sorted so range queries are a bisect instead of a scan.
+    """
+
+    _files: Dict[str, Tuple[Tuple[int, int], Dict, List[str], Dict[str, int]]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def data_path(ticker, data_type, data_dir, period=None) -> str:
+        if period:
+            return os.path.join(
+                data_dir,
+                "finnhub_data",
+                data_type,
+                f"{ticker}_{period}_data_formatted.json",
+            )
+        return os.path.join(
+            data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
+        )
+
+    @classmethod
+    def load(cls, data_path: str) -> Tuple[Dict, List[str], Dict[str, int]]:
+        """Return (data, sorted date keys, position of each key in the file)."""
+        stat = os.stat(data_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with cls._lock:
+            cached = cls._files.get(data_path)
+            if cached is not None and cached[0] == signature:
+                return cached[1:]
+
+            with open(data_path, "r") as f:
+                data = json.load(f)
+            positions = {key: i for i, key in enumerate(data)}
+            cls._files[data_path] = (signature, data, sorted(data), positions)
+            return cls._files[data_path][1:]
+
+    @classmethod
+    def get_range(cls, data_path: str, start_date: str, end_date: str) -> Dict:
+        data, keys, positions = cls.load(data_path)
+        in_range = keys[bisect_left(keys, start_date) : bisect_right(keys, end_date)]
+        # keep the order of the file, as callers format the days in that order
+        in_range.sort(key=positions.__getitem__)
+        return {key: data[key] for key in in_range if len(data[key]) > 0}
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -13,24 +65,26 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         period (str): Default to none, if there is a period specified, should be annual or quarterly.
     """
 
-    if period:
-        data_path = os.path.join(
-            data_dir,
-            "finnhub_data",
-            data_type,
-            f"{ticker}_{period}_data_formatted.json",
-        )
-    else:
-        data_path = os.path.join(
-            data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
-        )
-
-    data = open(data_path, "r")
-    data = json.load(data)
+    data_path = FinnhubStore.data_path(ticker, data_type, data_dir, period)
 
     # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    return FinnhubStore.get_range(data_path, start_date, end_date)
+
+
+def canonical_key(value) -> Hashable:
+    """Hashable form of a JSON value; equal values give equal keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, canonical_key(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return ("__list__",) + tuple(canonical_key(item) for item in value)
+    return value
+
+
+def unique_entries(entries: Iterable[Dict]) -> Iterator[Dict]:
+    """Yield entries in order, skipping ones equal to an earlier entry."""
+    seen = set()
+    for entry in entries:
+        key = canonical_key(entry)
+        if key not in seen:
+            seen.add(key)
+            yield entry
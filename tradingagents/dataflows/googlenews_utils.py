@@ -1,6 +1,11 @@
+import contextvars
+import hashlib
 import json
+import os
 import requests
+import threading
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 import random
@@ -12,6 +17,71 @@ from tenacity import (
     retry_if_result,
 )
 
+from .config import get_config
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: up to capacity requests at once, refilled at
+    rate requests per second. acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            # small jitter so waiting threads do not fire in lockstep
+            time.sleep(wait + random.uniform(0, 0.1))
+
+
+# shared per setting, so runs with another config get their own
+_sessions = {}
+_rate_limiters = {}
+_shared_lock = threading.Lock()
+
+
+def get_session():
+    """Keep-alive session shared by all scraper threads with the same pool size."""
+    pool_size = max(1, get_config().get("google_news_concurrency", 3))
+    with _shared_lock:
+        if pool_size not in _sessions:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[pool_size] = session
+        return _sessions[pool_size]
+
+
+def get_rate_limiter():
+    """Process-wide limit on requests to Google, shared across threads."""
+    config = get_config()
+    key = (
+        config.get("google_news_requests_per_second", 0.5),
+        config.get("google_news_burst", 3),
+    )
+    with _shared_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = TokenBucket(rate=key[0], capacity=key[1])
+        return _rate_limiters[key]
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -25,9 +95,9 @@ def is_rate_limited(response):
 )
 def make_request(url, headers):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    # Shared rate limit across all threads instead of a fixed sleep per request
+    get_rate_limiter().acquire()
+    response = get_session().get(url, headers=headers)
     return response
 
 
@@ -51,7 +121,195 @@ def debug_page_structure(soup, page_num):
                 print(f"  Div {j}: class={div.get('class', [])}, text='{div.get_text(strip=True)[:50]}...'")
 
 
-def getNewsData(query, start_date, end_date, debug=False, max_pages=10):
+def is_results_page(soup):
+    """
+    Whether soup is a Google search result page, possibly without results,
+    rather than e.g. a consent or CAPTCHA page.
+    """
+    return soup.find(id="search") is not None or soup.find(id="rso") is not None
+
+
+def parse_results(soup, debug=False):
+    """Extract the news results of one search result page."""
+    # Try multiple selectors for news results
+    results_on_page = []
+    result_selectors = ["div.SoaBEf", ".g", ".Gx5Zad", ".xpd"]
+
+    for selector in result_selectors:
+        results_on_page = soup.select(selector)
+        if results_on_page:
+            if debug:
+                print(f"Found {len(results_on_page)} results using selector: {selector}")
+            break
+
+    news_results = []
+    for el in results_on_page:
+        try:
+            # Extract link with fallback
+            link_elem = el.find("a")
+            if not link_elem or not link_elem.get("href"):
+                continue
+            link = link_elem["href"]
+
+            # Extract title with multiple selector options and fallback
+            title = None
+            title_selectors = ["div.MBeuO", ".MBeuO", "h3", ".DY5T1d"]
+            for selector in title_selectors:
+                title_elem = el.select_one(selector)
+                if title_elem:
+                    title = title_elem.get_text(strip=True)
+                    break
+
+            if not title:
+                continue  # Skip if no title found
+
+            # Extract snippet with multiple selector options and fallback
+            snippet = ""
+            snippet_selectors = [".GI74Re", ".Y3v8qd", ".st"]
+            for selector in snippet_selectors:
+                snippet_elem = el.select_one(selector)
+                if snippet_elem:
+                    snippet = snippet_elem.get_text(strip=True)
+                    break
+
+            # Extract date with multiple selector options and fallback
+            date = ""
+            date_selectors = [".LfVVr", ".f", ".slp"]
+            for selector in date_selectors:
+                date_elem = el.select_one(selector)
+                if date_elem:
+                    date = date_elem.get_text(strip=True)
+                    break
+
+            # Extract source with multiple selector options and fallback
+            source = ""
+            source_selectors = [".NUnG9d span", ".fxgdke", ".CEMjEf"]
+            for selector in source_selectors:
+                source_elem = el.select_one(selector)
+                if source_elem:
+                    source = source_elem.get_text(strip=True)
+                    break
+
+            # Only add result if we have at least title and link
+            if title and link:
+                news_results.append(
+                    {
+                        "link": link,
+                        "title": title,
+                        "snippet": snippet,
+                        "date": date,
+                        "source": source,
+                    }
+                )
+                if debug:
+                    print(f"  Added result: {title[:50]}...")
+
+        except Exception as e:
+            if debug:
+                print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+
+    return news_results
+
+
+class NewsPageCache:
+    """
+    On-disk cache of parsed result pages keyed by (query, date window, page).
+    Entries older than the TTL are ignored, so retries and reruns of the same
+    ticker/date are served without touching Google.
+    """
+
+    def __init__(self, cache_dir=None, ttl_hours=None):
+        config = get_config()
+        self.cache_dir = cache_dir or os.path.join(
+            config["data_cache_dir"], "google_news"
+        )
+        if ttl_hours is None:
+            ttl_hours = config.get("google_news_cache_ttl_hours", 24)
+        self.ttl_seconds = ttl_hours * 3600
+
+    def _path(self, query, start_date, end_date, page):
+        key = json.dumps([query, start_date, end_date, page])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, query, start_date, end_date, page):
+        if self.ttl_seconds <= 0:
+            return None
+        try:
+            with open(self._path(query, start_date, end_date, page)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["fetched_at"] > self.ttl_seconds:
+            return None
+        return entry
+
+    def put(self, query, start_date, end_date, page, results, has_next):
+        if self.ttl_seconds <= 0:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(query, start_date, end_date, page)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "query": query,
+                    "window": [start_date, end_date],
+                    "page": page,
+                    "fetched_at": time.time(),
+                    "results": results,
+                    "has_next": has_next,
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
+
+
+def fetch_page(query, start_date, end_date, page, headers, cache, debug=False):
+    """
+    Fetch and parse one result page, from the cache when possible.
+    Returns (results, has_next).
+    """
+    cached = cache.get(query, start_date, end_date, page) if cache else None
+    if cached is not None:
+        return cached["results"], cached["has_next"]
+
+    offset = page * 10
+    url = (
+        f"https://www.google.com/search?q={query}"
+        f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+        f"&tbm=nws&start={offset}"
+    )
+
+    response = make_request(url, headers)
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    # Debug: Print the page structure
+    if debug:
+        debug_page_structure(soup, page)
+
+    results = parse_results(soup, debug)
+    if not results and debug:
+        print(f"Response status: {response.status_code}")
+        print(f"Response content length: {len(response.content)}")
+
+    # Check for the "Next" link (pagination)
+    has_next = soup.find("a", id="pnnext") is not None
+
+    # a page without results is only cached when it is a real last page; a
+    # consent or CAPTCHA page also comes back with 200 and would otherwise be
+    # served as "no news" until the TTL runs out
+    cacheable = results or (not has_next and is_results_page(soup))
+    if cache and response.status_code == 200 and cacheable:
+        cache.put(query, start_date, end_date, page, results, has_next)
+    return results, has_next
+
+
+def getNewsData(
+    query, start_date, end_date, debug=False, max_pages=10, concurrency=None, use_cache=True
+):
     """
     Scrape Google News search results for a given query and date range.
     query: str - search query
@@ -59,6 +317,8 @@ def getNewsData(query, start_date, end_date, debug=False, max_pages=10):
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
     debug: bool - whether to print debug information
     max_pages: int - maximum number of pages to scrape (default: 10)
+    concurrency: int - pages fetched at once (default: google_news_concurrency from the config)
+    use_cache: bool - whether to use the on-disk page cache
     """
     if "-" in start_date:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
@@ -75,120 +335,50 @@ def getNewsData(query, start_date, end_date, debug=False, max_pages=10):
         )
     }
 
+    if concurrency is None:
+        concurrency = get_config().get("google_news_concurrency", 3)
+    concurrency = max(1, concurrency)
+    cache = NewsPageCache() if use_cache else None
+
     news_results = []
     page = 0
-    while page < max_pages:
-        offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
-        )
-
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            # Debug: Print the page structure
-            if debug:
-                debug_page_structure(soup, page)
-            
-            # Try multiple selectors for news results
-            results_on_page = []
-            result_selectors = ["div.SoaBEf", ".g", ".Gx5Zad", ".xpd"]
-            
-            for selector in result_selectors:
-                results_on_page = soup.select(selector)
-                if results_on_page:
-                    if debug:
-                        print(f"Found {len(results_on_page)} results using selector: {selector}")
-                    break
-            
-            if not results_on_page:
-                print(f"No results found on page {page} with any selector")
-                if debug:
-                    print(f"Response status: {response.status_code}")
-                    print(f"Response content length: {len(response.content)}")
-                break  # No more results found
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while page < max_pages:
+            # fetch the next batch of pages together; results are still
+            # consumed in page order and the batch past the last page is dropped
+            batch = range(page, min(page + concurrency, max_pages))
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    fetch_page, query, start_date, end_date, p, headers, cache, debug,
+                )
+                for p in batch
+            ]
 
-            for el in results_on_page:
+            done = False
+            for p, future in zip(batch, futures):
                 try:
-                    # Extract link with fallback
-                    link_elem = el.find("a")
-                    if not link_elem or not link_elem.get("href"):
-                        continue
-                    link = link_elem["href"]
-                    
-                    # Extract title with multiple selector options and fallback
-                    title = None
-                    title_selectors = ["div.MBeuO", ".MBeuO", "h3", ".DY5T1d"]
-                    for selector in title_selectors:
-                        title_elem = el.select_one(selector)
-                        if title_elem:
-                            title = title_elem.get_text(strip=True)
-                            break
-                    
-                    if not title:
-                        continue  # Skip if no title found
-                    
-                    # Extract snippet with multiple selector options and fallback
-                    snippet = ""
-                    snippet_selectors = [".GI74Re", ".Y3v8qd", ".st"]
-                    for selector in snippet_selectors:
-                        snippet_elem = el.select_one(selector)
-                        if snippet_elem:
-                            snippet = snippet_elem.get_text(strip=True)
-                            break
-                    
-                    # Extract date with multiple selector options and fallback
-                    date = ""
-                    date_selectors = [".LfVVr", ".f", ".slp"]
-                    for selector in date_selectors:
-                        date_elem = el.select_one(selector)
-                        if date_elem:
-                            date = date_elem.get_text(strip=True)
-                            break
-                    
-                    # Extract source with multiple selector options and fallback
-                    source = ""
-                    source_selectors = [".NUnG9d span", ".fxgdke", ".CEMjEf"]
-                    for selector in source_selectors:
-                        source_elem = el.select_one(selector)
-                        if source_elem:
-                            source = source_elem.get_text(strip=True)
-                            break
-                    
-                    # Only add result if we have at least title and link
-                    if title and link:
-                        news_results.append(
-                            {
-                                "link": link,
-                                "title": title,
-                                "snippet": snippet,
-                                "date": date,
-                                "source": source,
-                            }
-                        )
-                        if debug:
-                            print(f"  Added result: {title[:50]}...")
-                        
+                    results, has_next = future.result()
                 except Exception as e:
-                    if debug:
-                        print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
+                    print(f"Failed after multiple retries: {e}")
+                    done = True
+                    break
 
-            # Update the progress bar with the current count of results scraped
+                if not results:
+                    print(f"No results found on page {p} with any selector")
+                    done = True
+                    break  # No more results found
 
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
-                break
+                news_results.extend(results)
 
-            page += 1
+                if not has_next:
+                    done = True
+                    break
 
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
-            break
+            if done:
+                for future in futures:
+                    future.cancel()
+                break
+            page = batch[-1] + 1
 
     return news_results
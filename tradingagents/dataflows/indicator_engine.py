@@ -0,0 +1,311 @@
+import re
+from typing import Annotated, Dict, Iterable, List, Mapping
+
+import numpy as np
+
+
+# Default windows, matching stockstats
+DEFAULT_WINDOWS = {
+    "rsi": 14,
+    "atr": 14,
+    "vwma": 14,
+    "mfi": 14,
+    "boll": 20,
+}
+MACD_WINDOWS = (12, 26, 9)  # short, long, signal
+BOLL_STD_TIMES = 2
+
+_MOVING_AVERAGE = re.compile(r"^(close|open|high|low|volume)_(\d+)_(sma|ema)$")
+_WINDOWED = re.compile(r"^(rsi|atr|vwma|mfi)(?:_(\d+))?$")
+_MACD = ("macd", "macds", "macdh")
+_BOLL = ("boll", "boll_ub", "boll_lb")
+
+
+def _window_total(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the trailing window via cumsum; NaN propagates."""
+    cumsum = np.cumsum(values)
+    out = cumsum.copy()
+    out[window:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sum with min_periods=1 (partial windows at the start). NaN values
+    are skipped like pandas does; a window without any valid value is NaN.
+    """
+    valid = ~np.isnan(values)
+    sums = _window_total(np.where(valid, values, 0.0), window)
+    counts = _window_total(valid.astype(np.float64), window)
+    return np.where(counts > 0, sums, np.nan)
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average with min_periods=1 over the valid values."""
+    valid = ~np.isnan(values)
+    counts = _window_total(valid.astype(np.float64), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return rolling_sum(values, window) / counts
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sample (ddof=1) rolling standard deviation with min_periods=1, over the
+    valid values of each window; NaN until a window holds two of them.
+    """
+    n = len(values)
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    counts = np.count_nonzero(~np.isnan(windows), axis=1)
+    out = np.full(n, np.nan)
+    enough = counts >= 2
+    if enough.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[enough] = np.nanstd(windows[enough], axis=1, ddof=1)
+    return out
+
+
+def decayed_cumsum(values: np.ndarray, decay: float) -> np.ndarray:
+    """
+    Recursive kernel s[t] = values[t] + decay * s[t - 1], evaluated with
+    cumsum over blocks short enough for decay ** -k to stay finite.
+    """
+    n = len(values)
+    if decay == 0.0:
+        return values.copy()
+
+    block = max(1, int(100 / -np.log10(decay)))
+    powers = decay ** np.arange(min(block, n))
+    inverse = 1.0 / powers
+
+    out = np.empty(n)
+    carry = 0.0
+    for start in range(0, n, block):
+        chunk = values[start : start + block]
+        m = len(chunk)
+        out[start : start + m] = (
+            np.cumsum(chunk * inverse[:m]) + carry * decay
+        ) * powers[:m]
+        carry = out[start + m - 1]
+    return out
+
+
+def ewm_mean(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Adjusted exponentially weighted mean, as pandas ewm(adjust=True,
+    ignore_na=False, min_periods<=1): NaN values keep decaying the earlier
+    weights but add no weight of their own, and the mean is NaN only until
+    the first valid value.
+    """
+    decay = 1.0 - alpha
+    valid = ~np.isnan(values)
+    totals = decayed_cumsum(np.where(valid, values, 0.0), decay)
+    weights = decayed_cumsum(valid.astype(np.float64), decay)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(weights > 0, totals / weights, np.nan)
+
+
+def ema(values: np.ndarray, window: int) -> np.ndarray:
+    return ewm_mean(values, 2.0 / (window + 1.0))
+
+
+def smma(values: np.ndarray, window: int) -> np.ndarray:
+    return ewm_mean(values, 1.0 / window)
+
+
+class IndicatorEngine:
+    """
+    NumPy implementation of the technical indicators offered to the market
+    analyst, computed over contiguous float64 arrays. Intermediate series
+    (typical price, true range, EMAs, ...) are shared between indicators
+    requested together, so several indicators cost a single pass.
+    """
+
+    SUPPORTED = (
+        "close_50_sma",
+        "close_200_sma",
+        "close_10_ema",
+        "macd",
+        "macds",
+        "macdh",
+        "rsi",
+        "boll",
+        "boll_ub",
+        "boll_lb",
+        "atr",
+        "vwma",
+        "mfi",
+    )
+
+    def __init__(
+        self,
+        data: Annotated[
+            Mapping[str, Iterable[float]],
+            "price columns (DataFrame or dict), e.g. Close/High/Low/Volume",
+        ],
+    ):
+        self.columns = {}
+        for name in data.keys():
+            key = str(name).lower()
+            if key in ("open", "high", "low", "close", "volume"):
+                self.columns[key] = np.ascontiguousarray(data[name], dtype=np.float64)
+        self._memo: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self.columns["close"])
+
+    @classmethod
+    def supports(cls, indicator: str) -> bool:
+        return (
+            indicator in _MACD
+            or indicator in _BOLL
+            or _MOVING_AVERAGE.match(indicator) is not None
+            or _WINDOWED.match(indicator) is not None
+        )
+
+    def _cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def _tp(self) -> np.ndarray:
+        # stockstats zero-fills the typical price of rows with a missing price
+        return self._cached(
+            "tp",
+            lambda: np.nan_to_num(
+                (self.columns["close"] + self.columns["high"] + self.columns["low"])
+                / 3.0
+            ),
+        )
+
+    def _tr(self) -> np.ndarray:
+        def compute():
+            close = self.columns["close"]
+            high = self.columns["high"]
+            low = self.columns["low"]
+            prev_close = np.empty_like(close)
+            prev_close[:1] = close[:1]
+            prev_close[1:] = close[:-1]
+            tr = np.maximum(
+                high - low,
+                np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)),
+            )
+            return np.nan_to_num(tr)
+
+        return self._cached("tr", compute)
+
+    def _ema(self, column: str, window: int) -> np.ndarray:
+        return self._cached(
+            f"{column}_{window}_ema", lambda: ema(self.columns[column], window)
+        )
+
+    def _sma(self, column: str, window: int) -> np.ndarray:
+        return self._cached(
+            f"{column}_{window}_sma", lambda: sma(self.columns[column], window)
+        )
+
+    def _macd(self) -> None:
+        short_w, long_w, signal_w = MACD_WINDOWS
+        macd = self._ema("close", short_w) - self._ema("close", long_w)
+        macds = ema(macd, signal_w)
+        self._memo["macd"] = macd
+        self._memo["macds"] = macds
+        self._memo["macdh"] = macd - macds
+
+    def _boll(self) -> None:
+        window = DEFAULT_WINDOWS["boll"]
+        middle = self._sma("close", window)
+        width = BOLL_STD_TIMES * rolling_std(self.columns["close"], window)
+        self._memo["boll"] = middle
+        self._memo["boll_ub"] = middle + width
+        self._memo["boll_lb"] = middle - width
+
+    def _rsi(self, window: int) -> np.ndarray:
+        close = self.columns["close"]
+        diff = np.zeros_like(close)
+        diff[1:] = np.diff(close)
+
+        up = smma(np.where(diff > 0, diff, 0.0), window)
+        down = smma(np.where(diff < 0, -diff, 0.0), window)
+        total = up + down
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(total != 0, 100 * (up / total), 50.0)
+        rsi[0] = 50.0
+        return rsi
+
+    def _atr(self, window: int) -> np.ndarray:
+        return smma(self._tr(), window)
+
+    def _vwma(self, window: int) -> np.ndarray:
+        volume = self.columns["volume"]
+        tpv = rolling_sum(volume * self._tp(), window)
+        vol = rolling_sum(volume, window)
+        return np.divide(tpv, vol, out=np.zeros_like(tpv), where=vol != 0)
+
+    def _mfi(self, window: int) -> np.ndarray:
+        tp = self._tp()
+        raw_money_flow = tp * self.columns["volume"]
+        tp_diff = np.zeros_like(tp)
+        tp_diff[1:] = np.diff(tp)
+
+        # stockstats sums the flows with a plain cumsum, so a NaN volume holds
+        # mfi at 0.5 from then on; keep that for parity
+        pos_sum = _window_total(np.where(tp_diff > 0, raw_money_flow, 0.0), window)
+        neg_sum = _window_total(np.where(tp_diff < 0, raw_money_flow, 0.0), window)
+        total = pos_sum + neg_sum
+        mfi = np.divide(
+            pos_sum, total, out=np.full_like(pos_sum, 0.5), where=total > 0
+        )
+        mfi[:window] = 0.5
+        return mfi
+
+    def get(self, indicator: Annotated[str, "indicator name, e.g. rsi or close_50_sma"]) -> np.ndarray:
+        """Return the full series of a single indicator."""
+        if indicator in self._memo:
+            return self._memo[indicator]
+
+        if indicator in _MACD:
+            self._macd()
+        elif indicator in _BOLL:
+            self._boll()
+        elif _MOVING_AVERAGE.match(indicator):
+            column, window, kind = _MOVING_AVERAGE.match(indicator).groups()
+            if kind == "sma":
+                self._sma(column, int(window))
+            else:
+                self._ema(column, int(window))
+        elif _WINDOWED.match(indicator):
+            name, window = _WINDOWED.match(indicator).groups()
+            window = int(window) if window else DEFAULT_WINDOWS[name]
+            self._memo[indicator] = getattr(self, f"_{name}")(window)
+        else:
+            raise ValueError(
+                f"Indicator {indicator} is not supported by the indicator engine. "
+                f"Please choose from: {list(self.SUPPORTED)}"
+            )
+
+        return self._memo[indicator]
+
+    def compute(
+        self, indicators: Annotated[Iterable[str], "indicator names"]
+    ) -> Dict[str, np.ndarray]:
+        """Compute several indicators in one pass, sharing intermediate series."""
+        return {indicator: self.get(indicator) for indicator in indicators}
+
+    def last(
+        self,
+        indicators: Annotated[Iterable[str], "indicator names"],
+        n: Annotated[int, "number of most recent values to return"],
+    ) -> Dict[str, np.ndarray]:
+        """Return the last n values of each indicator."""
+        return {
+            indicator: values[-n:] if n > 0 else values[:0]
+            for indicator, values in self.compute(indicators).items()
+        }
+
+
+def compute_indicators(
+    data: Mapping[str, Iterable[float]], indicators: List[str]
+) -> Dict[str, np.ndarray]:
+    """Convenience wrapper: full series of several indicators for one price history."""
+    return IndicatorEngine(data).compute(indicators)
@@ -1,20 +1,26 @@
-from typing import Annotated, Dict
-from .reddit_utils import fetch_top_from_category
+from typing import Annotated, Any, Callable, Dict, List, Optional
+from .reddit_utils import (
+    fetch_top_from_category_bulk,
+    fetch_top_from_category_range,
+)
 from .yfin_utils import *
 from .stockstats_utils import *
+from .price_store import PriceStore
+from .simfin_store import SimFinStore, statement_path
 from .googlenews_utils import *
-from .finnhub_utils import get_data_in_range
+from .finnhub_utils import get_data_in_range, unique_entries
 from .deepseek_fundamentals import get_fundamentals_deepseek
 from dateutil.relativedelta import relativedelta
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import asyncio
 import json
 import os
 import pandas as pd
-from tqdm import tqdm
 import yfinance as yf
-from openai import OpenAI
-from .config import get_config, set_config, DATA_DIR
+from openai import AsyncOpenAI, OpenAI
+from .config import get_config, get_data_dir, set_config, use_config
+from .utils import single_flight
 
 
 def get_finnhub_news(
@@ -41,7 +47,7 @@ def get_finnhub_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    result = get_data_in_range(ticker, before, curr_date, "news_data", DATA_DIR)
+    result = get_data_in_range(ticker, before, curr_date, "news_data", get_data_dir())
 
     if len(result) == 0:
         return ""
@@ -80,18 +86,16 @@ def get_finnhub_company_insider_sentiment(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_senti", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_senti", get_data_dir())
 
     if len(data) == 0:
         return ""
 
     result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    for entry in unique_entries(
+        entry for senti_list in data.values() for entry in senti_list
+    ):
+        result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -121,19 +125,17 @@ def get_finnhub_company_insider_transactions(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_trans", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_trans", get_data_dir())
 
     if len(data) == 0:
         return ""
 
     result_str = ""
 
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    for entry in unique_entries(
+        entry for trans_list in data.values() for entry in trans_list
+    ):
+        result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -150,35 +152,16 @@ def get_simfin_balance_sheet(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "balance_sheet",
-        "companies",
-        "us",
-        f"us-balance-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    data_path = statement_path(get_data_dir(), "balance_sheet", freq)
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest balance sheet published on or before the current date, from the per-ticker index
+    latest_balance_sheet = SimFinStore().as_of(data_path, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -197,35 +180,16 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "cash_flow",
-        "companies",
-        "us",
-        f"us-cashflow-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    data_path = statement_path(get_data_dir(), "cashflow", freq)
 
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest cash flow statement published on or before the current date, from the per-ticker index
+    latest_cash_flow = SimFinStore().as_of(data_path, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -244,35 +208,16 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "income_statements",
-        "companies",
-        "us",
-        f"us-income-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    data_path = statement_path(get_data_dir(), "income_statements", freq)
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest income statement published on or before the current date, from the per-ticker index
+    latest_income = SimFinStore().as_of(data_path, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -309,6 +254,28 @@ def get_google_news(
     return f"## {query} Google News, from {before} to {curr_date}:\n\n{news_str}"
 
 
+# seconds a date-only global news result is shared for
+GLOBAL_NEWS_TTL = 3600
+
+
+def _is_news(result) -> bool:
+    """Whether a global news fetch returned news worth sharing, not nothing or an error."""
+    if not isinstance(result, str) or not result.strip():
+        return False
+    return not result.lstrip().lower().startswith(("error", "failed"))
+
+
+# same content for every ticker: one fetch per date, shared across workers
+@single_flight(
+    key=lambda start_date, look_back_days, max_limit_per_day: (
+        get_data_dir(),
+        start_date,
+        look_back_days,
+        max_limit_per_day,
+    ),
+    ttl=GLOBAL_NEWS_TTL,
+    cache_if=_is_news,
+)
 def get_reddit_global_news(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
@@ -327,26 +294,20 @@ def get_reddit_global_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
+    # every day from before to start_date, read from the corpus in one pass
     curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
-
+    dates = []
     while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
+        dates.append(curr_date.strftime("%Y-%m-%d"))
         curr_date += relativedelta(days=1)
-        pbar.update(1)
 
-    pbar.close()
+    fetch_result = fetch_top_from_category_range(
+        "global_news",
+        dates,
+        max_limit_per_day,
+        data_path=os.path.join(get_data_dir(), "reddit_data"),
+    )
+    posts = [post for date in dates for post in fetch_result[date]]
 
     if len(posts) == 0:
         return ""
@@ -376,48 +337,63 @@ def get_reddit_company_news(
     Returns:
         str: A formatted dataframe containing the latest news articles posts on reddit and meta information in these columns: "created_utc", "id", "title", "selftext", "score", "num_comments", "url"
     """
+    return get_reddit_companies_news(
+        [ticker], start_date, look_back_days, max_limit_per_day
+    )[ticker]
+
+
+def get_reddit_companies_news(
+    tickers: Annotated[List[str], "ticker symbols of the watchlist"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+    max_limit_per_day: Annotated[int, "Maximum number of news per ticker per day"],
+) -> Dict[str, str]:
+    """
+    get_reddit_company_news for a whole watchlist, filtering the corpus once
+    for all tickers instead of once per ticker
+    Returns:
+        dict: ticker -> the report get_reddit_company_news returns for it
+    """
 
     start_date = datetime.strptime(start_date, "%Y-%m-%d")
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
+    # every day from before to start_date, read from the corpus in one pass
     curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
-    )
-
+    dates = []
     while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
+        dates.append(curr_date.strftime("%Y-%m-%d"))
         curr_date += relativedelta(days=1)
 
-        pbar.update(1)
+    fetch_result = fetch_top_from_category_bulk(
+        "company_news",
+        dates,
+        max_limit_per_day,
+        tickers,
+        data_path=os.path.join(get_data_dir(), "reddit_data"),
+    )
 
-    pbar.close()
+    reports = {}
+    for ticker in tickers:
+        posts = [post for date in dates for post in fetch_result[ticker][date]]
 
-    if len(posts) == 0:
-        return ""
+        if len(posts) == 0:
+            reports[ticker] = ""
+            continue
 
-    news_str = ""
-    for post in posts:
-        if post["content"] == "":
-            news_str += f"### {post['title']}\n\n"
-        else:
-            news_str += f"### {post['title']}\n\n{post['content']}\n\n"
+        news_str = ""
+        for post in posts:
+            if post["content"] == "":
+                news_str += f"### {post['title']}\n\n"
+            else:
+                news_str += f"### {post['title']}\n\n{post['content']}\n\n"
 
-    return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
+        reports[ticker] = (
+            f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
+        )
+
+    return reports
 
 
 def get_stock_stats_indicators_window(
@@ -512,39 +488,37 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
+    # load the price history and compute the indicator once for the whole window
+    window_values = get_stockstats_indicator_window(
+        symbol, indicator, before.strftime("%Y-%m-%d"), end_date, online
+    )
+    if window_values is None and not online:
+        # as with the per-day lookups: a missing price file raises, and every
+        # trading day of the window is listed without a value
+        prices = PriceStore().load(
             os.path.join(
-                DATA_DIR,
+                get_data_dir(),
                 f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
             )
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
+        lo, hi = prices.date_range(before.strftime("%Y-%m-%d"), end_date)
+        window_values = {date: "" for date in prices.date_strings(lo, hi)}
 
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
+    ind_string = ""
+    while curr_date >= before:
+        curr_date_str = curr_date.strftime("%Y-%m-%d")
+        if window_values is None:
+            # indicator could not be computed, keep one (empty) line per day
+            ind_string += f"{curr_date_str}: \n"
+        elif curr_date_str in window_values:
+            ind_string += f"{curr_date_str}: {window_values[curr_date_str]}\n"
+        elif online:
+            # offline only reports trading dates, online reports every day
+            ind_string += (
+                f"{curr_date_str}: N/A: Not a trading day (weekend or holiday)\n"
             )
 
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
+        curr_date = curr_date - relativedelta(days=1)
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
@@ -556,6 +530,66 @@ def get_stock_stats_indicators_window(
     return result_str
 
 
+def _stockstats_with_fallback(
+    compute: Callable[[bool], Any],
+    symbol: str,
+    indicator: str,
+    period: str,
+    online: bool,
+) -> Optional[Any]:
+    """
+    Run compute(online); if offline mode fails on an unreadable CSV, retry it
+    online. Returns None when the indicator could not be computed.
+    """
+    try:
+        return compute(online)
+    except Exception as e:
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} {period}: {e}"
+        )
+        # If offline mode failed due to CSV issues, try online mode as fallback
+        if not online and "Cannot parse CSV data" in str(e):
+            try:
+                print(f"Retrying {indicator} for {symbol} in online mode...")
+                return compute(True)
+            except Exception as e2:
+                print(f"Online mode also failed for {indicator}: {e2}")
+        return None
+
+
+def get_stockstats_indicator_window(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicator: Annotated[str, "technical indicator to get the analysis and report of"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    online: Annotated[bool, "to fetch data online or offline"],
+) -> Optional[Dict[str, str]]:
+    """
+    Retrieve the values of an indicator for every trading day between start_date
+    and end_date (inclusive), computed from a single load of the price history.
+    Returns None if the indicator could not be computed.
+    """
+
+    window_values = _stockstats_with_fallback(
+        lambda online: StockstatsUtils.get_stock_stats_window(
+            symbol,
+            indicator,
+            start_date,
+            end_date,
+            os.path.join(get_data_dir(), "market_data", "price_data"),
+            online=online,
+        ),
+        symbol,
+        indicator,
+        f"from {start_date} to {end_date}",
+        online,
+    )
+    if window_values is None:
+        return None
+
+    return {date: str(value) for date, value in window_values.items()}
+
+
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -568,34 +602,21 @@ def get_stockstats_indicator(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     curr_date = curr_date.strftime("%Y-%m-%d")
 
-    try:
-        indicator_value = StockstatsUtils.get_stock_stats(
+    indicator_value = _stockstats_with_fallback(
+        lambda online: StockstatsUtils.get_stock_stats(
             symbol,
             indicator,
             curr_date,
-            os.path.join(DATA_DIR, "market_data", "price_data"),
+            os.path.join(get_data_dir(), "market_data", "price_data"),
             online=online,
-        )
-    except Exception as e:
-        print(
-            f"Error getting stockstats indicator data for indicator {indicator} on {curr_date}: {e}"
-        )
-        # If offline mode failed due to CSV issues, try online mode as fallback
-        if not online and "Cannot parse CSV data" in str(e):
-            try:
-                print(f"Retrying {indicator} for {symbol} in online mode...")
-                indicator_value = StockstatsUtils.get_stock_stats(
-                    symbol,
-                    indicator,
-                    curr_date,
-                    os.path.join(DATA_DIR, "market_data", "price_data"),
-                    online=True,
-                )
-            except Exception as e2:
-                print(f"Online mode also failed for {indicator}: {e2}")
-                return ""
-        else:
-            return ""
+        ),
+        symbol,
+        indicator,
+        f"on {curr_date}",
+        online,
+    )
+    if indicator_value is None:
+        return ""
 
     return str(indicator_value)
 
@@ -611,23 +632,16 @@ def get_YFin_data_window(
     start_date = before.strftime("%Y-%m-%d")
 
     # read in data
-    data = pd.read_csv(
+    prices = PriceStore().load(
         os.path.join(
-            DATA_DIR,
+            get_data_dir(),
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
         )
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    # Binary search the rows between the start and end dates (inclusive)
+    lo, hi = prices.date_range(start_date, curr_date)
+    filtered_data = prices.to_frame(lo, hi)
 
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
@@ -689,9 +703,9 @@ def get_YFin_data(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
     # read in data
-    data = pd.read_csv(
+    prices = PriceStore().load(
         os.path.join(
-            DATA_DIR,
+            get_data_dir(),
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
         )
     )
@@ -701,16 +715,9 @@ def get_YFin_data(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    # Binary search the rows between the start and end dates (inclusive)
+    lo, hi = prices.date_range(start_date, end_date)
+    filtered_data = prices.to_frame(lo, hi)
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
@@ -718,11 +725,14 @@ def get_YFin_data(
     return filtered_data
 
 
-def get_stock_news_openai(ticker, curr_date):
-    config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+STOCK_NEWS_QUERY = "Can you search Social Media for {ticker} from 7 days before {curr_date} to {curr_date}? Make sure you only get the data posted during that period."
+GLOBAL_NEWS_QUERY = "Can you search global or macroeconomics news from 7 days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period."
+FUNDAMENTALS_QUERY = "Can you search Fundamental for discussions on {ticker} during of the month before {curr_date} to the month of {curr_date}. Make sure you only get the data posted during that period. List as a table, with PE/PS/Cash flow/ etc"
 
-    response = client.responses.create(
+
+def _web_search_request(config, text):
+    """Arguments of a Responses API call answering text with web search."""
+    return dict(
         model=config["quick_think_llm"],
         input=[
             {
@@ -730,7 +740,7 @@ def get_stock_news_openai(ticker, curr_date):
                 "content": [
                     {
                         "type": "input_text",
-                        "text": f"Can you search Social Media for {ticker} from 7 days before {curr_date} to {curr_date}? Make sure you only get the data posted during that period.",
+                        "text": text,
                     }
                 ],
             }
@@ -750,42 +760,53 @@ def get_stock_news_openai(ticker, curr_date):
         store=True,
     )
 
+
+def _web_search(text):
+    config = get_config()
+    client = OpenAI(base_url=config["backend_url"])
+    response = client.responses.create(**_web_search_request(config, text))
     return response.output[1].content[0].text
 
 
-def get_global_news_openai(curr_date):
+async def _aweb_search(text):
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = AsyncOpenAI(base_url=config["backend_url"])
+    response = await client.responses.create(**_web_search_request(config, text))
+    return response.output[1].content[0].text
 
-    response = client.responses.create(
-        model=config["quick_think_llm"],
-        input=[
-            {
-                "role": "system",
-                "content": [
-                    {
-                        "type": "input_text",
-                        "text": f"Can you search global or macroeconomics news from 7 days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period.",
-                    }
-                ],
-            }
-        ],
-        text={"format": {"type": "text"}},
-        reasoning={},
-        tools=[
-            {
-                "type": "web_search_preview",
-                "user_location": {"type": "approximate"},
-                "search_context_size": "low",
-            }
-        ],
-        temperature=1,
-        max_output_tokens=4096,
-        top_p=1,
-        store=True,
+
+def get_stock_news_openai(ticker, curr_date):
+    return _web_search(STOCK_NEWS_QUERY.format(ticker=ticker, curr_date=curr_date))
+
+
+async def aget_stock_news_openai(ticker, curr_date):
+    """Async version of get_stock_news_openai."""
+    return await _aweb_search(
+        STOCK_NEWS_QUERY.format(ticker=ticker, curr_date=curr_date)
     )
 
-    return response.output[1].content[0].text
+
+# same content for every ticker: one web search per date, shared across workers
+@single_flight(
+    key=lambda curr_date: (
+        get_config()["backend_url"],
+        get_config()["quick_think_llm"],
+        curr_date,
+    ),
+    ttl=GLOBAL_NEWS_TTL,
+    cache_if=_is_news,
+)
+def get_global_news_openai(curr_date):
+    return _web_search(GLOBAL_NEWS_QUERY.format(curr_date=curr_date))
+
+
+async def aget_global_news_openai(curr_date):
+    """
+    Async version of get_global_news_openai. It goes through the sync
+    single-flight cache so threads and coroutines still share one search
+    per date; after the first call this is a cache hit.
+    """
+    return await asyncio.to_thread(get_global_news_openai, curr_date)
 
 
 def get_fundamentals_openai(ticker, curr_date):
@@ -802,41 +823,23 @@ def get_fundamentals_openai(ticker, curr_date):
     
     elif llm_provider == "openai":
         # Original OpenAI web search (only if not DeepSeek)
-        client = OpenAI(base_url=config["backend_url"])
-        response = client.responses.create(
-            model=config["quick_think_llm"],
-            input=[
-                {
-                    "role": "system",
-                    "content": [
-                        {
-                            "type": "input_text",
-                            "text": f"Can you search Fundamental for discussions on {ticker} during of the month before {curr_date} to the month of {curr_date}. Make sure you only get the data posted during that period. List as a table, with PE/PS/Cash flow/ etc",
-                        }
-                    ],
-                }
-            ],
-            text={"format": {"type": "text"}},
-            reasoning={},
-            tools=[
-                {
-                    "type": "web_search_preview",
-                    "user_location": {"type": "approximate"},
-                    "search_context_size": "low",
-                }
-            ],
-            temperature=1,
-            max_output_tokens=4096,
-            top_p=1,
-            store=True,
-        )
-        return response.output[1].content[0].text
+        return _web_search(FUNDAMENTALS_QUERY.format(ticker=ticker, curr_date=curr_date))
     
     else:
         # Fallback to web search + data aggregation
         return get_fundamentals_web_fallback(ticker, curr_date)
 
 
+async def aget_fundamentals_openai(ticker, curr_date):
+    """Async version of get_fundamentals_openai."""
+    if get_config().get("llm_provider", "openai").lower() == "openai":
+        return await _aweb_search(
+            FUNDAMENTALS_QUERY.format(ticker=ticker, curr_date=curr_date)
+        )
+    # the DuckDuckGo search has no async client
+    return await asyncio.to_thread(get_fundamentals_openai, ticker, curr_date)
+
+
 def get_fundamentals_web_fallback(ticker: str, curr_date: str) -> str:
     """通用回退方案，支持任何提供商"""
     from .deepseek_fundamentals import get_fundamentals_deepseek
@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+from typing import Annotated, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .store_entries import (
+    READ_ATTEMPTS,
+    current_version,
+    entry_dir,
+    publish,
+    staging_dir,
+)
+
+
+class PriceSeries:
+    """
+    Columnar view of one price history. Dates are stored as int64 days since
+    the epoch and every other column as its own memory-mapped array, so date
+    lookups are a binary search and slicing does not copy.
+    """
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.dates)
+
+    @staticmethod
+    def to_day(date: Annotated[str, "date in YYYY-mm-dd format"]) -> int:
+        return int(np.datetime64(date[:10], "D").astype(np.int64))
+
+    def date_range(
+        self,
+        start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+        end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    ) -> Tuple[int, int]:
+        """Return the [lo, hi) row positions covering start_date..end_date inclusive."""
+        lo = int(np.searchsorted(self.dates, self.to_day(start_date), side="left"))
+        hi = int(np.searchsorted(self.dates, self.to_day(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def date_strings(self, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        return np.datetime_as_string(self.dates[lo:hi].astype("datetime64[D]"))
+
+    def to_frame(self, lo: int = 0, hi: Optional[int] = None) -> pd.DataFrame:
+        """Build a DataFrame for rows [lo, hi) with Date as YYYY-mm-dd strings."""
+        hi = len(self) if hi is None else hi
+        frame = {"Date": self.date_strings(lo, hi)}
+        for name, values in self.columns.items():
+            frame[name] = values[lo:hi]
+        return pd.DataFrame(frame, index=pd.RangeIndex(lo, hi))
+
+
+class PriceStore:
+    """
+    Per-file binary store for OHLCV CSVs. Each CSV is ingested once into a
+    directory of .npy files (one per column) and opened with mmap afterwards.
+    Entries are re-ingested, as a new version, when the source CSV changes.
+    """
+
+    _cache: Dict[str, Tuple[Tuple[int, int], PriceSeries]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, store_dir: Optional[str] = None):
+        self.store_dir = store_dir or get_config()["price_store_dir"]
+
+    def entry_dir(self, csv_path: str) -> str:
+        return entry_dir(self.store_dir, csv_path)
+
+    @staticmethod
+    def _source_signature(csv_path: str) -> Tuple[int, int]:
+        stat = os.stat(csv_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def read_csv(csv_path: str) -> pd.DataFrame:
+        try:
+            return pd.read_csv(csv_path)
+        except pd.errors.ParserError:
+            # Python parser is slower but skips malformed lines
+            return pd.read_csv(csv_path, on_bad_lines="skip", engine="python")
+
+    def ingest(
+        self,
+        csv_path: Annotated[str, "path of the YFin CSV to convert"],
+        data: Optional[pd.DataFrame] = None,
+    ) -> str:
+        """Convert a price CSV (or an already loaded frame of it) into the store."""
+        signature = self._source_signature(csv_path)
+        if data is None:
+            data = self.read_csv(csv_path)
+
+        data = data.copy()
+        # keep the local trading date, i.e. the date part before any time/tz
+        data["Date"] = pd.to_datetime(
+            data["Date"].astype(str).str[:10], format="%Y-%m-%d", errors="coerce"
+        )
+        data = data.dropna(subset=["Date"])
+        data = data.sort_values("Date", kind="stable")
+
+        days = data["Date"].values.astype("datetime64[D]").astype(np.int64)
+        columns: List[str] = [
+            col
+            for col in data.columns
+            if col != "Date" and pd.api.types.is_numeric_dtype(data[col])
+        ]
+
+        entry = self.entry_dir(csv_path)
+        tmp_entry = staging_dir(entry)
+
+        np.save(os.path.join(tmp_entry, "Date.npy"), np.ascontiguousarray(days))
+        for i, col in enumerate(columns):
+            np.save(
+                os.path.join(tmp_entry, f"col{i}.npy"),
+                np.ascontiguousarray(data[col].values),
+            )
+        with open(os.path.join(tmp_entry, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "source": os.path.abspath(csv_path),
+                    "mtime_ns": signature[0],
+                    "size": signature[1],
+                    "columns": columns,
+                },
+                f,
+            )
+
+        publish(entry, tmp_entry)
+        return entry
+
+    def _open(self, entry: str) -> Optional[Tuple[Tuple[int, int], PriceSeries]]:
+        """Open the current version of entry; None if there is none (any more)."""
+        version = current_version(entry)
+        if version is None:
+            return None
+        try:
+            with open(os.path.join(version, "meta.json")) as f:
+                meta = json.load(f)
+            dates = np.load(os.path.join(version, "Date.npy"), mmap_mode="r")
+            columns = {
+                col: np.load(os.path.join(version, f"col{i}.npy"), mmap_mode="r")
+                for i, col in enumerate(meta["columns"])
+            }
+        except FileNotFoundError:
+            # replaced by a concurrent ingest since the pointer was read
+            return None
+        return (meta["mtime_ns"], meta["size"]), PriceSeries(dates, columns)
+
+    def load(
+        self,
+        csv_path: Annotated[str, "path of the YFin CSV backing the series"],
+        data: Optional[pd.DataFrame] = None,
+    ) -> PriceSeries:
+        """
+        Return the stored series for csv_path, ingesting it on first use or
+        when the CSV has changed since it was ingested.
+        """
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(csv_path)
+
+        signature = self._source_signature(csv_path)
+        entry = self.entry_dir(csv_path)
+
+        with self._lock:
+            cached = self._cache.get(entry)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            for _ in range(READ_ATTEMPTS):
+                opened = self._open(entry)
+                if opened is not None and opened[0] == signature:
+                    self._cache[entry] = opened
+                    return opened[1]
+                self.ingest(csv_path, data)
+                # the CSV may have been rewritten meanwhile
+                signature = self._source_signature(csv_path)
+
+        raise Exception(
+            f"Price store: {entry} kept changing while {csv_path} was loaded"
+        )
+
+    def ingest_dir(
+        self,
+        data_dir: Annotated[str, "directory containing YFin CSV files"],
+    ) -> List[str]:
+        """One-time bulk ingest of every YFin CSV in a directory."""
+        entries = []
+        for file_name in sorted(os.listdir(data_dir)):
+            if "-YFin-data-" in file_name and file_name.endswith(".csv"):
+                csv_path = os.path.join(data_dir, file_name)
+                self.load(csv_path)
+                entries.append(self.entry_dir(csv_path))
+        return entries
+
+
+if __name__ == "__main__":
+    import sys
+
+    config = get_config()
+    store = PriceStore()
+    source_dirs = sys.argv[1:] or [
+        os.path.join(config["data_dir"], "market_data", "price_data"),
+        config["data_cache_dir"],
+    ]
+    for source_dir in source_dirs:
+        if os.path.isdir(source_dir):
+            ingested = store.ingest_dir(source_dir)
+            print(f"Ingested {len(ingested)} price files from {source_dir}")
@@ -3,9 +3,14 @@ import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Dict, List, Optional, Set, Tuple
 import os
 import re
+import threading
+
+from .config import get_config
+from .store_entries import entry_dir
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,87 +54,274 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
-    category: Annotated[
-        str, "Category to fetch top post from. Collection of subreddits."
-    ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
-    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
-    data_path: Annotated[
-        str,
-        "Path to the data folder. Default is 'reddit_data'.",
-    ] = "reddit_data",
-):
-    base_path = data_path
+class RedditIndex:
+    """
+    Day -> byte ranges index over the subreddit .jsonl dumps. A file is
+    scanned once to record where each day's posts are; afterwards a query
+    seeks straight to the lines of the requested days. Indexes are kept for
+    the whole process and saved under data_cache_dir/reddit_index, and are
+    rebuilt when the source file changes.
+    """
+
+    _indexes: Dict[str, Tuple[Tuple[int, int], Dict[str, List[List[int]]]]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, index_dir: Optional[str] = None):
+        self.index_dir = index_dir or os.path.join(
+            get_config()["data_cache_dir"], "reddit_index"
+        )
+
+    def _index_path(self, file_path: str) -> str:
+        # keyed by the source path, like the price and SimFin store entries
+        return f"{entry_dir(self.index_dir, file_path)}.json"
+
+    @staticmethod
+    def scan(file_path: str) -> Dict[str, List[List[int]]]:
+        """One pass over a .jsonl file: day -> [[offset, length], ...] in file order."""
+        days: Dict[str, List[List[int]]] = {}
+        offset = 0
+        with open(file_path, "rb") as f:
+            for line in f:
+                length = len(line)
+                # skip empty lines
+                if line.strip():
+                    post_date = datetime.utcfromtimestamp(
+                        json.loads(line)["created_utc"]
+                    ).strftime("%Y-%m-%d")
+                    days.setdefault(post_date, []).append([offset, length])
+                offset += length
+        return days
 
-    all_content = []
+    def get(self, file_path: str) -> Dict[str, List[List[int]]]:
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+        with self._lock:
+            cached = self._indexes.get(file_path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            index_path = self._index_path(file_path)
+            days = None
+            try:
+                with open(index_path) as f:
+                    saved = json.load(f)
+                if (saved["mtime_ns"], saved["size"]) == signature:
+                    days = saved["days"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+            if days is None:
+                days = self.scan(file_path)
+                os.makedirs(self.index_dir, exist_ok=True)
+                tmp_path = f"{index_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+                with open(tmp_path, "w") as f:
+                    json.dump(
+                        {"mtime_ns": signature[0], "size": signature[1], "days": days},
+                        f,
+                    )
+                os.replace(tmp_path, index_path)
+
+            self._indexes[file_path] = (signature, days)
+            return days
+
+    def read_days(
+        self, file_path: str, dates: List[str]
+    ) -> Dict[str, List[Dict]]:
+        """Parsed posts of the given days, read in a single open of the file."""
+        days = self.get(file_path)
+        posts = {date: [] for date in dates}
+        with open(file_path, "rb") as f:
+            for date in dates:
+                for offset, length in days.get(date, []):
+                    f.seek(offset)
+                    posts[date].append(json.loads(f.read(length)))
+        return posts
+
+
+def company_search_terms(ticker: Annotated[str, "ticker symbol of the company"]) -> List[str]:
+    """Patterns that identify a company in a post: its names and its ticker."""
+    if "OR" in ticker_to_company[ticker]:
+        search_terms = ticker_to_company[ticker].split(" OR ")
+    else:
+        search_terms = [ticker_to_company[ticker]]
+
+    search_terms.append(ticker)
+    return search_terms
+
+
+@lru_cache(maxsize=None)
+def company_matcher(ticker: Annotated[str, "ticker symbol of the company"]) -> re.Pattern:
+    """One compiled, case-insensitive alternation of the company's search terms."""
+    return re.compile(
+        "|".join(f"(?:{term})" for term in company_search_terms(ticker)),
+        re.IGNORECASE,
+    )
+
+
+class CompanyTagger:
+    """
+    Tags a text with every ticker of a watchlist it mentions, in one scan.
+    A combined lookahead finds the positions where any search term starts;
+    only the tickers with a term beginning with that character are then
+    matched there, so the result equals running each ticker's matcher.
+    """
+
+    def __init__(self, tickers: Annotated[List[str], "tickers to tag posts with"]):
+        self.tickers = tuple(dict.fromkeys(tickers))
+        self.matchers = {ticker: company_matcher(ticker) for ticker in self.tickers}
+
+        self._by_first_char: Dict[str, List[str]] = {}
+        self._anywhere: List[str] = []
+        terms = []
+        for ticker in self.tickers:
+            for term in company_search_terms(ticker):
+                terms.append(f"(?:{term})")
+                first = term[:1]
+                if first.isalnum():
+                    candidates = self._by_first_char.setdefault(first.lower(), [])
+                    if ticker not in candidates:
+                        candidates.append(ticker)
+                elif ticker not in self._anywhere:
+                    # a term starting with regex syntax can begin with any character
+                    self._anywhere.append(ticker)
+
+        self._starts = re.compile(f"(?=(?:{'|'.join(terms)}))", re.IGNORECASE)
+
+    def tag(self, text: str, found: Optional[Set[str]] = None) -> Set[str]:
+        found = set() if found is None else found
+        for start in self._starts.finditer(text):
+            position = start.start()
+            for ticker in self._by_first_char.get(text[position].lower(), ()):
+                if ticker not in found and self.matchers[ticker].match(text, position):
+                    found.add(ticker)
+            for ticker in self._anywhere:
+                if ticker not in found and self.matchers[ticker].match(text, position):
+                    found.add(ticker)
+            if len(found) == len(self.tickers):
+                break
+        return found
+
+    def tag_post(self, parsed_line: Dict) -> Set[str]:
+        """Tickers mentioned in the title or the content of a post."""
+        found = self.tag(parsed_line["title"])
+        if len(found) < len(self.tickers):
+            self.tag(parsed_line["selftext"], found)
+        return found
+
+
+def _top_posts(
+    category: str,
+    dates: List[str],
+    max_limit: int,
+    data_path: str,
+    tagger: Optional[CompanyTagger] = None,
+) -> Dict[Optional[str], Dict[str, List[Dict]]]:
+    """
+    Top posts per subreddit per day, keyed by ticker when a tagger is given
+    (posts must mention the ticker) and by None otherwise.
+    """
+    base_path = data_path
+    file_names = os.listdir(os.path.join(base_path, category))
+
+    if max_limit < len(file_names):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // len(file_names)
+
+    keys = tagger.tickers if tagger is not None else (None,)
+    index = RedditIndex()
+    all_content = {key: {date: [] for date in dates} for key in keys}
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
+    for data_file in file_names:
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
 
-        all_content_curr_subreddit = []
+        day_posts = index.read_days(os.path.join(base_path, category, data_file), dates)
 
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
-
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+        for date in dates:
+            all_content_curr_subreddit = {key: [] for key in keys}
+
+            for parsed_line in day_posts[date]:
+                matched = tagger.tag_post(parsed_line) if tagger is not None else keys
+                for key in matched:
+                    all_content_curr_subreddit[key].append(
+                        {
+                            "title": parsed_line["title"],
+                            "content": parsed_line["selftext"],
+                            "url": parsed_line["url"],
+                            "upvotes": parsed_line["ups"],
+                            "posted_date": date,
+                        }
+                    )
+
+            for key, posts in all_content_curr_subreddit.items():
+                # sort posts by upvotes in descending order
+                posts.sort(key=lambda x: x["upvotes"], reverse=True)
+                all_content[key][date].extend(posts[:limit_per_subreddit])
 
     return all_content
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    dates: Annotated[List[str], "Dates (yyyy-mm-dd) to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+) -> Dict[str, List[Dict]]:
+    """
+    Top posts of each subreddit in category for every day in dates, i.e.
+    fetch_top_from_category for several days with one read of each file.
+    """
+    # if is company_news, check that the title or the content has the company's name (query) mentioned
+    if "company" in category and query:
+        return _top_posts(category, dates, max_limit, data_path, CompanyTagger([query]))[
+            query
+        ]
+    return _top_posts(category, dates, max_limit, data_path)[None]
+
+
+def fetch_top_from_category_bulk(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    dates: Annotated[List[str], "Dates (yyyy-mm-dd) to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day and ticker."],
+    tickers: Annotated[List[str], "Tickers of the watchlist."],
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Company posts for a whole watchlist: every post is tagged with all the
+    tickers it mentions in one scan of the corpus. Returns
+    {ticker: {date: posts}}, each equal to fetch_top_from_category_range.
+    """
+    return _top_posts(category, dates, max_limit, data_path, CompanyTagger(tickers))
+
+
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, [date], max_limit, query, data_path
+    )[date]
@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+from typing import Annotated, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .store_entries import (
+    READ_ATTEMPTS,
+    current_version,
+    entry_dir,
+    publish,
+    staging_dir,
+)
+
+
+# statement -> (SimFin directory, file name pattern)
+STATEMENTS = {
+    "balance_sheet": ("balance_sheet", "us-balance-{freq}.csv"),
+    "cashflow": ("cash_flow", "us-cashflow-{freq}.csv"),
+    "income_statements": ("income_statements", "us-income-{freq}.csv"),
+}
+
+
+def statement_path(
+    data_dir: Annotated[str, "root of the offline data directory"],
+    statement: Annotated[str, "balance_sheet / cashflow / income_statements"],
+    freq: Annotated[str, "annual / quarterly"],
+) -> str:
+    folder, file_name = STATEMENTS[statement]
+    return os.path.join(
+        data_dir,
+        "fundamental_data",
+        "simfin_data_all",
+        folder,
+        "companies",
+        "us",
+        file_name.format(freq=freq),
+    )
+
+
+class SimFinStore:
+    """
+    Point-in-time index over the US-wide SimFin statement CSVs. Each CSV is
+    parsed once and split into one partition per ticker, sorted by Publish
+    Date, so an as-of lookup only loads that ticker's rows and bisects them.
+    Loaded partitions are shared by every instance in the process, and the
+    index is rebuilt when the source CSV changes.
+    """
+
+    # entry -> (source signature, version directory, ticker -> partition file)
+    _indexes: Dict[str, Tuple[Tuple[int, int], str, Dict[str, str]]] = {}
+    _partitions: Dict[Tuple[str, str], Tuple[Tuple[int, int], np.ndarray, pd.DataFrame]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, store_dir: Optional[str] = None):
+        self.store_dir = store_dir or get_config()["simfin_store_dir"]
+
+    def entry_dir(self, csv_path: str) -> str:
+        return entry_dir(self.store_dir, csv_path)
+
+    @staticmethod
+    def _source_signature(csv_path: str) -> Tuple[int, int]:
+        stat = os.stat(csv_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def to_day(date) -> int:
+        return int(
+            pd.to_datetime(date, utc=True)
+            .normalize()
+            .tz_localize(None)
+            .to_datetime64()
+            .astype("datetime64[D]")
+            .astype(np.int64)
+        )
+
+    def build(
+        self,
+        csv_path: Annotated[str, "path of a SimFin statement CSV"],
+    ) -> str:
+        """Parse a statement CSV once and write one partition per ticker."""
+        signature = self._source_signature(csv_path)
+        df = pd.read_csv(csv_path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+        # stable, so rows published on the same day keep their file order
+        df = df.sort_values("Publish Date", kind="stable")
+
+        entry = self.entry_dir(csv_path)
+        tmp_entry = staging_dir(entry)
+
+        index = {}
+        for i, (ticker, partition) in enumerate(df.groupby("Ticker", sort=False)):
+            file_name = f"part{i}.pkl"
+            partition.to_pickle(os.path.join(tmp_entry, file_name))
+            index[str(ticker)] = file_name
+
+        with open(os.path.join(tmp_entry, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "source": os.path.abspath(csv_path),
+                    "mtime_ns": signature[0],
+                    "size": signature[1],
+                    "tickers": index,
+                },
+                f,
+            )
+
+        publish(entry, tmp_entry)
+        return entry
+
+    @staticmethod
+    def _read_meta(entry: str) -> Optional[Tuple[str, Dict]]:
+        """(version directory, meta) of the current version of entry, or None."""
+        version = current_version(entry)
+        if version is None:
+            return None
+        try:
+            with open(os.path.join(version, "meta.json")) as f:
+                return version, json.load(f)
+        except FileNotFoundError:
+            # replaced by a concurrent build since the pointer was read
+            return None
+
+    def _index(self, csv_path: str) -> Tuple[Tuple[int, int], str, Dict[str, str]]:
+        """Version directory and ticker -> partition file of csv_path, building the index if stale."""
+        signature = self._source_signature(csv_path)
+        entry = self.entry_dir(csv_path)
+
+        cached = self._indexes.get(entry)
+        if cached is not None and cached[0] == signature:
+            return cached
+
+        for _ in range(READ_ATTEMPTS):
+            current = self._read_meta(entry)
+            if current is not None:
+                version, meta = current
+                if (meta["mtime_ns"], meta["size"]) == signature:
+                    self._indexes[entry] = (signature, version, meta["tickers"])
+                    return self._indexes[entry]
+            self.build(csv_path)
+            # the CSV may have been rewritten meanwhile
+            signature = self._source_signature(csv_path)
+
+        raise Exception(
+            f"SimFin store: {entry} kept changing while {csv_path} was indexed"
+        )
+
+    def partition(
+        self,
+        csv_path: Annotated[str, "path of a SimFin statement CSV"],
+        ticker: Annotated[str, "ticker symbol"],
+    ) -> Optional[Tuple[np.ndarray, pd.DataFrame]]:
+        """
+        Return (publish days, rows) of ticker sorted by Publish Date, or None
+        if the ticker is not in the file.
+        """
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(csv_path)
+
+        entry = self.entry_dir(csv_path)
+        with self._lock:
+            for _ in range(READ_ATTEMPTS):
+                signature, version, index = self._index(csv_path)
+                cached = self._partitions.get((entry, ticker))
+                if cached is not None and cached[0] == signature:
+                    return cached[1], cached[2]
+
+                if ticker not in index:
+                    return None
+
+                try:
+                    frame = pd.read_pickle(os.path.join(version, index[ticker]))
+                    break
+                except FileNotFoundError:
+                    # another process published a new version since the index
+                    # was read: resolve the current one again
+                    self._indexes.pop(entry, None)
+            else:
+                raise Exception(
+                    f"SimFin store: {entry} kept changing while {ticker} was read"
+                )
+
+            days = (
+                frame["Publish Date"]
+                .dt.tz_localize(None)
+                .values.astype("datetime64[D]")
+                .astype(np.int64)
+            )
+            self._partitions[(entry, ticker)] = (signature, days, frame)
+            return days, frame
+
+    def as_of(
+        self,
+        csv_path: Annotated[str, "path of a SimFin statement CSV"],
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """Latest statement of ticker published on or before curr_date."""
+        partition = self.partition(csv_path, ticker)
+        if partition is None:
+            return None
+
+        days, frame = partition
+        end = int(np.searchsorted(days, self.to_day(curr_date), side="right"))
+        if end == 0:
+            return None
+        # first row of the latest publish day, as idxmax would pick
+        latest = int(np.searchsorted(days, days[end - 1], side="left"))
+        return frame.iloc[latest]
+
+    def build_all(
+        self,
+        data_dir: Annotated[str, "root of the offline data directory"],
+    ) -> List[str]:
+        """One-time build of every SimFin statement index under data_dir."""
+        entries = []
+        for statement in STATEMENTS:
+            for freq in ("annual", "quarterly"):
+                csv_path = statement_path(data_dir, statement, freq)
+                if os.path.exists(csv_path):
+                    entries.append(self.build(csv_path))
+        return entries
+
+
+if __name__ == "__main__":
+    import sys
+
+    data_dirs = sys.argv[1:] or [get_config()["data_dir"]]
+    store = SimFinStore()
+    for data_dir in data_dirs:
+        built = store.build_all(data_dir)
+        print(f"Indexed {len(built)} SimFin statement files from {data_dir}")
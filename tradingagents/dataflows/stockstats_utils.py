@@ -1,12 +1,48 @@
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Dict
 import os
-from .config import get_config
+from .price_store import PriceStore
+from .indicator_engine import IndicatorEngine
+from .yfin_cache import YFinHistoryCache
 
 
 class StockstatsUtils:
+    @staticmethod
+    def get_price_data(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.DataFrame:
+        """
+        Load the full price history of a ticker from the columnar price store,
+        with the Date column as YYYY-mm-dd strings so that callers can match
+        and slice on dates without re-parsing them.
+        """
+        if not online:
+            csv_path = os.path.join(
+                data_dir,
+                f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+            )
+            try:
+                return PriceStore().load(csv_path).to_frame()
+            except FileNotFoundError:
+                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+            except Exception as e:
+                print(f"Failed to read CSV for {symbol}: {e}")
+                raise Exception(f"Stockstats fail: Cannot parse CSV data for {symbol}")
+        else:
+            # Only the bars missing from the per-ticker cache are downloaded
+            data_file, data = YFinHistoryCache().update(symbol)
+            return PriceStore().load(data_file, data).to_frame()
+
     @staticmethod
     def get_stock_stats(
         symbol: Annotated[str, "ticker symbol for the company"],
@@ -25,84 +61,66 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
+        data = StockstatsUtils.get_price_data(symbol, data_dir, online=online)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
-        if not online:
-            try:
-                # Try to read CSV with error handling for malformed data
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    ),
-                    on_bad_lines='skip',  # Skip malformed lines
-                    engine='python'       # Use python parser which is more forgiving
-                )
-                data['Date'] = pd.to_datetime(data['Date'], errors='coerce')
-                data.dropna(subset=['Date'], inplace=True)
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-            except pd.errors.ParserError as e:
-                print(f"Warning: CSV parsing error for {symbol}: {e}")
-                # Try again with basic read
-                try:
-                    data = pd.read_csv(
-                        os.path.join(
-                            data_dir,
-                            f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                        ),
-                        error_bad_lines=False,  # Skip bad lines (for older pandas)
-                        warn_bad_lines=False
-                    )
-                    df = wrap(data)
-                except Exception as e2:
-                    print(f"Failed to read CSV for {symbol}: {e2}")
-                    raise Exception(f"Stockstats fail: Cannot parse CSV data for {symbol}")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
+        values = StockstatsUtils.compute_indicator(data, indicator)
+        matching_rows = np.flatnonzero(data["Date"].values == curr_date)
 
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
+        if len(matching_rows) > 0:
+            indicator_value = values[matching_rows[0]]
+            return indicator_value
+        else:
+            return "N/A: Not a trading day (weekend or holiday)"
 
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
+    @staticmethod
+    def compute_indicator(
+        data: Annotated[pd.DataFrame, "price history as returned by get_price_data"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+    ) -> np.ndarray:
+        """
+        Compute the full series of an indicator. Indicators offered to the
+        market analyst use the native NumPy engine; anything else falls back
+        to stockstats.
+        """
+        if IndicatorEngine.supports(indicator):
+            return IndicatorEngine(data).get(indicator)
 
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
+        df = wrap(data)
+        return df[indicator].values
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "first date of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "last date of the window, YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Dict[str, float]:
+        """
+        Compute an indicator once over the full history and return its values
+        for every trading day in [start_date, end_date], keyed by YYYY-mm-dd.
+        """
+        data = StockstatsUtils.get_price_data(symbol, data_dir, online=online)
 
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+        values = StockstatsUtils.compute_indicator(data, indicator)
+        dates = data["Date"].values
+        mask = (dates >= start_date) & (dates <= end_date)
 
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        window = {}
+        for date, value in zip(dates[mask], values[mask]):
+            # keep the first row for a date, as get_stock_stats does
+            window.setdefault(date, value)
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
-        else:
-            return "N/A: Not a trading day (weekend or holiday)"
+        return window
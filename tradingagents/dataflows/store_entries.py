@@ -0,0 +1,68 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+from typing import Annotated, Optional
+
+CURRENT = "CURRENT"
+# times a reader rebuilds or re-resolves an entry that a concurrent writer
+# keeps replacing before giving up
+READ_ATTEMPTS = 3
+
+
+def entry_dir(
+    store_dir: Annotated[str, "root directory of the store"],
+    source_path: Annotated[str, "path of the CSV the entry is built from"],
+) -> str:
+    """
+    Entry directory of a source file: its name plus a hash of its absolute
+    path, so same-named files of different data_dirs get separate entries.
+    """
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    digest = hashlib.sha256(os.path.abspath(source_path).encode("utf-8")).hexdigest()
+    return os.path.join(store_dir, f"{name}-{digest[:12]}")
+
+
+def staging_dir(entry: str) -> str:
+    """Fresh directory inside entry to write a new version into."""
+    path = os.path.join(
+        entry, f".tmp-{os.getpid()}-{threading.get_ident()}-{time.time_ns()}"
+    )
+    os.makedirs(path)
+    return path
+
+
+def current_version(entry: str) -> Optional[str]:
+    """Directory of the published version of entry, or None."""
+    try:
+        with open(os.path.join(entry, CURRENT)) as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(entry, version) if version else None
+
+
+def publish(entry: str, staged: str) -> str:
+    """
+    Make a fully written staging directory the current version of entry.
+
+    The version directory is renamed into place first and the CURRENT pointer
+    is then replaced atomically, so readers see either the old version or the
+    new one, never a missing or partial entry. Older versions are removed
+    afterwards; arrays already memory-mapped from them stay readable.
+    """
+    version = f"v{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+    os.replace(staged, os.path.join(entry, version))
+
+    pointer = f"{staged}.{CURRENT}"
+    with open(pointer, "w") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(entry, CURRENT))
+
+    # keep whatever is current now, in case another writer published since
+    keep = {version, os.path.basename(current_version(entry) or "")}
+    for name in os.listdir(entry):
+        if name.startswith("v") and name not in keep:
+            shutil.rmtree(os.path.join(entry, name), ignore_errors=True)
+    return os.path.join(entry, version)
@@ -1,8 +1,12 @@
 import os
 import json
+import functools
+import threading
+import time
 import pandas as pd
+from collections import OrderedDict
 from datetime import date, timedelta, datetime
-from typing import Annotated
+from typing import Annotated, Any, Callable, Dict, Hashable, Optional, Tuple
 
 SavePathType = Annotated[str, "File path to save data. If None, data is not saved."]
 
@@ -37,3 +41,104 @@ def get_next_weekday(date):
         return next_weekday
     else:
         return date
+
+
+class SingleFlight:
+    """
+    Process-wide result cache where concurrent calls for the same key share
+    one in-flight computation: the first caller computes, the others wait
+    for its result. Failures are passed to the waiting callers but not
+    cached, so the next call retries; so are results rejected by cache_if.
+    Cached results expire after ttl seconds (never if ttl is None).
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: Optional[float] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_if = cache_if
+        # key -> (expiry on the monotonic clock, result)
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, "SingleFlight._Call"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self._results.move_to_end(key)
+                    return cached[1]
+                del self._results[key]
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if call.error is None and (
+                    self.cache_if is None or self.cache_if(call.result)
+                ):
+                    expires = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+                    self._results[key] = (expires, call.result)
+                    while len(self._results) > self.maxsize:
+                        self._results.popitem(last=False)
+            call.done.set()
+        return call.result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+def single_flight(
+    key: Optional[Callable[..., Hashable]] = None,
+    maxsize: int = 256,
+    ttl: Optional[float] = None,
+    cache_if: Optional[Callable[[Any], bool]] = None,
+):
+    """
+    Decorator caching a function's results in a SingleFlight. key maps the
+    call arguments to the cache key (default: the arguments themselves);
+    ttl and cache_if are passed to the SingleFlight.
+    """
+
+    def decorator(func):
+        flight = SingleFlight(maxsize, ttl=ttl, cache_if=cache_if)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = (
+                key(*args, **kwargs)
+                if key is not None
+                else (args, tuple(sorted(kwargs.items())))
+            )
+            return flight.do(cache_key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = flight
+        return wrapper
+
+    return decorator
@@ -0,0 +1,245 @@
+import json
+import os
+import shutil
+import threading
+from typing import Annotated, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+from .store_entries import entry_dir
+
+
+class YFinHistoryCache:
+    """
+    Per-ticker cache of daily Yahoo Finance history for the online tools.
+
+    The full history is downloaded once into {symbol}-YFin-data.csv. Later
+    runs only download the bars after the last cached one and append them;
+    a sidecar {symbol}-YFin-data.json records the last bar and when Yahoo
+    was last asked, so a ticker is checked at most once per day. Files are
+    replaced atomically, and the least recently used price files are
+    evicted once they and their price store entries exceed data_cache_max_mb.
+    """
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        history_years: int = 15,
+    ):
+        config = get_config()
+        self.cache_dir = cache_dir or config["data_cache_dir"]
+        if max_bytes is None:
+            max_bytes = int(config.get("data_cache_max_mb", 512) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.history_years = history_years
+
+    def paths(self, symbol: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, f"{symbol}-YFin-data")
+        return f"{base}.csv", f"{base}.json"
+
+    @classmethod
+    def _lock_for(cls, symbol: str) -> threading.Lock:
+        with cls._locks_guard:
+            return cls._locks.setdefault(symbol, threading.Lock())
+
+    @staticmethod
+    def _today() -> str:
+        return pd.Timestamp.today().strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _download(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        data = yf.download(
+            symbol,
+            start=start_date,
+            end=end_date,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+        data = data.reset_index()
+        if not data.empty:
+            data["Date"] = pd.to_datetime(data["Date"]).dt.strftime("%Y-%m-%d")
+        return data
+
+    @staticmethod
+    def _atomic_write_csv(data: pd.DataFrame, path: str) -> None:
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        data.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _atomic_write_json(payload: Dict, path: str) -> None:
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def _read_meta(self, meta_path: str) -> Optional[Dict]:
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def update(
+        self,
+        symbol: Annotated[str, "ticker symbol of the company"],
+    ) -> Tuple[str, Optional[pd.DataFrame]]:
+        """
+        Bring the cached history of symbol up to date.
+
+        Returns the cache CSV path and, when the history was (re)written in
+        this call, the frame that was written so callers can skip re-reading it.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_file, meta_file = self.paths(symbol)
+        # bars are requested up to, but excluding, today
+        today = self._today()
+
+        with self._lock_for(symbol):
+            meta = self._read_meta(meta_file)
+            if (
+                meta is not None
+                and os.path.exists(data_file)
+                and meta.get("last_checked") == today
+            ):
+                return data_file, None
+
+            data, rebuild = None, True
+            if meta is not None and os.path.exists(data_file):
+                data, rebuild = self._append_tail(
+                    symbol, data_file, meta["last_bar"], today
+                )
+
+            if rebuild:
+                start_date = (
+                    pd.Timestamp(today) - pd.DateOffset(years=self.history_years)
+                ).strftime("%Y-%m-%d")
+                data = self._download(symbol, start_date, today)
+                if data.empty:
+                    raise Exception(
+                        f"Stockstats fail: Yahoo Finance returned no data for {symbol}"
+                    )
+
+            if data is not None:
+                self._atomic_write_csv(data, data_file)
+                last_bar = data["Date"].iloc[-1]
+            else:
+                last_bar = meta["last_bar"]
+
+            self._atomic_write_json(
+                {"symbol": symbol, "last_bar": last_bar, "last_checked": today},
+                meta_file,
+            )
+
+        self.evict(keep=(data_file, meta_file))
+        return data_file, data
+
+    def _append_tail(
+        self, symbol: str, data_file: str, last_bar: str, today: str
+    ) -> Tuple[Optional[pd.DataFrame], bool]:
+        """
+        Download the bars from last_bar onwards and append them to the cache.
+
+        Returns (merged frame or None if nothing is new, rebuild). rebuild is
+        True when the overlapping bar no longer matches the cache, i.e. Yahoo
+        re-adjusted the history for a split or dividend.
+        """
+        if last_bar >= today:
+            return None, False
+
+        tail = self._download(symbol, last_bar, today)
+        if tail.empty:
+            return None, False
+
+        cached = pd.read_csv(data_file)
+        cached["Date"] = cached["Date"].astype(str).str[:10]
+
+        overlap = tail[tail["Date"] == last_bar]
+        if not overlap.empty:
+            cached_close = cached.loc[cached["Date"] == last_bar, "Close"]
+            if cached_close.empty or not np.isclose(
+                cached_close.iloc[-1], overlap["Close"].iloc[0], rtol=1e-6
+            ):
+                return None, True
+
+        new_rows = tail[tail["Date"] > last_bar]
+        if new_rows.empty:
+            return None, False
+
+        merged = pd.concat([cached, new_rows[cached.columns]], ignore_index=True)
+        return merged.drop_duplicates("Date", keep="last").reset_index(drop=True), False
+
+    @staticmethod
+    def _tree_size(path: str) -> int:
+        """Bytes of the files under path; 0 if it does not exist."""
+        size = 0
+        for root, _, file_names in os.walk(path):
+            for file_name in file_names:
+                try:
+                    size += os.path.getsize(os.path.join(root, file_name))
+                except OSError:
+                    pass
+        return size
+
+    def evict(self, keep: Tuple[str, ...] = ()) -> None:
+        """
+        Delete the least recently used tickers' price files (CSV, sidecar and
+        price store entry together) until the cache is under max_bytes.
+        """
+        if self.max_bytes is None or self.max_bytes <= 0:
+            return
+
+        groups: Dict[str, Dict] = {}
+        total = 0
+        for file_name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, file_name)
+            if "-YFin-data" not in file_name or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            total += stat.st_size
+            group = groups.setdefault(
+                os.path.splitext(file_name)[0], {"used": 0, "size": 0, "paths": []}
+            )
+            # the sidecar is rewritten whenever the ticker is checked
+            group["used"] = max(group["used"], stat.st_mtime)
+            group["size"] += stat.st_size
+            group["paths"].append(path)
+
+        # the binary copy of each CSV in the price store counts as well
+        price_store_dir = get_config().get("price_store_dir")
+        for name, group in groups.items():
+            group["entry"] = None
+            if price_store_dir:
+                group["entry"] = entry_dir(
+                    price_store_dir, os.path.join(self.cache_dir, f"{name}.csv")
+                )
+                store_size = self._tree_size(group["entry"])
+                group["size"] += store_size
+                total += store_size
+
+        if total <= self.max_bytes:
+            return
+
+        keep = {os.path.splitext(os.path.basename(path))[0] for path in keep}
+        for name, group in sorted(groups.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            if name in keep:
+                continue
+            for path in group["paths"]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= group["size"]
+            # drop the binary copy of the evicted CSV as well
+            if group["entry"]:
+                shutil.rmtree(group["entry"], ignore_errors=True)
@@ -8,14 +8,50 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    "price_store_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/price_store",
+    ),
+    "simfin_store_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/simfin_store",
+    ),
+    "data_cache_max_mb": 512,
+    # Google News scraper settings
+    "google_news_concurrency": 3,
+    "google_news_requests_per_second": 0.5,
+    "google_news_burst": 3,
+    "google_news_cache_ttl_hours": 24,
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    "llm_cache_path": None,  # e.g. data_cache/llm_responses.sqlite to replay LLM calls
+    "llm_cache_max_mb": 256,
+    # shared per (provider, model) across the process; None leaves a limit open
+    "llm_requests_per_minute": None,
+    "llm_tokens_per_minute": None,
+    # retries inside the provider SDK; None keeps its default, or 0 once a
+    # limit is set, so 429s reach the limiters and are retried after them
+    "llm_max_retries": None,
+    # Memory settings
+    "memory_backend": "chroma",  # "chroma" or "numpy" (in-process flat index)
+    "memory_dir": None,  # persist the shared memory store here; in-memory if None
+    "memory_collection": "financial_situations",
+    "embedding_cache_size": 4096,  # embeddings kept in memory, shared by all memories
+    "embedding_cache_dir": None,  # optional on-disk tier, e.g. data_cache/embeddings
+    # Graph settings
+    # run the analysts concurrently; their tool-call messages stay inside each
+    # branch, so the CLI and debug traces only show them when chained (False)
+    "parallel_analysts": False,
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
+    "simultaneous_risk_rounds": False,  # risk analysts answer each round in parallel
+    "checkpointer": None,  # "sqlite" or "memory" lets failed runs resume
+    "checkpoint_path": None,  # defaults to dataflows/data_cache/checkpoints.sqlite
+    "checkpoint_max_age_days": 7,  # threads of failed runs are dropped after this
     "max_recur_limit": 100,
     # Tool settings
     "online_tools": True,
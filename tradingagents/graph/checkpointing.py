@@ -0,0 +1,152 @@
+# TradingAgents/graph/checkpointing.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Set, Tuple
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+# checkpoint files already pruned by this process
+_pruned_paths: Set[str] = set()
+_pruned_lock = threading.Lock()
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """SqliteSaver whose async methods run the sync ones in a worker thread.
+
+    LangGraph's SqliteSaver only supports invoke, and AsyncSqliteSaver is
+    bound to the event loop that opened it. This saver serves both propagate
+    and apropagate from one connection, so a run started with one can be
+    resumed with the other.
+    """
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None) -> AsyncIterator:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(
+            self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(config: Dict[str, Any]):
+    """Create the checkpointer selected by config["checkpointer"].
+
+    None (the default) disables checkpointing; "sqlite" stores checkpoints in
+    config["checkpoint_path"], or in dataflows/data_cache/checkpoints.sqlite
+    under the project directory, and drops threads older than
+    config["checkpoint_max_age_days"] the first time the process opens the
+    file; "memory" keeps them in this process only.
+    """
+    kind = config.get("checkpointer")
+    if kind is None:
+        return None
+    if kind == "memory":
+        return InMemorySaver()
+    if kind == "sqlite":
+        path = config.get("checkpoint_path") or os.path.join(
+            config["project_dir"], "dataflows/data_cache/checkpoints.sqlite"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        saver = ThreadedSqliteSaver(conn)
+        saver.setup()
+        with _pruned_lock:
+            first_open = os.path.abspath(path) not in _pruned_paths
+            _pruned_paths.add(os.path.abspath(path))
+        if first_open:
+            prune_checkpoints(saver, config.get("checkpoint_max_age_days", 7))
+        return saver
+    raise ValueError(f"Unsupported checkpointer: {kind}")
+
+
+def prune_checkpoints(checkpointer, max_age_days: Optional[float]) -> int:
+    """Delete the threads of runs last checkpointed over max_age_days ago.
+
+    Finished runs delete their own thread, so these are failed runs that were
+    never resumed. Returns the number of deleted threads.
+    """
+    if max_age_days is None:
+        return 0
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    expired = [
+        thread_id
+        for thread_id, ts in _latest_checkpoint_times(checkpointer)
+        if ts < cutoff
+    ]
+    for thread_id in expired:
+        checkpointer.delete_thread(thread_id)
+    return len(expired)
+
+
+def _latest_checkpoint_times(checkpointer) -> Iterator[Tuple[str, datetime]]:
+    """(thread_id, time) of the latest checkpoint of every thread."""
+    if not isinstance(checkpointer, SqliteSaver):
+        latest: Dict[str, datetime] = {}
+        for checkpoint in checkpointer.list(None):
+            thread_id = checkpoint.config["configurable"]["thread_id"]
+            ts = datetime.fromisoformat(checkpoint.checkpoint["ts"])
+            if thread_id not in latest or ts > latest[thread_id]:
+                latest[thread_id] = ts
+        yield from latest.items()
+        return
+
+    # checkpoint ids grow with time, so one query finds the latest of each
+    # thread and only those are loaded
+    with checkpointer.lock:
+        rows = checkpointer.conn.execute(
+            "SELECT thread_id, MAX(checkpoint_id) FROM checkpoints "
+            "WHERE checkpoint_ns = '' GROUP BY thread_id"
+        ).fetchall()
+    for thread_id, checkpoint_id in rows:
+        checkpoint = checkpointer.get_tuple(
+            {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": "",
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+        )
+        if checkpoint is not None:
+            yield thread_id, datetime.fromisoformat(checkpoint.checkpoint["ts"])
+
+
+def config_digest(config: Dict[str, Any]) -> str:
+    """Short hash of a config, so runs with different settings never share a thread."""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def make_thread_id(
+    company_name: str,
+    trade_date: str,
+    run_id: Optional[str],
+    config: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Checkpoint thread of one analysis run under config."""
+    thread_id = f"{company_name}:{trade_date}:{run_id}"
+    if config is not None:
+        thread_id += f":{config_digest(config)}"
+    return thread_id
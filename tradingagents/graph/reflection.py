@@ -1,8 +1,11 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List
 from langchain_openai import ChatOpenAI
 
+from tradingagents.agents.utils.rate_limit import invoke_with_retry
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
@@ -59,7 +62,13 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         self, component_type: str, report: str, situation: str, returns_losses
     ) -> str:
         """Generate reflection for a component."""
-        messages = [
+        messages = self._reflection_messages(report, situation, returns_losses)
+
+        result = invoke_with_retry(self.quick_thinking_llm, messages).content
+        return result
+
+    def _reflection_messages(self, report: str, situation: str, returns_losses):
+        return [
             ("system", self.reflection_system_prompt),
             (
                 "human",
@@ -67,8 +76,60 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
-        result = self.quick_thinking_llm.invoke(messages).content
-        return result
+    def _component_reports(self, current_state: Dict[str, Any]) -> List[str]:
+        """Bull, bear, trader, invest judge and risk judge reports, in this order."""
+        return [
+            current_state["investment_debate_state"]["bull_history"],
+            current_state["investment_debate_state"]["bear_history"],
+            current_state["trader_investment_plan"],
+            current_state["investment_debate_state"]["judge_decision"],
+            current_state["risk_debate_state"]["judge_decision"],
+        ]
+
+    def _remember(self, situation: str, results: List[str], memories) -> None:
+        """Store every lesson, with one batched write per memory store."""
+        entries = {}
+        for memory, result in zip(memories, results):
+            if memory:
+                entries.setdefault(memory.store, []).append(
+                    (memory.role, situation, result)
+                )
+        for store, store_entries in entries.items():
+            store.add_entries(store_entries)
+
+    def reflect_all(self, current_state, returns_losses, memories) -> List[str]:
+        """Reflect on every component at once and update the memories.
+
+        memories are the bull, bear, trader, invest judge and risk manager
+        memories, in this order (None to skip storing that lesson). The
+        situation is extracted once, the five reflections run concurrently
+        through llm.batch, and the lessons are written to the memory store
+        together.
+        """
+        situation = self._extract_current_situation(current_state)
+        responses = self.quick_thinking_llm.batch(
+            [
+                self._reflection_messages(report, situation, returns_losses)
+                for report in self._component_reports(current_state)
+            ]
+        )
+        results = [response.content for response in responses]
+        self._remember(situation, results, memories)
+        return results
+
+    async def areflect_all(self, current_state, returns_losses, memories) -> List[str]:
+        """Async version of reflect_all, using llm.abatch."""
+        situation = self._extract_current_situation(current_state)
+        responses = await self.quick_thinking_llm.abatch(
+            [
+                self._reflection_messages(report, situation, returns_losses)
+                for report in self._component_reports(current_state)
+            ]
+        )
+        results = [response.content for response in responses]
+        # embedding the situation may call the embedding API
+        await asyncio.to_thread(self._remember, situation, results, memories)
+        return results
 
     def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
         """Reflect on bull researcher's analysis and update memory."""
@@ -1,6 +1,10 @@
 # TradingAgents/graph/setup.py
 
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -11,6 +15,17 @@ from tradingagents.agents.utils.agent_utils import Toolkit
 
 from .conditional_logic import ConditionalLogic
 
+# state field each analyst writes its report to
+ANALYST_REPORTS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+# risk debators in speaking order, by their RiskDebateState field prefix
+RISK_DEBATORS = ("risky", "safe", "neutral")
+
 
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
@@ -40,8 +55,94 @@ class GraphSetup:
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
 
+    def _create_analyst_branch(self, analyst_type, analyst_node, tool_node):
+        """Wrap one analyst and its tool loop as a node with its own message channel.
+
+        The branch runs on a private copy of the state that starts from a fresh
+        conversation, and only its report is written back, so several branches
+        can run at the same time without seeing each other's messages.
+        """
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+        report_key = ANALYST_REPORTS[analyst_type]
+
+        branch = StateGraph(AgentState)
+        branch.add_node(analyst_name, analyst_node)
+        branch.add_node(tools_name, tool_node)
+        branch.add_edge(START, analyst_name)
+        branch.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {tools_name: tools_name, f"Msg Clear {analyst_type.capitalize()}": END},
+        )
+        branch.add_edge(tools_name, analyst_name)
+        # a failed branch reruns as a whole when the run is resumed
+        branch = branch.compile(checkpointer=False)
+
+        def branch_input(state):
+            branch_state = {
+                key: value for key, value in state.items() if key != "messages"
+            }
+            branch_state["messages"] = [("human", state["company_of_interest"])]
+            return branch_state
+
+        def run_branch(state, config: RunnableConfig):
+            result = branch.invoke(branch_input(state), config)
+            return {report_key: result[report_key]}
+
+        async def arun_branch(state, config: RunnableConfig):
+            result = await branch.ainvoke(branch_input(state), config)
+            return {report_key: result[report_key]}
+
+        return RunnableLambda(run_branch, afunc=arun_branch, name=analyst_name)
+
+    def _create_risk_round(self, debators):
+        """Run one risk debate round with every debator answering at once.
+
+        Each debator sees the transcript of the previous round, and their
+        arguments are merged into a single RiskDebateState update, appended to
+        the history in speaking order.
+        """
+
+        def merge(state, updates):
+            merged = dict(state["risk_debate_state"])
+            for speaker, update in zip(RISK_DEBATORS, updates):
+                debate = update["risk_debate_state"]
+                argument = debate[f"current_{speaker}_response"]
+                merged["history"] = merged.get("history", "") + "\n" + argument
+                merged[f"{speaker}_history"] = debate[f"{speaker}_history"]
+                merged[f"current_{speaker}_response"] = argument
+            merged["latest_speaker"] = "Round"
+            merged["count"] = merged["count"] + len(debators)
+            return {"risk_debate_state": merged}
+
+        def risk_round(state, config: RunnableConfig):
+            with ThreadPoolExecutor(max_workers=len(debators)) as executor:
+                # each debator runs in a copy of this context, so it sees the
+                # run's config
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run, node.invoke, state, config
+                    )
+                    for node in debators
+                ]
+                updates = [future.result() for future in futures]
+            return merge(state, updates)
+
+        async def arisk_round(state, config: RunnableConfig):
+            updates = await asyncio.gather(
+                *(node.ainvoke(state, config) for node in debators)
+            )
+            return merge(state, updates)
+
+        return RunnableLambda(risk_round, afunc=arisk_round, name="Risk Round")
+
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
+        simultaneous_risk_rounds=False,
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +152,13 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts as concurrent branches that
+                join before the Bull Researcher, instead of one after another.
+                Only the reports leave the branches, not their messages.
+            simultaneous_risk_rounds (bool): Have the Risky, Safe and Neutral
+                analysts answer each debate round in parallel instead of in turn.
+            checkpointer: LangGraph checkpointer saving the state after every
+                step, so a failed run can resume from its last completed node.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -112,48 +220,73 @@ class GraphSetup:
         workflow = StateGraph(AgentState)
 
         # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
-            workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
-            )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        if parallel_analysts:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._create_analyst_branch(
+                        analyst_type, node, tool_nodes[analyst_type]
+                    ),
+                )
+        else:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+                workflow.add_node(
+                    f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                )
+                workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
         workflow.add_node("Bear Researcher", bear_researcher_node)
         workflow.add_node("Research Manager", research_manager_node)
         workflow.add_node("Trader", trader_node)
-        workflow.add_node("Risky Analyst", risky_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Safe Analyst", safe_analyst)
+        if simultaneous_risk_rounds:
+            workflow.add_node(
+                "Risk Round",
+                self._create_risk_round([risky_analyst, safe_analyst, neutral_analyst]),
+            )
+        else:
+            workflow.add_node("Risky Analyst", risky_analyst)
+            workflow.add_node("Neutral Analyst", neutral_analyst)
+            workflow.add_node("Safe Analyst", safe_analyst)
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        if parallel_analysts:
+            # Fan out to every analyst, then join before the Bull Researcher
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst"
+                for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            workflow.add_edge(analyst_names, "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
 
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
 
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -173,33 +306,44 @@ class GraphSetup:
             },
         )
         workflow.add_edge("Research Manager", "Trader")
-        workflow.add_edge("Trader", "Risky Analyst")
-        workflow.add_conditional_edges(
-            "Risky Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Safe Analyst": "Safe Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
-        workflow.add_conditional_edges(
-            "Safe Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Neutral Analyst": "Neutral Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
-        workflow.add_conditional_edges(
-            "Neutral Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Risky Analyst": "Risky Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
+        if simultaneous_risk_rounds:
+            workflow.add_edge("Trader", "Risk Round")
+            workflow.add_conditional_edges(
+                "Risk Round",
+                self.conditional_logic.should_continue_risk_round,
+                {
+                    "Risk Round": "Risk Round",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+        else:
+            workflow.add_edge("Trader", "Risky Analyst")
+            workflow.add_conditional_edges(
+                "Risky Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Safe Analyst": "Safe Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+            workflow.add_conditional_edges(
+                "Safe Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Neutral Analyst": "Neutral Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+            workflow.add_conditional_edges(
+                "Neutral Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Risky Analyst": "Risky Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
 
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
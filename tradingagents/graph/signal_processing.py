@@ -1,7 +1,72 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+from typing import Optional
+
 from langchain_openai import ChatOpenAI
 
+from tradingagents.agents.utils.rate_limit import ainvoke_with_retry, invoke_with_retry
+
+DECISIONS = ("BUY", "SELL", "HOLD")
+
+_DECISION = r"(BUY|SELL|HOLD)\b"
+_ANY_DECISION = re.compile(r"\b" + _DECISION, re.IGNORECASE)
+# FINAL TRANSACTION PROPOSAL: **BUY**, or the prompts' template **BUY/HOLD/SELL**
+_PROPOSAL = re.compile(
+    r"FINAL\s+TRANSACTION\s+PROPOSAL\s*:?\s*\**\s*"
+    r"((?:BUY|SELL|HOLD)\b(?:\s*(?:/|\||,|\bor\b)\s*(?:BUY|SELL|HOLD)\b)*)",
+    re.IGNORECASE,
+)
+# Recommendation: **Sell** / **Final Decision:** Hold / my recommendation is to buy
+_LABELED = re.compile(
+    r"\b(final\s+)?(?:decision|recommendation|verdict)\**"
+    r"(?:\s*[:\-\u2013\u2014]|\s+is)\s*\**\s*(?:to\s+|an?\s+)?\**\s*" + _DECISION,
+    re.IGNORECASE,
+)
+_BOLD = re.compile(r"\*\*([^*\n]{1,80})\*\*")
+_NEGATION = re.compile(r"\b(?:not|no|avoid|rather than|instead of|over)\b", re.IGNORECASE)
+
+
+def parse_signal(full_signal: str) -> Optional[str]:
+    """
+    Deterministically extract BUY, SELL or HOLD from a final decision text.
+
+    Tries, in order: the last FINAL TRANSACTION PROPOSAL line, labeled
+    decisions ("Recommendation: Sell"), then bold decisions ("**HOLD**").
+    A proposal is only trusted when no other decision follows it, so a
+    quoted trader proposal does not win over the answer after it, and the
+    template "BUY/HOLD/SELL" copied from the prompts is not a proposal.
+    Returns None when the text is ambiguous, e.g. labels or bold spans that
+    name different decisions.
+    """
+    for proposal in reversed(list(_PROPOSAL.finditer(full_signal))):
+        named = {decision.upper() for decision in _ANY_DECISION.findall(proposal.group(1))}
+        if len(named) > 1:
+            continue
+        later = {
+            decision.upper()
+            for decision in _ANY_DECISION.findall(full_signal[proposal.end():])
+        }
+        return named.pop() if later <= named else None
+
+    labeled = _LABELED.findall(full_signal)
+    if labeled:
+        decisions = {decision.upper() for _, decision in labeled}
+        if len(decisions) > 1:
+            # e.g. the trader's recommendation quoted next to the final one
+            decisions = {decision.upper() for final, decision in labeled if final}
+        return decisions.pop() if len(decisions) == 1 else None
+
+    decisions = set()
+    for span in _BOLD.findall(full_signal):
+        found = _ANY_DECISION.findall(span)
+        if found and _NEGATION.search(span):
+            return None
+        decisions.update(decision.upper() for decision in found)
+    if len(decisions) == 1:
+        return decisions.pop()
+    return None
+
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
@@ -20,12 +85,28 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        # the LLM is only asked when the text has no clear decision
+        decision = parse_signal(full_signal)
+        if decision is not None:
+            return decision
+        return invoke_with_retry(self.quick_thinking_llm, self._messages(full_signal)).content
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async version of process_signal."""
+        decision = parse_signal(full_signal)
+        if decision is not None:
+            return decision
+        response = await ainvoke_with_retry(
+            self.quick_thinking_llm, self._messages(full_signal)
+        )
+        return response.content
+
+    @staticmethod
+    def _messages(full_signal: str):
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
@@ -1,6 +1,8 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import threading
+import uuid
 from pathlib import Path
 import json
 from datetime import date
@@ -16,13 +18,16 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.llm_cache import LLMResponseCache
+from tradingagents.agents.utils.rate_limit import ProviderRateLimiter
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
-from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.interface import use_config
 
+from .checkpointing import create_checkpointer, make_thread_id
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
@@ -33,6 +38,9 @@ from .signal_processing import SignalProcessor
 class TradingAgentsGraph:
     """Main class that orchestrates the trading agents framework."""
 
+    _shared: Dict[str, "TradingAgentsGraph"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(
         self,
         selected_analysts=["market", "social", "news", "fundamentals"],
@@ -49,28 +57,26 @@ class TradingAgentsGraph:
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
 
-        # Update the interface's config
-        set_config(self.config)
-
         # Create necessary directories
         os.makedirs(
             os.path.join(self.config["project_dir"], "dataflows/data_cache"),
             exist_ok=True,
         )
 
-        # Initialize LLMs
+        # Initialize LLMs; with llm_cache_path set, responses are replayed from disk
+        self.llm_cache = LLMResponseCache.from_config(self.config)
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], **self._llm_options("deep_think_llm"))
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], **self._llm_options("quick_think_llm"))
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], **self._llm_options("deep_think_llm"))
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], **self._llm_options("quick_think_llm"))
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], **self._llm_options("deep_think_llm"))
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], **self._llm_options("quick_think_llm"))
         elif self.config["llm_provider"].lower() == 'deepseek':
-            self.deep_thinking_llm = ChatDeepSeek(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatDeepSeek(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatDeepSeek(model=self.config["deep_think_llm"], **self._llm_options("deep_think_llm"))
+            self.quick_thinking_llm = ChatDeepSeek(model=self.config["quick_think_llm"], **self._llm_options("quick_think_llm"))
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -116,10 +122,58 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
+        self.run_id = None
         self.log_states_dict = {}  # date to full state dict
 
-        # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        # Set up the graph; the checkpointer lets failed runs resume
+        self.checkpointer = create_checkpointer(self.config)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            self.config.get("parallel_analysts", False),
+            self.config.get("simultaneous_risk_rounds", False),
+            self.checkpointer,
+        )
+
+    @classmethod
+    def shared(
+        cls,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        config: Dict[str, Any] = None,
+    ) -> "TradingAgentsGraph":
+        """The process-wide graph for these analysts and config.
+
+        It is built on first use; later calls with an equal config return the
+        same compiled graph, LLM clients (and their HTTP connection pools),
+        toolkit and memories. Analyses on a shared graph go through run/arun,
+        which keep no per-analysis state on the instance.
+        """
+        config = config or DEFAULT_CONFIG
+        key = json.dumps([list(selected_analysts), config], sort_keys=True, default=str)
+        with cls._shared_lock:
+            graph = cls._shared.get(key)
+            if graph is None:
+                graph = cls._shared[key] = cls(selected_analysts, config=config)
+            return graph
+
+    def _llm_options(self, model_key):
+        """Response cache, rate limiter and usage callback of a chat model."""
+        limiter = ProviderRateLimiter.get(
+            self.config["llm_provider"],
+            self.config[model_key],
+            self.config.get("llm_requests_per_minute"),
+            self.config.get("llm_tokens_per_minute"),
+        )
+        options = {
+            "cache": self.llm_cache,
+            "rate_limiter": limiter if limiter.limited else None,
+            "callbacks": [limiter.callback],
+        }
+        max_retries = self.config.get("llm_max_retries")
+        if max_retries is None and limiter.limited:
+            max_retries = 0
+        if max_retries is not None:
+            options["max_retries"] = max_retries
+        return options
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -166,44 +220,174 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def propagate(self, company_name, trade_date, run_id=None):
+        """Run the trading agents graph for a company on a specific date.
+
+        When the graph has a checkpointer, its state is saved after every node
+        in the thread of (company_name, trade_date, run_id, config). Passing the run_id
+        of a failed run (self.run_id after the call) resumes that run from its
+        last completed node instead of starting over. The checkpoints of a
+        finished run are deleted. Without a run_id every call is a new run.
+        """
 
         self.ticker = company_name
+        self.run_id = run_id or uuid.uuid4().hex
 
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
+        final_state, decision = self.run(
+            company_name, trade_date, self.run_id, self.log_states_dict
         )
-        args = self.propagator.get_graph_args()
-
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
 
         # Store current state for reflection
         self.curr_state = final_state
 
-        # Log state
-        self._log_state(trade_date, final_state)
+        return final_state, decision
+
+    async def apropagate(self, company_name, trade_date, run_id=None):
+        """Async version of propagate.
+
+        Awaits the graph with ainvoke/astream, so agents call the async LLM
+        clients and tools their async implementations. Many analyses can then
+        run concurrently in one event loop; use one TradingAgentsGraph per
+        concurrent analysis, as the instance keeps the state of its last run,
+        or call arun on a shared instance.
+        """
+
+        self.ticker = company_name
+        self.run_id = run_id or uuid.uuid4().hex
+
+        final_state, decision = await self.arun(
+            company_name, trade_date, self.run_id, self.log_states_dict
+        )
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        return final_state, decision
+
+    def run(self, company_name, trade_date, run_id=None, log_states=None):
+        """Run one analysis without keeping its state on this instance.
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        Unlike propagate, run can be called from many threads at once, so one
+        compiled graph and one set of LLM clients serve every analysis of a
+        batch (see TradingAgentsGraph.shared). log_states collects the logged
+        states written to the state log file; by default it only holds this run.
+        """
+
+        # Dataflows read this graph's config, even while other runs in the
+        # process use a different one
+        with use_config(self.config):
+            # Initialize state, or resume the interrupted run
+            args = self._run_args(company_name, trade_date, run_id)
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
+            thread = args["config"].get("configurable")
+            if thread and self.graph.get_state(args["config"]).next:
+                init_agent_state = None
+
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+
+            # Log state
+            self._log_state(company_name, trade_date, final_state, log_states)
+
+            # The run finished, so its checkpoints are no longer needed
+            if thread:
+                self.graph.checkpointer.delete_thread(thread["thread_id"])
+
+            # Return decision and processed signal
+            return final_state, self.process_signal(
+                final_state["final_trade_decision"]
+            )
+
+    def stream(self, company_name, trade_date, run_id=None):
+        """Stream the states of one analysis, step by step, as the CLI shows them.
+
+        The graph's config applies to the dataflows while the stream is
+        consumed, as in run.
+        """
+
+        with use_config(self.config):
+            args = self._run_args(company_name, trade_date, run_id)
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
+            yield from self.graph.stream(init_agent_state, **args)
+
+            # The run finished, so its checkpoints are no longer needed
+            thread = args["config"].get("configurable")
+            if thread:
+                self.graph.checkpointer.delete_thread(thread["thread_id"])
+
+    async def arun(self, company_name, trade_date, run_id=None, log_states=None):
+        """Async version of run."""
+
+        # Dataflows read this graph's config, even while other runs in the
+        # process use a different one
+        with use_config(self.config):
+            # Initialize state, or resume the interrupted run
+            args = self._run_args(company_name, trade_date, run_id)
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
+            thread = args["config"].get("configurable")
+            if thread and (await self.graph.aget_state(args["config"])).next:
+                init_agent_state = None
+
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                async for chunk in self.graph.astream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = await self.graph.ainvoke(init_agent_state, **args)
+
+            # Log state
+            self._log_state(company_name, trade_date, final_state, log_states)
+
+            # The run finished, so its checkpoints are no longer needed
+            if thread:
+                await self.graph.checkpointer.adelete_thread(thread["thread_id"])
+
+            # Return decision and processed signal
+            return final_state, await self.signal_processor.aprocess_signal(
+                final_state["final_trade_decision"]
+            )
+
+    def _run_args(self, company_name, trade_date, run_id):
+        """Graph arguments of a run, with its checkpoint thread if any."""
+        if self.graph.checkpointer is None:
+            return self.propagator.get_graph_args()
+        return self.propagator.get_graph_args(
+            make_thread_id(
+                company_name, trade_date, run_id or uuid.uuid4().hex, self.config
+            )
+        )
 
-    def _log_state(self, trade_date, final_state):
+    def _log_state(self, company_name, trade_date, final_state, log_states=None):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        if log_states is None:
+            log_states = {}
+        log_states[str(trade_date)] = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -234,33 +418,36 @@ class TradingAgentsGraph:
         }
 
         # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        directory = Path(f"eval_results/{company_name}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
         with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+            f"eval_results/{company_name}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
             "w",
         ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            json.dump(log_states, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
+        self.reflector.reflect_all(
+            self.curr_state, returns_losses, self._reflection_memories()
         )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+
+    async def areflect_and_remember(self, returns_losses):
+        """Async version of reflect_and_remember."""
+        await self.reflector.areflect_all(
+            self.curr_state, returns_losses, self._reflection_memories()
         )
 
+    def _reflection_memories(self):
+        return [
+            self.bull_memory,
+            self.bear_memory,
+            self.trader_memory,
+            self.invest_judge_memory,
+            self.risk_manager_memory,
+        ]
+
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)